@@ -0,0 +1,6 @@
+"""Throughput benchmarks on synthetic media.
+
+Run ``python -m benchmarks`` from the repository root; it needs ffmpeg, and
+faster-whisper for the ``generate_short`` cases (skip them with
+``--no-whisper``). See :mod:`benchmarks.suite`.
+"""
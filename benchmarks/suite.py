@@ -0,0 +1,319 @@
+"""End-to-end benchmark suite with a JSON baseline.
+
+Every case is run ``repeat`` times and reports the median. The cases are:
+
+``build_stack/<resolution>/<duration>s/<encoder>-<preset>``
+    The ffmpeg encode alone, from a pre-written subtitle file.
+``save_ass/<count>``
+    Writing ``count`` cues to an ASS file.
+``generate_short/<resolution>/<duration>s/<model>``
+    The whole pipeline with the transcript cache disabled. The stage
+    breakdown from :mod:`core.profiling` is stored with the result.
+
+Results from different hosts or ffmpeg builds are not comparable; the
+environment is stored with every run and a mismatch is reported when
+comparing.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from core.ffmpeg_handler import build_stack
+from core.profiling import profile
+from core.subtitle_utils import save_ass
+from core.version import __version__
+
+from .synthetic import make_clip, synthetic_cues
+
+
+# Size of the synthetic source clips; outputs are scaled from these. They
+# must be portrait: build_stack scales to the output width and crops half
+# the output height, which a landscape source is too short for
+SOURCE_SIZE = (1080, 1920)
+
+DURATIONS = (10.0, 30.0)
+RESOLUTIONS = ((720, 1280), (1080, 1920))
+ENCODERS = ("libx264",)
+PRESETS = ("veryfast", "medium")
+CUE_COUNTS = (1000, 20000)
+
+# A case this much slower than the baseline is a regression
+TOLERANCE = 0.15
+
+
+def environment() -> dict:
+    """Return the host details a result is only comparable within."""
+    try:
+        ffmpeg = subprocess.run(
+            ["ffmpeg", "-version"], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+        ).stdout.splitlines()[0]
+    except (OSError, IndexError):
+        ffmpeg = None
+    return {
+        "host": socket.gethostname(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "python": platform.python_version(),
+        "ffmpeg": ffmpeg,
+        "shortssplit": __version__,
+    }
+
+
+def measure(func: Callable[[], dict | None], repeat: int) -> dict:
+    """Run ``func`` ``repeat`` times and return the median wall time.
+
+    ``func`` may return a dict of extra fields; those of the median run are
+    kept.
+    """
+    runs = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        extra = func() or {}
+        runs.append((time.perf_counter() - started, extra))
+    runs.sort(key=lambda run: run[0])
+    seconds, extra = runs[len(runs) // 2]
+    return {"seconds": seconds, "runs": [run[0] for run in runs], **extra}
+
+
+class Suite:
+    """Generates the media for, and runs, the benchmark cases."""
+
+    def __init__(
+        self,
+        workdir: Path,
+        *,
+        durations=DURATIONS,
+        resolutions=RESOLUTIONS,
+        encoders=ENCODERS,
+        presets=PRESETS,
+        cue_counts=CUE_COUNTS,
+        model: str | None = "tiny",
+        repeat: int = 3,
+        source_size: tuple[int, int] = SOURCE_SIZE,
+    ) -> None:
+        self.workdir = Path(workdir)
+        self.durations = durations
+        self.resolutions = resolutions
+        self.encoders = encoders
+        self.presets = presets
+        self.cue_counts = cue_counts
+        self.model = model
+        self.repeat = repeat
+        self.source_size = source_size
+
+    def clips(self, duration: float) -> tuple[Path, Path]:
+        """Return the synthetic ``(top, bottom)`` pair for ``duration``."""
+        top = make_clip(self.workdir, duration, self.source_size, kind="top")
+        bottom = make_clip(self.workdir, duration, self.source_size, kind="bottom")
+        return top, bottom
+
+    def run(self) -> Dict[str, dict]:
+        """Run every case and return results keyed by case name."""
+        self.workdir.mkdir(parents=True, exist_ok=True)
+        results = {}
+        for count in self.cue_counts:
+            results[f"save_ass/{count}"] = self.bench_save_ass(count)
+        for duration in self.durations:
+            top, bottom = self.clips(duration)
+            for resolution in self.resolutions:
+                res = f"{resolution[0]}x{resolution[1]}"
+                for encoder in self.encoders:
+                    for preset in self.presets:
+                        name = f"build_stack/{res}/{duration:g}s/{encoder}-{preset}"
+                        logging.info("Running %s", name)
+                        results[name] = self.bench_build_stack(
+                            top, bottom, duration, resolution, encoder, preset
+                        )
+                if self.model:
+                    name = f"generate_short/{res}/{duration:g}s/{self.model}"
+                    logging.info("Running %s", name)
+                    results[name] = self.bench_generate_short(top, bottom, duration, resolution)
+        return results
+
+    def bench_save_ass(self, count: int) -> dict:
+        """Time writing ``count`` synthetic cues."""
+        cues = synthetic_cues(count)
+        path = self.workdir / "bench.ass"
+        return measure(lambda: {"cues": save_ass(cues, path)}, self.repeat)
+
+    def bench_build_stack(self, top, bottom, duration, resolution, encoder, preset) -> dict:
+        """Time one encode of ``top`` over ``bottom`` with burned-in cues."""
+        subtitle = self.workdir / f"subs_{duration:g}s.ass"
+        save_ass(synthetic_cues(int(duration / 0.9)), subtitle)
+        out = self.workdir / "build_stack.mp4"
+
+        def run():
+            build_stack(
+                top, bottom, subtitle, out,
+                resolution=resolution, encoder=encoder, preset=preset,
+            )
+
+        result = measure(run, self.repeat)
+        result["realtime_factor"] = duration / result["seconds"]
+        return result
+
+    def bench_generate_short(self, top, bottom, duration, resolution) -> dict:
+        """Time the full pipeline and keep its per-stage breakdown."""
+        from core.shorts import generate_short
+
+        out = self.workdir / "generate_short.mp4"
+
+        def run():
+            with profile() as profiler:
+                generate_short(
+                    top, bottom, self.model,
+                    output_path=out, resolution=resolution, use_cache=False,
+                )
+            return {
+                "stages": {
+                    name: round(entry["wall"], 4) for name, entry in profiler.summary().items()
+                }
+            }
+
+        result = measure(run, self.repeat)
+        result["realtime_factor"] = duration / result["seconds"]
+        return result
+
+
+def compare(
+    results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float = TOLERANCE
+) -> List[dict]:
+    """Return one row per case found in both ``results`` and ``baseline``.
+
+    Rows hold the case name, both median times, the relative change and
+    ``status``: ``"regression"`` when the case got slower by more than
+    ``tolerance``, ``"improved"`` when it got faster by as much, else ``"ok"``.
+    """
+    rows = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]["seconds"]
+        after = result["seconds"]
+        change = (after - before) / before if before > 0 else 0.0
+        if change > tolerance:
+            status = "regression"
+        elif change < -tolerance:
+            status = "improved"
+        else:
+            status = "ok"
+        rows.append(
+            {"name": name, "baseline": before, "seconds": after, "change": change, "status": status}
+        )
+    return rows
+
+
+def load_run(path: Path | str) -> dict:
+    """Read a run written by :func:`save_run`."""
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def save_run(path: Path | str, results: Dict[str, dict]) -> Path:
+    """Write ``results`` and the current environment to ``path``."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {"environment": environment(), "created": time.time(), "results": results}
+    path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    return path
+
+
+def format_rows(rows: List[dict]) -> str:
+    """Return ``rows`` from :func:`compare` as a plain-text table."""
+    width = max([len(row["name"]) for row in rows] + [4])
+    lines = [f"{'case':<{width}}  {'base':>8}  {'now':>8}  {'change':>7}"]
+    for row in rows:
+        flag = "  <-- REGRESSION" if row["status"] == "regression" else ""
+        lines.append(
+            f"{row['name']:<{width}}  {row['baseline']:8.3f}  {row['seconds']:8.3f}"
+            f"  {row['change']:+7.1%}{flag}"
+        )
+    return "\n".join(lines)
+
+
+def _sizes(values: List[str]) -> tuple:
+    from core.utils import parse_resolution
+
+    return tuple(parse_resolution(value) for value in values)
+
+
+def main(argv: List[str] | None = None) -> int:
+    """Command line entry point; see ``python -m benchmarks --help``."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Time build_stack, save_ass and generate_short on synthetic media",
+    )
+    parser.add_argument("--durations", type=float, nargs="+", default=list(DURATIONS), metavar="S")
+    parser.add_argument(
+        "--resolutions", nargs="+", default=[f"{w}x{h}" for w, h in RESOLUTIONS], metavar="WxH"
+    )
+    parser.add_argument("--encoders", nargs="+", default=list(ENCODERS))
+    parser.add_argument("--presets", nargs="+", default=list(PRESETS))
+    parser.add_argument("--cues", type=int, nargs="+", default=list(CUE_COUNTS), metavar="N")
+    parser.add_argument("--model", default="tiny", help="Whisper model for generate_short")
+    parser.add_argument(
+        "--no-whisper", action="store_true", help="Skip the generate_short cases"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case (median is kept)")
+    parser.add_argument("--workdir", help="Where synthetic clips are generated and kept")
+    parser.add_argument("-o", "--output", help="Write this run's results to a JSON file")
+    parser.add_argument("--baseline", help="Compare against a JSON file written with -o")
+    parser.add_argument(
+        "--tolerance", type=float, default=TOLERANCE, help="Allowed slowdown (0.15 = 15%%)"
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s:%(message)s")
+    workdir = Path(args.workdir or Path(tempfile.gettempdir()) / "shortssplit-bench")
+    suite = Suite(
+        workdir,
+        durations=tuple(args.durations),
+        resolutions=_sizes(args.resolutions),
+        encoders=tuple(args.encoders),
+        presets=tuple(args.presets),
+        cue_counts=tuple(args.cues),
+        model=None if args.no_whisper else args.model,
+        repeat=args.repeat,
+    )
+    results = suite.run()
+    for name, result in results.items():
+        rtf = result.get("realtime_factor")
+        print(f"{name:<48} {result['seconds']:8.3f}s" + (f"  {rtf:6.2f}x realtime" if rtf else ""))
+    if args.output:
+        save_run(args.output, results)
+
+    if not args.baseline:
+        return 0
+    baseline = load_run(args.baseline)
+    ours = environment()
+    for key in ("host", "cpus", "ffmpeg"):
+        if baseline["environment"].get(key) != ours[key]:
+            logging.warning(
+                "Baseline %s differs (%s vs %s); timings may not be comparable",
+                key, baseline["environment"].get(key), ours[key],
+            )
+    rows = compare(results, baseline["results"], args.tolerance)
+    if rows:
+        print()
+        print(format_rows(rows))
+    regressions = [row["name"] for row in rows if row["status"] == "regression"]
+    if regressions:
+        logging.error("%d regression(s) beyond %.0f%%", len(regressions), args.tolerance * 100)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""Deterministic synthetic clips for the benchmarks.
+
+Clips are generated locally with ffmpeg's ``lavfi`` sources, so the suite
+needs no sample footage and every run renders identical frames. The top
+clip pairs ``testsrc2`` with a speech-like tone: a pitch that wanders like a
+voice and is gated into phrase-length bursts with pauses between them, which
+gives loudness analysis, silence splitting and Whisper realistic work to do.
+The bottom clip is a moving ``mandelbrot`` zoom, which is expensive enough
+to stand in for gameplay footage.
+"""
+
+from __future__ import annotations
+
+import logging
+import subprocess
+from pathlib import Path
+
+# Seconds of "speech" followed by seconds of silence in the top clip's audio
+PHRASE_SECONDS = 2.4
+PAUSE_SECONDS = 0.8
+
+
+def speech_like_audio(duration: float) -> str:
+    """Return the ``aevalsrc`` expression for ``duration`` s of gated tone."""
+    period = PHRASE_SECONDS + PAUSE_SECONDS
+    # Pitch glides between roughly 120 and 240 Hz, syllables at ~4 Hz
+    voice = "sin(2*PI*(180+60*sin(2*PI*0.7*t))*t)*(0.6+0.4*sin(2*PI*4*t))"
+    gate = f"lt(mod(t\\,{period})\\,{PHRASE_SECONDS})"
+    return f"aevalsrc=0.5*{voice}*{gate}:s=48000:d={duration}"
+
+
+def clip_command(
+    path: Path, duration: float, size: tuple[int, int], *, kind: str, fps: int = 30
+) -> list[str]:
+    """Return the ffmpeg command writing a synthetic ``kind`` clip to ``path``.
+
+    ``kind`` is ``"top"`` (test pattern with audio) or ``"bottom"`` (silent
+    animated background).
+    """
+    width, height = size
+    if kind == "top":
+        inputs = [
+            "-f", "lavfi", "-i", f"testsrc2=s={width}x{height}:r={fps}:d={duration}",
+            "-f", "lavfi", "-i", speech_like_audio(duration),
+        ]
+        audio = ["-c:a", "aac", "-b:a", "128k"]
+    elif kind == "bottom":
+        inputs = [
+            "-f", "lavfi", "-i", f"mandelbrot=s={width}x{height}:r={fps}",
+        ]
+        audio = ["-an"]
+    else:
+        raise ValueError(f"Unknown clip kind: {kind}")
+    return [
+        "ffmpeg", "-y", "-v", "error", *inputs,
+        "-t", f"{duration}",
+        "-c:v", "libx264", "-preset", "ultrafast", "-pix_fmt", "yuv420p", "-g", str(fps),
+        *audio,
+        str(path),
+    ]
+
+
+def make_clip(
+    directory: Path, duration: float, size: tuple[int, int], *, kind: str
+) -> Path:
+    """Return a synthetic clip in ``directory``, generating it if missing.
+
+    Clips are named after their parameters, so a work directory can be
+    reused across runs without regenerating the media.
+    """
+    width, height = size
+    path = Path(directory) / f"{kind}_{width}x{height}_{duration:g}s.mp4"
+    if path.exists():
+        return path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp.mp4")
+    logging.info("Generating %s", path.name)
+    try:
+        subprocess.run(
+            clip_command(tmp, duration, size, kind=kind), check=True, stderr=subprocess.PIPE
+        )
+    except subprocess.CalledProcessError as exc:
+        tmp.unlink(missing_ok=True)
+        logging.error("ffmpeg failed: %s", exc.stderr.decode(errors="replace"))
+        raise RuntimeError(f"Could not generate {path.name}") from exc
+    tmp.replace(path)
+    return path
+
+
+def synthetic_cues(count: int, *, words: int = 3) -> list[tuple[float, float, str]]:
+    """Return ``count`` evenly spaced cues of ``words`` words each."""
+    cues = []
+    for index in range(count):
+        start = index * 0.9
+        text = " ".join(f"word{index}_{n}" for n in range(words))
+        cues.append((start, start + 0.8, text))
+    return cues
@@ -1,9 +1,10 @@
 """Public API for the :mod:`core` package.
 
-Importing :mod:`shorts` pulls in heavy dependencies (``faster-whisper`` in
-particular).  Tests in lightweight environments may not have these optional
-packages installed, so ``generate_short`` is loaded lazily to avoid import
-errors when the function is unused.  ``load_config`` and ``save_config`` are
+Importing :mod:`shorts` pulls in the whole render pipeline, and transcribing
+pulls in ``faster-whisper``.  Tests in lightweight environments may not have
+these optional packages installed, and ``--help``/``--version`` should start
+instantly, so the ``generate_*`` entry points are loaded lazily to avoid import costs and
+errors when the functions are unused.  ``load_config`` and ``save_config`` are
 cheap to import and exposed directly.
 """
 
@@ -18,4 +19,27 @@ def generate_short(*args, **kwargs):
 
     return _generate_short(*args, **kwargs)
 
-__all__ = ["generate_short", "load_config", "save_config", "__version__"]
+
+def generate_shorts(*args, **kwargs):
+    """Import :func:`~core.shorts.generate_shorts` on demand and execute it."""
+
+    from .shorts import generate_shorts as _generate_shorts
+
+    return _generate_shorts(*args, **kwargs)
+
+
+def generate_preview(*args, **kwargs):
+    """Import :func:`~core.shorts.generate_preview` on demand and execute it."""
+
+    from .shorts import generate_preview as _generate_preview
+
+    return _generate_preview(*args, **kwargs)
+
+__all__ = [
+    "generate_short",
+    "generate_shorts",
+    "generate_preview",
+    "load_config",
+    "save_config",
+    "__version__",
+]
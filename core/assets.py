@@ -0,0 +1,96 @@
+"""Pre-rendered bottom-clip loops.
+
+The same few gameplay loops get used as the bottom clip over and over.
+Instead of decoding, scaling and cropping the source on every render, a
+bottom clip can be transcoded once per target size into a small, already
+cropped intermediate tuned for fast decoding. :func:`~core.ffmpeg_handler.
+build_stack` uses a matching asset automatically when one exists.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import subprocess
+import threading
+from pathlib import Path
+
+from .cache import CACHE_DIR
+from .profiling import span
+
+
+ASSET_DIR = CACHE_DIR / "bottom"
+
+_locks: dict[Path, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+
+def asset_path(bottom: Path, size: tuple[int, int]) -> Path:
+    """Return where the asset for ``bottom`` at ``size`` is stored.
+
+    The name covers the source's path, size and mtime, so editing the source
+    clip produces a new asset rather than reusing a stale one.
+    """
+    st = bottom.stat()
+    width, height = size
+    ident = f"{bottom.resolve()}|{st.st_size}|{st.st_mtime_ns}|{width}x{height}"
+    digest = hashlib.sha256(ident.encode("utf-8")).hexdigest()[:16]
+    return ASSET_DIR / f"{bottom.stem}-{digest}-{width}x{height}.mp4"
+
+
+def find_bottom_asset(bottom: Path, size: tuple[int, int]) -> Path | None:
+    """Return the prepared asset for ``bottom`` at ``size`` if it exists."""
+    try:
+        path = asset_path(bottom, size)
+    except OSError:
+        return None
+    return path if path.exists() else None
+
+
+def prepare_bottom_asset(bottom: Path, size: tuple[int, int]) -> Path:
+    """Transcode ``bottom`` to a cropped ``size`` asset unless it exists.
+
+    The asset is silent, already scaled and cropped exactly like
+    ``build_stack`` would do it, and encoded with ``-tune fastdecode`` and a
+    short GOP so decoding and seeking it is cheap.
+    """
+    bottom = Path(bottom)
+    path = asset_path(bottom, size)
+    with _locks_guard:
+        lock = _locks.setdefault(path, threading.Lock())
+    with lock:
+        if path.exists():
+            return path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        width, height = size
+        tmp = path.with_name(f".{path.stem}.{os.getpid()}.tmp.mp4")
+        cmd = [
+            "ffmpeg", "-y", "-v", "error",
+            "-i", str(bottom),
+            "-an",
+            "-vf", f"scale={width}:-2,crop={width}:{height}",
+            "-c:v", "libx264", "-preset", "veryfast", "-crf", "18",
+            "-tune", "fastdecode", "-g", "30", "-pix_fmt", "yuv420p",
+            str(tmp),
+        ]
+        logging.info("Preparing bottom clip asset %s", path.name)
+        try:
+            with span("bottom_asset", file=bottom.name):
+                subprocess.run(cmd, check=True, stderr=subprocess.PIPE)
+        except subprocess.CalledProcessError as exc:
+            tmp.unlink(missing_ok=True)
+            logging.error("ffmpeg failed: %s", exc.stderr.decode())
+            raise RuntimeError(f"Could not prepare bottom clip {bottom}") from exc
+        os.replace(tmp, path)
+    return path
+
+
+def purge_bottom_assets() -> int:
+    """Delete every prepared bottom-clip asset and return how many."""
+    count = 0
+    if ASSET_DIR.exists():
+        for entry in ASSET_DIR.glob("*.mp4"):
+            entry.unlink(missing_ok=True)
+            count += 1
+    return count
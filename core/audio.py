@@ -0,0 +1,95 @@
+"""Decode a clip's audio once and share it between analysis stages.
+
+Whisper, the transcript cache hash and silence detection all want the same
+16 kHz mono signal. :func:`extract_audio` decodes it with a single ffmpeg run
+into a temporary float32 file and memory-maps it, so every consumer reads the
+same pages instead of decoding the clip again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import subprocess
+import tempfile
+from pathlib import Path
+
+from .profiling import span
+
+
+SAMPLE_RATE = 16000
+
+
+def decode_command(path: Path, output: str) -> list[str]:
+    """Return the ffmpeg command decoding ``path`` to raw 16 kHz mono float32."""
+    return [
+        "ffmpeg", "-v", "error", "-nostdin", "-y", "-i", str(path),
+        "-map", "0:a:0", "-ac", "1", "-ar", str(SAMPLE_RATE), "-f", "f32le", output,
+    ]
+
+
+class AudioBuffer:
+    """Memory-mapped 16 kHz mono float32 samples backed by a temp file.
+
+    Use as a context manager, or call :meth:`close`, to remove the file.
+    """
+
+    sample_rate = SAMPLE_RATE
+
+    def __init__(self, raw_path: Path) -> None:
+        import numpy as np
+
+        self.raw_path = raw_path
+        if raw_path.stat().st_size:
+            self.samples = np.memmap(raw_path, dtype=np.float32, mode="r")
+        else:
+            self.samples = np.zeros(0, dtype=np.float32)
+        self._digest: str | None = None
+
+    @property
+    def duration(self) -> float:
+        """Length of the audio in seconds."""
+        return len(self.samples) / self.sample_rate
+
+    def digest(self) -> str:
+        """Return the SHA-256 of the samples (see :func:`core.cache.audio_fingerprint`)."""
+        if self._digest is None:
+            digest = hashlib.sha256()
+            with self.raw_path.open("rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+            self._digest = digest.hexdigest()
+        return self._digest
+
+    def close(self) -> None:
+        """Drop the mapping and delete the backing file."""
+        self.samples = None
+        try:
+            self.raw_path.unlink(missing_ok=True)
+        except PermissionError:  # pragma: no cover - Windows keeps mapped files locked
+            logging.debug("Could not remove %s yet", self.raw_path)
+
+    def __enter__(self) -> "AudioBuffer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def extract_audio(path: Path) -> AudioBuffer:
+    """Decode the first audio stream of ``path`` into an :class:`AudioBuffer`."""
+    fd, raw = tempfile.mkstemp(suffix=".f32")
+    os.close(fd)
+    raw_path = Path(raw)
+    with span("decode", file=path.name) as record:
+        try:
+            subprocess.run(decode_command(path, raw), check=True, stderr=subprocess.PIPE)
+        except subprocess.CalledProcessError as exc:
+            raw_path.unlink(missing_ok=True)
+            logging.error("ffmpeg audio decode failed: %s", exc.stderr.decode(errors="replace"))
+            raise RuntimeError(f"Could not decode audio from {path}") from exc
+        buffer = AudioBuffer(raw_path)
+        if record is not None:
+            record.media = buffer.duration
+    return buffer
@@ -0,0 +1,315 @@
+"""Render many shorts from a manifest in one process.
+
+Jobs flow through two stages: transcription (Whisper) and encoding (ffmpeg).
+Each stage has its own worker pool so the transcription of job N+1 overlaps
+with the encode of job N, and the Whisper model stays loaded between jobs.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from .cancel import CancelToken
+from .utils import parse_resolution, validate_media
+
+
+# Columns or keys a manifest entry may have; anything else is rejected
+MANIFEST_FIELDS = ("top", "bottom", "output", "style", "resolution")
+
+
+class BatchJob:
+    """A single manifest entry and its outcome."""
+
+    def __init__(
+        self,
+        index: int,
+        top: Path,
+        bottom: Path,
+        output: Path,
+        *,
+        style: Dict[str, str | int] | None = None,
+        resolution: tuple[int, int] = (1080, 1920),
+    ) -> None:
+        self.index = index
+        self.top = top
+        self.bottom = bottom
+        self.output = output
+        self.style = style
+        self.resolution = resolution
+        self.status = "pending"
+        self.error = ""
+        self.timings: Dict[str, float] = {}
+
+    def report(self) -> dict:
+        """Return a JSON-serialisable status record for this job."""
+        return {
+            "index": self.index,
+            "top": str(self.top),
+            "bottom": str(self.bottom),
+            "output": str(self.output),
+            "status": self.status,
+            "error": self.error,
+            "timings": {k: round(v, 3) for k, v in self.timings.items()},
+        }
+
+
+def load_manifest(path: Path | str) -> List[BatchJob]:
+    """Read batch jobs from a CSV or JSONL manifest.
+
+    Each entry needs ``top`` and ``bottom``; ``output``, ``style`` (a JSON
+    object of ASS style overrides) and ``resolution`` (``WIDTHxHEIGHT``) are
+    optional. Relative paths are resolved against the manifest's directory.
+    Entries with any other field raise ``ValueError``, so a misspelt column
+    is not silently ignored.
+    """
+    path = Path(path)
+    if path.suffix.lower() in (".jsonl", ".ndjson"):
+        with path.open("r", encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+    else:
+        with path.open("r", encoding="utf-8", newline="") as f:
+            rows = list(csv.DictReader(f))
+
+    base = path.parent
+    jobs = []
+    for index, row in enumerate(rows):
+        if not isinstance(row, dict):
+            raise ValueError(f"{path}: entry {index} is not an object")
+        # csv.DictReader files values beyond the header under None
+        unknown = sorted(
+            "<extra column>" if key is None else str(key)
+            for key in row
+            if key not in MANIFEST_FIELDS
+        )
+        if unknown:
+            raise ValueError(
+                f"{path}: entry {index} has unknown field(s) {', '.join(unknown)}; "
+                f"use {', '.join(MANIFEST_FIELDS)}"
+            )
+        if not row.get("top") or not row.get("bottom"):
+            raise ValueError(f"{path}: entry {index} needs 'top' and 'bottom'")
+        top = base / row["top"]
+        bottom = base / row["bottom"]
+        output = row.get("output")
+        output = base / output if output else top.with_name(f"{top.stem}_short.mp4")
+
+        style = row.get("style") or None
+        if isinstance(style, str):
+            style = json.loads(style)
+
+        resolution = row.get("resolution") or "1080x1920"
+        if isinstance(resolution, str):
+            resolution = parse_resolution(resolution)
+
+        jobs.append(
+            BatchJob(
+                index,
+                top,
+                bottom,
+                output,
+                style=style,
+                resolution=tuple(resolution),
+            )
+        )
+    return jobs
+
+
+class BatchScheduler:
+    """Two-stage pipeline running transcription and encoding concurrently.
+
+    ``max_pending`` bounds how many jobs may be transcribed but not yet
+    encoded, which caps the number of temporary subtitle files and keeps
+    Whisper from running far ahead of ffmpeg. ``timeouts`` bound each
+    job's stages (see :func:`~core.shorts.generate_short`) so one stuck clip
+    fails alone instead of blocking a worker; cancelling ``cancel`` stops
+    the whole batch.
+    """
+
+    def __init__(
+        self,
+        *,
+        model_size: str = "base",
+        device: str = "auto",
+        compute_type: str = "auto",
+        use_cache: bool = True,
+        encoder: str | None = None,
+        preset: str | None = None,
+        crf: int | None = None,
+        cache_bottom: bool = False,
+        segments: int = 1,
+        karaoke: str | None = None,
+        timeouts: Dict[str, float] | None = None,
+        cancel: CancelToken | None = None,
+        transcribe_workers: int = 1,
+        encode_workers: int = 1,
+        max_pending: int | None = None,
+        report_path: Path | str | None = None,
+        progress: Callable[[str], None] | None = None,
+    ) -> None:
+        if transcribe_workers < 1 or encode_workers < 1:
+            raise ValueError("Worker counts must be at least 1")
+        self.model_size = model_size
+        self.device = device
+        self.compute_type = compute_type
+        self.use_cache = use_cache
+        self.encoder = encoder
+        self.preset = preset
+        self.crf = crf
+        self.cache_bottom = cache_bottom
+        self.segments = segments
+        self.karaoke = karaoke
+        self.timeouts = timeouts
+        self.cancel = cancel
+        self.transcribe_workers = transcribe_workers
+        self.encode_workers = encode_workers
+        self.max_pending = max_pending or encode_workers + 1
+        self.report_path = Path(report_path) if report_path else None
+        self.progress = progress
+        self._report_lock = threading.Lock()
+
+    def run(self, jobs: List[BatchJob]) -> List[BatchJob]:
+        """Process ``jobs`` and return them with status and timings filled."""
+        from .ffmpeg_handler import detect_encoder
+
+        # Probe once up front rather than from every encode worker
+        self._encoder = self.encoder or detect_encoder()
+        if self.report_path:
+            self.report_path.write_text("", encoding="utf-8")
+
+        slots = threading.BoundedSemaphore(self.max_pending)
+        with ThreadPoolExecutor(
+            self.transcribe_workers, thread_name_prefix="transcribe"
+        ) as transcribe_pool, ThreadPoolExecutor(
+            self.encode_workers, thread_name_prefix="encode"
+        ) as encode_pool:
+            encodes = []
+            transcribes = []
+            for job in jobs:
+                slots.acquire()
+                transcribes.append(
+                    transcribe_pool.submit(
+                        self._transcribe_stage, job, slots, encode_pool, encodes
+                    )
+                )
+            for fut in transcribes:
+                fut.result()
+            # Encode futures are only appended by transcribe stages, which
+            # have all finished at this point.
+            for fut in encodes:
+                fut.result()
+
+        done = sum(job.status == "done" for job in jobs)
+        logging.info("Batch finished: %d/%d jobs succeeded", done, len(jobs))
+        return jobs
+
+    def _transcribe_stage(self, job, slots, encode_pool, encodes) -> None:
+        from .shorts import analyze_top
+
+        job.status = "transcribing"
+        self._notify(job)
+        started = time.perf_counter()
+        try:
+            validate_media(job.top, require_audio=True)
+            validate_media(job.bottom)
+            subtitle_path, loudness = analyze_top(
+                job.top,
+                self.model_size,
+                device=self.device,
+                compute_type=self.compute_type,
+                style=job.style,
+                resolution=job.resolution,
+                karaoke=self.karaoke,
+                use_cache=self.use_cache,
+                cancel=self.cancel,
+                timeouts=self.timeouts,
+            )
+        except Exception as exc:
+            job.timings["transcribe"] = time.perf_counter() - started
+            self._finish(job, exc)
+            slots.release()
+            return
+        job.timings["transcribe"] = time.perf_counter() - started
+        job.status = "queued"
+        encodes.append(
+            encode_pool.submit(self._encode_stage, job, subtitle_path, loudness, slots)
+        )
+
+    def _encode_stage(self, job, subtitle_path: Path, loudness, slots) -> None:
+        from .shorts import encode_short
+
+        job.status = "encoding"
+        self._notify(job)
+        started = time.perf_counter()
+        error = None
+        try:
+            encode_short(
+                job.top,
+                job.bottom,
+                subtitle_path,
+                job.output,
+                resolution=job.resolution,
+                encoder=self._encoder,
+                preset=self.preset,
+                crf=self.crf,
+                cache_bottom=self.cache_bottom,
+                loudness=loudness,
+                segments=self.segments,
+                cancel=self.cancel,
+                timeouts=self.timeouts,
+            )
+        except Exception as exc:
+            error = exc
+        finally:
+            job.timings["encode"] = time.perf_counter() - started
+            subtitle_path.unlink(missing_ok=True)
+            slots.release()
+        self._finish(job, error)
+
+    def _finish(self, job: BatchJob, error: Exception | None) -> None:
+        job.timings["total"] = sum(job.timings.values())
+        if error is None:
+            job.status = "done"
+        else:
+            job.status = "failed"
+            job.error = str(error)
+            logging.error("Job %d (%s) failed: %s", job.index, job.top, error)
+        self._notify(job)
+        if self.report_path:
+            with self._report_lock, self.report_path.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(job.report()) + "\n")
+
+    def _notify(self, job: BatchJob) -> None:
+        if self.progress:
+            self.progress(f"[{job.index}] {job.top.name}: {job.status}")
+
+
+def run_batch(
+    manifest: Path | str,
+    *,
+    report_path: Path | str | None = None,
+    style: Dict[str, str | int] | None = None,
+    **kwargs,
+) -> List[BatchJob]:
+    """Load ``manifest`` and render every entry.
+
+    The report defaults to ``<manifest>.report.jsonl`` and receives one JSON
+    line per job as soon as it finishes. ``style`` applies to every job; a
+    job's own ``style`` overrides it key by key. Remaining keyword arguments
+    are passed to :class:`BatchScheduler`.
+    """
+    manifest = Path(manifest)
+    if report_path is None:
+        report_path = manifest.with_suffix(".report.jsonl")
+    jobs = load_manifest(manifest)
+    if style:
+        for job in jobs:
+            job.style = {**style, **(job.style or {})}
+    scheduler = BatchScheduler(report_path=report_path, **kwargs)
+    return scheduler.run(jobs)
@@ -0,0 +1,160 @@
+"""On-disk cache for transcription results and other per-audio analysis.
+
+Entries are keyed by a hash of the decoded audio stream plus the settings
+that influence the output, so re-rendering the same top clip with another
+bottom clip, style or resolution skips Whisper entirely. The cache is bounded
+in size and evicts the least recently used entries first.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import subprocess
+import tempfile
+import threading
+from pathlib import Path
+from typing import List, Tuple
+
+from .audio import decode_command
+
+CACHE_DIR = Path(os.getenv("SHORTSSPLIT_CACHE_DIR", Path.home() / ".shortssplit_cache"))
+
+# Default size limit for cached transcripts
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Fingerprints computed in this process, keyed by (path, size, mtime)
+_fingerprints: dict[tuple, str] = {}
+_fingerprints_lock = threading.Lock()
+
+
+def audio_fingerprint(path: Path) -> str:
+    """Return a SHA-256 of the first audio stream of ``path``.
+
+    The audio is decoded to 16 kHz mono float32, the same samples
+    :class:`core.audio.AudioBuffer` holds, so both produce identical hashes.
+    The hash only changes when the sound does, not when the container or
+    video stream is rewritten. Results are remembered for the lifetime of
+    the process while the file's size and mtime stay the same, so repeated
+    previews of one clip do not decode it again.
+    """
+    try:
+        st = Path(path).stat()
+        memo_key = (str(Path(path).resolve()), st.st_size, st.st_mtime_ns)
+    except OSError:
+        memo_key = None
+    with _fingerprints_lock:
+        if memo_key in _fingerprints:
+            return _fingerprints[memo_key]
+
+    digest = hashlib.sha256()
+    proc = subprocess.Popen(
+        decode_command(path, "-"), stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+    for chunk in iter(lambda: proc.stdout.read(1 << 16), b""):
+        digest.update(chunk)
+    stderr = proc.stderr.read()
+    if proc.wait() != 0:
+        logging.error("ffmpeg audio decode failed: %s", stderr.decode(errors="replace"))
+        raise RuntimeError(f"Could not decode audio from {path}")
+    if memo_key is not None:
+        with _fingerprints_lock:
+            _fingerprints[memo_key] = digest.hexdigest()
+    return digest.hexdigest()
+
+
+class TranscriptCache:
+    """Size-bounded LRU store of subtitle cues on disk."""
+
+    def __init__(self, root: Path | None = None, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.root = Path(root) if root is not None else CACHE_DIR / "transcripts"
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def make_key(audio_hash: str, **params) -> str:
+        """Return the cache key for ``audio_hash`` transcribed with ``params``."""
+        blob = json.dumps({"audio": audio_hash, **params}, sort_keys=True)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def _entry(self, key: str) -> Path:
+        return self.root / f"{key}.json"
+
+    def load(self, key: str) -> dict | None:
+        """Return the raw JSON payload stored under ``key`` or ``None``."""
+        entry = self._entry(key)
+        try:
+            data = json.loads(entry.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            logging.warning("Dropping unreadable cache entry %s: %s", entry, exc)
+            entry.unlink(missing_ok=True)
+            return None
+        # Reads count as use for LRU purposes
+        os.utime(entry)
+        return data
+
+    def store(self, key: str, payload: dict) -> None:
+        """Store JSON ``payload`` under ``key`` and evict old entries if needed."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        # Write atomically so concurrent readers never see partial files
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+        os.replace(tmp, self._entry(key))
+        self.evict()
+
+    def get(self, key: str) -> List[Tuple[float, float, str]] | None:
+        """Return cached cues for ``key`` or ``None`` on a miss."""
+        data = self.load(key)
+        if data is None or "cues" not in data:
+            return None
+        return [tuple(cue) for cue in data["cues"]]
+
+    def get_words(self, key: str) -> List[Tuple[float, float, str]] | None:
+        """Return the word timestamps stored with the cues for ``key``."""
+        data = self.load(key)
+        if data is None or "words" not in data:
+            return None
+        return [tuple(word) for word in data["words"]]
+
+    def put(
+        self,
+        key: str,
+        cues: List[Tuple[float, float, str]],
+        words: List[Tuple[float, float, str]] | None = None,
+    ) -> None:
+        """Store ``cues`` (and optionally the ``words`` they came from) under ``key``."""
+        payload = {"cues": [list(c) for c in cues]}
+        if words is not None:
+            payload["words"] = [list(w) for w in words]
+        self.store(key, payload)
+
+    def evict(self) -> None:
+        """Delete least recently used entries until under ``max_bytes``."""
+        if not self.root.exists():
+            return
+        entries = []
+        for entry in self.root.glob("*.json"):
+            try:
+                st = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, entry))
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            total -= size
+
+    def purge(self) -> int:
+        """Remove every cached entry and return how many were deleted."""
+        count = 0
+        if self.root.exists():
+            for entry in self.root.glob("*.json"):
+                entry.unlink(missing_ok=True)
+                count += 1
+        return count
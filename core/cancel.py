@@ -0,0 +1,122 @@
+"""Cancellation tokens and per-stage timeouts for renders.
+
+A :class:`CancelToken` is passed down the pipeline. Long loops call
+:meth:`CancelToken.raise_if_cancelled` between units of work, and code that
+owns a subprocess registers a callback that kills it. :meth:`CancelToken.child`
+derives a token for one stage that also fires after a timeout, so a stuck
+ffmpeg or Whisper call cannot hold a render slot forever.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Callable
+
+
+class Cancelled(RuntimeError):
+    """The render was cancelled by the caller."""
+
+
+class StageTimeout(RuntimeError):
+    """A render stage ran longer than its timeout."""
+
+
+class CancelToken:
+    """Thread-safe cancellation flag with callbacks.
+
+    Cancelling a token cancels every child derived from it. The exception
+    passed to :meth:`cancel` (``Cancelled`` by default) is what
+    :meth:`raise_if_cancelled` raises.
+    """
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: list[Callable[[], None]] = []
+        self.reason: Exception | None = None
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether :meth:`cancel` has been called."""
+        return self._event.is_set()
+
+    def cancel(self, reason: Exception | None = None) -> None:
+        """Cancel the token and run its callbacks once."""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason or Cancelled("Render cancelled")
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def raise_if_cancelled(self) -> None:
+        """Raise the cancellation reason if the token was cancelled."""
+        if self._event.is_set():
+            raise self.reason
+
+    def add_callback(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Run ``callback`` on cancellation and return a function removing it.
+
+        If the token is already cancelled ``callback`` runs immediately.
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return lambda: self._remove(callback)
+        callback()
+        return lambda: None
+
+    def _remove(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until cancelled or ``timeout`` passes; return ``cancelled``."""
+        return self._event.wait(timeout)
+
+    def child(self, timeout: float | None = None, stage: str = "stage") -> "ChildToken":
+        """Return a token cancelled with this one or after ``timeout`` seconds."""
+        return ChildToken(self, timeout, stage)
+
+
+class ChildToken(CancelToken):
+    """Token for one stage; use as a context manager to stop its timer."""
+
+    def __init__(self, parent: CancelToken | None, timeout: float | None, stage: str) -> None:
+        super().__init__()
+        self._detach = None
+        if parent is not None:
+            self._detach = parent.add_callback(lambda: self.cancel(parent.reason))
+        self._timer = None
+        if timeout is not None:
+            self._timer = threading.Timer(
+                timeout,
+                self.cancel,
+                args=(StageTimeout(f"{stage} timed out after {timeout:g}s"),),
+            )
+            self._timer.daemon = True
+            self._timer.start()
+
+    def close(self) -> None:
+        """Stop the timer and stop following the parent."""
+        if self._timer is not None:
+            self._timer.cancel()
+        if self._detach is not None:
+            self._detach()
+
+    def __enter__(self) -> "ChildToken":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def stage_token(
+    cancel: CancelToken | None, timeouts: dict | None, stage: str
+) -> ChildToken:
+    """Return the token for ``stage``: ``cancel`` plus ``timeouts[stage]``."""
+    timeout = (timeouts or {}).get(stage)
+    return ChildToken(cancel, timeout, stage)
@@ -1,9 +1,257 @@
 import logging
+import os
+import shutil
+import signal
 import subprocess
 import re
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Callable
 
-from .utils import probe_duration
+from .assets import find_bottom_asset
+from .cancel import CancelToken, ChildToken
+from .host_profile import load_host_profile, update_host_profile
+from .loudness import loudnorm_filter
+from .media import probe_media
+from .profiling import span
+from .progress import ProgressTracker
+from .variants import OutputProfile
+
+
+# H.264 encoders in order of preference; libx264 is the universal fallback
+ENCODER_PREFERENCE = ("h264_nvenc", "libx264")
+
+# Lines of ffmpeg's stderr kept for the error log of a failed run
+STDERR_TAIL = 200
+
+# Seconds a cancelled ffmpeg gets to exit after SIGTERM before SIGKILL
+KILL_GRACE = 5.0
+
+# libvpx has no x264 presets; each maps to a "good" deadline -cpu-used speed
+VPX_SPEEDS = {
+    "veryslow": 0,
+    "slower": 1,
+    "slow": 2,
+    "medium": 3,
+    "fast": 4,
+    "faster": 5,
+    "veryfast": 5,
+    "superfast": 5,
+    "ultrafast": 5,
+}
+VPX_DEADLINES = ("best", "good", "realtime")
+
+
+def list_encoders() -> set[str]:
+    """Return the names of all encoders compiled into ffmpeg."""
+    result = subprocess.run(
+        ["ffmpeg", "-hide_banner", "-encoders"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    names = set()
+    for line in result.stdout.splitlines():
+        parts = line.split()
+        # Encoder lines look like " V....D libx264   libx264 H.264 ..."
+        if len(parts) >= 2 and len(parts[0]) == 6 and parts[0][0] in "VAS":
+            names.add(parts[1])
+    return names
+
+
+def _test_encode(encoder: str) -> bool:
+    """Return ``True`` if ``encoder`` can encode a tiny synthetic clip."""
+    cmd = [
+        "ffmpeg", "-v", "error",
+        "-f", "lavfi", "-i", "color=c=black:s=256x256:d=0.1",
+        "-frames:v", "1", "-c:v", encoder, "-f", "null", "-",
+    ]
+    try:
+        subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=30)
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as exc:
+        logging.debug("Test encode with %s failed: %s", encoder, exc)
+        return False
+    return True
+
+
+def detect_encoder(*, refresh: bool = False) -> str:
+    """Return the best working H.264 encoder on this host.
+
+    The result is cached in the host profile together with the ffmpeg binary
+    it was probed against, so the probe only reruns when ffmpeg changes or
+    ``refresh`` is set.
+    """
+    ffmpeg_path = shutil.which("ffmpeg") or "ffmpeg"
+    profile = load_host_profile()
+    if not refresh and profile.get("encoder") and profile.get("ffmpeg") == ffmpeg_path:
+        return profile["encoder"]
+
+    available = list_encoders()
+    encoder = "libx264"
+    for candidate in ENCODER_PREFERENCE:
+        if candidate in available and _test_encode(candidate):
+            encoder = candidate
+            break
+    logging.info("Selected video encoder: %s", encoder)
+    update_host_profile(encoder=encoder, ffmpeg=ffmpeg_path)
+    return encoder
+
+
+def encoder_args(
+    encoder: str,
+    *,
+    preset: str | None = None,
+    crf: int | None = None,
+    tune: str | None = None,
+    bitrate: str | None = None,
+) -> list[str]:
+    """Return ffmpeg video codec arguments for ``encoder``.
+
+    ``bitrate`` caps the video bitrate. For libvpx, x264 preset names are
+    translated to ``-deadline``/``-cpu-used``, and a ``crf`` without a
+    bitrate selects constant-quality mode with ``-b:v 0``.
+    """
+    args = ["-c:v", encoder]
+    vpx = encoder.startswith("libvpx")
+    if preset and vpx:
+        if preset in VPX_SPEEDS:
+            args += ["-deadline", "good", "-cpu-used", str(VPX_SPEEDS[preset])]
+        elif preset in VPX_DEADLINES:
+            args += ["-deadline", preset]
+        else:
+            logging.warning("Ignoring preset %r, which %s does not support", preset, encoder)
+    elif preset:
+        args += ["-preset", preset]
+    if tune:
+        args += ["-tune", tune]
+    if crf is not None:
+        # NVENC has no CRF; constant-quality mode is the closest match
+        args += ["-cq", str(crf)] if encoder.endswith("_nvenc") else ["-crf", str(crf)]
+    if bitrate:
+        args += ["-b:v", bitrate, "-maxrate", bitrate, "-bufsize", bitrate]
+    elif vpx and crf is not None:
+        # Without a zero target libvpx treats -crf as a floor under its default bitrate
+        args += ["-b:v", "0"]
+    return args
+
+
+def _new_group() -> dict:
+    """Popen arguments starting the child in its own process group."""
+    if os.name == "nt":
+        return {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {"start_new_session": True}
+
+
+def _signal_group(proc: subprocess.Popen, sig: int) -> None:
+    if proc.poll() is not None:
+        return
+    try:
+        if os.name == "nt":
+            # TerminateProcess is already a hard kill; ffmpeg has no children
+            proc.terminate()
+        else:
+            os.killpg(proc.pid, sig)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def _terminate(proc: subprocess.Popen) -> None:
+    """Stop ``proc``'s process group: SIGTERM now, SIGKILL after a grace period."""
+    _signal_group(proc, signal.SIGTERM)
+    killer = threading.Timer(
+        KILL_GRACE, _signal_group, args=(proc, getattr(signal, "SIGKILL", signal.SIGTERM))
+    )
+    killer.daemon = True
+    killer.start()
+
+
+def _run_ffmpeg(
+    cmd: list[str],
+    on_progress: Callable[[dict], None] | None = None,
+    cancel: CancelToken | None = None,
+) -> None:
+    """Run an ffmpeg command, raising ``RuntimeError`` on failure.
+
+    ffmpeg writes machine-readable ``-progress`` blocks to stdout, which are
+    parsed as they arrive and passed to ``on_progress`` as ``key: value``
+    dicts. Only the last :data:`STDERR_TAIL` lines of stderr are kept, so
+    long renders do not buffer their whole log in memory. Cancelling
+    ``cancel`` terminates ffmpeg's process group and raises the token's
+    reason (:class:`~core.cancel.Cancelled` or a stage timeout).
+    """
+    if cancel is not None:
+        cancel.raise_if_cancelled()
+    cmd = [cmd[0], "-progress", "pipe:1", "-nostats", *cmd[1:]]
+    logging.debug("Running ffmpeg: %s", " ".join(cmd))
+    try:
+        proc = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            errors="replace",
+            **_new_group(),
+        )
+    except OSError as exc:
+        raise RuntimeError("ffmpeg encoding failed") from exc
+    detach = cancel.add_callback(lambda: _terminate(proc)) if cancel is not None else None
+
+    # Drain stderr concurrently so a chatty ffmpeg never blocks on the pipe
+    tail: deque[str] = deque(maxlen=STDERR_TAIL)
+    reader = threading.Thread(target=tail.extend, args=(proc.stderr,), daemon=True)
+    reader.start()
+
+    fields = {}
+    try:
+        for line in proc.stdout:
+            key, _, value = line.strip().partition("=")
+            fields[key] = value
+            if key == "progress":
+                if on_progress:
+                    on_progress(fields)
+                fields = {}
+        returncode = proc.wait()
+    except BaseException:
+        # In its own process group ffmpeg no longer sees the terminal's
+        # Ctrl-C, so take it down with us
+        _terminate(proc)
+        raise
+    finally:
+        reader.join(timeout=KILL_GRACE)
+    if detach is not None:
+        detach()
+        cancel.raise_if_cancelled()
+    if returncode != 0:
+        logging.error("ffmpeg failed: %s", "".join(tail))
+        raise RuntimeError("ffmpeg encoding failed")
+
+
+def _subtitle_filter(subtitle: Path) -> str:
+    """Return the ``ass`` filter for ``subtitle`` with its path escaped."""
+    # Prepare subtitle path: forward slashes + escape the "C:" drive-colon
+    sub_path = subtitle.as_posix()
+    sub_path = re.sub(r'^([A-Za-z]):', r'\1\\:', sub_path, count=1)
+    sub_path = sub_path.replace("'", "\\'")
+    return f"ass='{sub_path}'"
+
+
+def segment_bounds(duration: float, fps: float, segments: int, gop: int) -> list[tuple[float, float]]:
+    """Split ``duration`` into up to ``segments`` ``(start, length)`` pieces.
+
+    Every boundary falls on a multiple of ``gop`` frames, so each segment
+    starts exactly where a regular GOP of the joined stream would.
+    """
+    total_frames = max(1, round(duration * fps))
+    per_segment = -(-total_frames // segments)  # ceil
+    per_segment = -(-per_segment // gop) * gop
+    bounds = []
+    for first in range(0, total_frames, per_segment):
+        frames = min(per_segment, total_frames - first)
+        bounds.append((first / fps, frames / fps))
+    return bounds
 
 
 def build_stack(
@@ -13,56 +261,276 @@ def build_stack(
     out_path: Path,
     *,
     resolution: tuple[int, int] = (1080, 1920),
+    encoder: str | None = None,
+    preset: str | None = None,
+    crf: int | None = None,
+    tune: str | None = None,
+    loudness: dict | None = None,
+    segments: int = 1,
+    start: float = 0.0,
+    duration: float | None = None,
+    progress: Callable[[str], None] | None = None,
+    cancel: CancelToken | None = None,
 ) -> None:
-    """Create the stacked video with subtitles burned into the top clip."""
-    duration = probe_duration(top)
+    """Create the stacked video with subtitles burned into the top clip.
 
-    # Prepare subtitle path: forward slashes + escape the "C:" drive-colon
-    sub_path = subtitle.as_posix()
-    sub_path = re.sub(r'^([A-Za-z]):', r'\1\\:', sub_path, count=1)
-    sub_path = sub_path.replace("'", "\\'")
+    ``encoder`` defaults to the host's detected encoder (see
+    :func:`detect_encoder`); ``preset``, ``crf`` and ``tune`` set its
+    speed/quality trade-off.
+    If a pre-cropped asset of ``bottom`` exists for this resolution (see
+    :mod:`core.assets`) it replaces the raw bottom clip. With ``loudness``
+    measurements (see :mod:`core.loudness`) the audio is normalised with a
+    single linear gain instead of dynamic single-pass ``loudnorm``.
+
+    With ``segments`` > 1 the video is rendered as that many GOP-aligned
+    pieces by parallel ffmpeg processes and joined without re-encoding; see
+    :func:`_build_segmented`.
+
+    ``start`` and ``duration`` limit the render to that window of ``top``;
+    the subtitles are expected to be timed relative to ``start``.
+
+    ``progress`` receives :class:`~core.progress.ProgressEvent` messages
+    with percent complete and ETA while ffmpeg runs. Cancelling ``cancel``
+    kills the running ffmpeg processes (see :func:`_run_ffmpeg`). The run is
+    recorded as an ``encode`` span when profiling (see :mod:`core.profiling`).
+    """
+    info = probe_media(top)
+    if duration is None:
+        duration = info.duration - start
+    window = ["-ss", f"{start}", "-t", f"{duration}"] if start or duration != info.duration else []
 
     # ASS subtitles
-    sub_filter = f"ass='{sub_path}'"
+    sub_filter = _subtitle_filter(subtitle)
 
     # Scale→crop→subtitles on top; scale→crop→trim→setpts on bottom; then vstack
     width, height = resolution
     half = height // 2
-    filter_complex = (
-        f"[0:v]scale={width}:-2,crop={width}:{half},{sub_filter}[top];"
-        f"[1:v]scale={width}:-2,crop={width}:{half},trim=duration={duration},"
-        "setpts=PTS-STARTPTS[bottom];"
-        "[top][bottom]vstack=inputs=2[v]"
-    )
+    bottom_asset = find_bottom_asset(bottom, (width, half))
+    if bottom_asset is not None:
+        logging.debug("Using prepared bottom clip %s", bottom_asset)
+        bottom = bottom_asset
+        bottom_filter = ""
+    else:
+        bottom_filter = f"scale={width}:-2,crop={width}:{half},"
 
-    base_cmd = [
-        "ffmpeg", "-y", "-hwaccel", "auto",
-        "-i", str(top),
-        "-stream_loop", "-1", "-i", str(bottom),
-        "-filter_complex", filter_complex,
-        "-map", "[v]",
-        "-map", "0:a",
-        "-c:a", "aac",
-        "-af", "loudnorm",
-        "-shortest",
-        "-movflags", "+faststart",
-    ]
+    if encoder is None:
+        encoder = detect_encoder()
+    video_args = encoder_args(encoder, preset=preset, crf=crf, tune=tune)
+    audio_args = ["-c:a", "aac", "-af", loudnorm_filter(loudness)]
 
-    cmd_nvenc = base_cmd + ["-c:v", "h264_nvenc", str(out_path)]
-    cmd_x264  = base_cmd + ["-c:v", "libx264",    str(out_path)]
+    with span("encode", media=duration, encoder=encoder, segments=segments):
+        if segments > 1:
+            _build_segmented(
+                top,
+                bottom,
+                out_path,
+                offset=start,
+                duration=duration,
+                fps=info.fps or 30.0,
+                segments=segments,
+                top_filter=f"scale={width}:-2,crop={width}:{half},{sub_filter}",
+                bottom_filter=bottom_filter,
+                video_args=video_args,
+                audio_args=audio_args,
+                progress=progress,
+                cancel=cancel,
+            )
+            return
 
-    logging.debug("Running ffmpeg (NVENC): %s", " ".join(cmd_nvenc))
-    try:
-        subprocess.run(cmd_nvenc, check=True, stderr=subprocess.PIPE)
-    except subprocess.CalledProcessError as exc:
-        logging.warning(
-            "h264_nvenc failed (exit %d), falling back to libx264",
-            exc.returncode,
+        filter_complex = (
+            f"[0:v]scale={width}:-2,crop={width}:{half},{sub_filter}[top];"
+            f"[1:v]{bottom_filter}trim=duration={duration},"
+            "setpts=PTS-STARTPTS[bottom];"
+            "[top][bottom]vstack=inputs=2[v]"
         )
-        logging.debug(exc.stderr.decode())
-        try:
-            subprocess.run(cmd_x264, check=True, stderr=subprocess.PIPE)
-        except subprocess.CalledProcessError as exc2:
-            logging.error("ffmpeg failed: %s", exc2.stderr.decode())
-            raise RuntimeError("ffmpeg encoding failed") from exc2
 
+        cmd = [
+            "ffmpeg", "-y", "-hwaccel", "auto",
+            *window, "-i", str(top),
+            "-stream_loop", "-1", "-i", str(bottom),
+            "-filter_complex", filter_complex,
+            "-map", "[v]",
+            "-map", "0:a",
+            *audio_args,
+            "-shortest",
+            "-movflags", "+faststart",
+            *video_args,
+            str(out_path),
+        ]
+        tracker = ProgressTracker(duration, progress) if progress else None
+        _run_ffmpeg(cmd, tracker.update if tracker else None, cancel)
+
+
+def _build_segmented(
+    top: Path,
+    bottom: Path,
+    out_path: Path,
+    *,
+    offset: float,
+    duration: float,
+    fps: float,
+    segments: int,
+    top_filter: str,
+    bottom_filter: str,
+    video_args: list[str],
+    audio_args: list[str],
+    progress: Callable[[str], None] | None = None,
+    cancel: CancelToken | None = None,
+) -> None:
+    """Render the video in parallel segments and concat them losslessly.
+
+    Each segment seeks both inputs to its start. The top clip's timestamps
+    are shifted back to the original timeline around the ``ass`` filter so
+    subtitles line up, and the looping bottom clip resumes where the
+    previous segment left off. Segments are video-only; the audio is encoded
+    once in the final concat step so no AAC priming gaps appear at the seams.
+    ``offset`` is where the rendered window starts in ``top``. Progress of
+    all segments is summed into one percentage. If one segment fails the
+    others are stopped.
+    """
+    gop = max(1, round(fps * 2))
+    bounds = segment_bounds(duration, fps, segments, gop)
+    bottom_duration = probe_media(bottom).duration
+
+    with tempfile.TemporaryDirectory(prefix="shortssplit-seg-") as tmp:
+        tmp_dir = Path(tmp)
+        commands = []
+        for index, (start, length) in enumerate(bounds):
+            bottom_start = start % bottom_duration if bottom_duration else 0.0
+            filter_complex = (
+                f"[0:v]setpts=PTS-STARTPTS+{start}/TB,{top_filter},"
+                "setpts=PTS-STARTPTS[top];"
+                f"[1:v]{bottom_filter}trim=duration={length},"
+                "setpts=PTS-STARTPTS[bottom];"
+                "[top][bottom]vstack=inputs=2[v]"
+            )
+            commands.append([
+                "ffmpeg", "-y", "-hwaccel", "auto",
+                "-ss", f"{offset + start}", "-t", f"{length}", "-i", str(top),
+                "-ss", f"{bottom_start}", "-stream_loop", "-1", "-i", str(bottom),
+                "-filter_complex", filter_complex,
+                "-map", "[v]", "-an",
+                "-frames:v", str(round(length * fps)),
+                "-g", str(gop),
+                *video_args,
+                str(tmp_dir / f"seg{index:04d}.mp4"),
+            ])
+
+        logging.info("Encoding %d segments in parallel", len(commands))
+        tracker = ProgressTracker(duration, progress, parts=len(commands)) if progress else None
+        with ChildToken(cancel, None, "encode") as group, ThreadPoolExecutor(
+            len(commands), thread_name_prefix="segment"
+        ) as pool:
+            futures = [
+                pool.submit(
+                    _run_ffmpeg,
+                    cmd,
+                    (lambda fields, part=index: tracker.update(fields, part)) if tracker else None,
+                    group,
+                )
+                for index, cmd in enumerate(commands)
+            ]
+            try:
+                for future in futures:
+                    future.result()
+            except BaseException:
+                group.cancel()
+                raise
+
+        concat_list = tmp_dir / "segments.txt"
+        concat_list.write_text(
+            "".join(f"file '{tmp_dir / f'seg{i:04d}.mp4'}'\n" for i in range(len(commands))),
+            encoding="utf-8",
+        )
+        _run_ffmpeg([
+            "ffmpeg", "-y",
+            "-f", "concat", "-safe", "0", "-i", str(concat_list),
+            "-ss", f"{offset}", "-t", f"{duration}", "-i", str(top),
+            "-map", "0:v", "-map", "1:a",
+            "-c:v", "copy",
+            *audio_args,
+            "-shortest",
+            "-movflags", "+faststart",
+            str(out_path),
+        ], cancel=cancel)
+
+
+def build_variants(
+    top: Path,
+    bottom: Path,
+    subtitle: Path,
+    outputs: list[tuple[OutputProfile, Path]],
+    *,
+    encoder: str | None = None,
+    preset: str | None = None,
+    crf: int | None = None,
+    loudness: dict | None = None,
+    start: float = 0.0,
+    duration: float | None = None,
+    progress: Callable[[str], None] | None = None,
+    cancel: CancelToken | None = None,
+) -> None:
+    """Render several output variants in a single ffmpeg process.
+
+    ``outputs`` pairs each :class:`~core.variants.OutputProfile` with its
+    output path. Both inputs are decoded once and fanned out with ``split``.
+    Every variant then gets its own scale, crop and subtitle burn-in, so
+    text is rendered sharply at each size. The audio is normalised once and
+    shared with ``asplit``. ``encoder``, ``preset`` and ``crf`` apply to
+    variants that do not set their own. Pre-cropped bottom assets are sized
+    for a single resolution and are not used here. The remaining arguments
+    match :func:`build_stack`.
+    """
+    if not outputs:
+        raise ValueError("No output variants given")
+    info = probe_media(top)
+    if duration is None:
+        duration = info.duration - start
+    window = ["-ss", f"{start}", "-t", f"{duration}"] if start or duration != info.duration else []
+    if encoder is None:
+        encoder = detect_encoder()
+    sub_filter = _subtitle_filter(subtitle)
+
+    count = len(outputs)
+    labels = range(count)
+    graph = [
+        "[0:v]split=" + str(count) + "".join(f"[t{i}]" for i in labels),
+        "[1:v]split=" + str(count) + "".join(f"[b{i}]" for i in labels),
+        f"[0:a]{loudnorm_filter(loudness)},asplit={count}" + "".join(f"[a{i}]" for i in labels),
+    ]
+    output_args = []
+    for i, (variant, path) in enumerate(outputs):
+        width, height = variant.resolution
+        half = height // 2
+        graph.append(
+            f"[t{i}]scale={width}:-2,crop={width}:{half},{sub_filter}[top{i}];"
+            f"[b{i}]scale={width}:-2,crop={width}:{half},trim=duration={duration},"
+            f"setpts=PTS-STARTPTS[bottom{i}];"
+            f"[top{i}][bottom{i}]vstack=inputs=2[v{i}]"
+        )
+        video_args = encoder_args(
+            variant.resolve_encoder(encoder),
+            preset=variant.preset or preset,
+            crf=variant.crf if variant.crf is not None else crf,
+            bitrate=variant.bitrate,
+        )
+        muxer_args = ["-movflags", "+faststart"] if variant.container in ("mp4", "mov") else []
+        path.parent.mkdir(parents=True, exist_ok=True)
+        output_args += [
+            "-map", f"[v{i}]", "-map", f"[a{i}]",
+            *video_args, *variant.audio_args(),
+            "-shortest", *muxer_args,
+            str(path),
+        ]
+
+    cmd = [
+        "ffmpeg", "-y", "-hwaccel", "auto",
+        *window, "-i", str(top),
+        "-stream_loop", "-1", "-i", str(bottom),
+        "-filter_complex", ";".join(graph),
+        *output_args,
+    ]
+    logging.info("Encoding %d variants in one pass", count)
+    tracker = ProgressTracker(duration, progress) if progress else None
+    with span("encode", media=duration, encoder=encoder, variants=count):
+        _run_ffmpeg(cmd, tracker.update if tracker else None, cancel)
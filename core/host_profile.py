@@ -0,0 +1,52 @@
+"""Per-host capability profile cached on disk.
+
+Probing what a machine can do (hardware encoders, inference settings) costs
+a few subprocess launches, so the results are stored once per host name in
+``CACHE_DIR/host_profile.json``. Hosts sharing a home directory each keep
+their own section.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socket
+import tempfile
+import threading
+
+from .cache import CACHE_DIR
+
+
+PROFILE_PATH = CACHE_DIR / "host_profile.json"
+
+_lock = threading.Lock()
+
+
+def _read_all() -> dict:
+    try:
+        return json.loads(PROFILE_PATH.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as exc:
+        logging.warning("Ignoring unreadable host profile %s: %s", PROFILE_PATH, exc)
+        return {}
+
+
+def load_host_profile() -> dict:
+    """Return the cached profile for this host (empty if none yet)."""
+    return _read_all().get(socket.gethostname(), {})
+
+
+def update_host_profile(**values) -> dict:
+    """Merge ``values`` into this host's profile and return the result."""
+    with _lock:
+        data = _read_all()
+        profile = data.setdefault(socket.gethostname(), {})
+        profile.update(values)
+        PROFILE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=PROFILE_PATH.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp, PROFILE_PATH)
+    return profile
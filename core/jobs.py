@@ -0,0 +1,221 @@
+"""In-process render job queue.
+
+:class:`JobManager` runs :func:`~core.shorts.generate_short` calls on a
+worker pool inside one long-lived process, so every job after the first
+reuses the loaded Whisper model. It backs the ``serve`` daemon and can be
+driven directly by other front ends. Every job carries a
+:class:`~core.cancel.CancelToken`, so running jobs can be stopped too.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+from .cancel import CancelToken, Cancelled
+
+
+def _jsonable(value):
+    """Return ``value`` with objects such as output profiles as dicts."""
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(item) for item in value]
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    return value
+
+
+class Job:
+    """A render request and its current state."""
+
+    def __init__(self, params: dict) -> None:
+        self.id = uuid.uuid4().hex[:12]
+        self.params = params
+        self.status = "queued"
+        self.message = ""
+        self.percent: float | None = None
+        self.eta: float | None = None
+        self.error = ""
+        self.output = ""
+        self.created = time.time()
+        self.started: float | None = None
+        self.finished: float | None = None
+        self.future: Future | None = None
+        self.token = CancelToken()
+
+    @property
+    def done(self) -> bool:
+        """Whether the job has finished, successfully or not."""
+        return self.status in ("done", "failed", "cancelled")
+
+    def reset(self) -> None:
+        """Return the job to ``"queued"`` with a fresh cancellation token."""
+        self.status = "queued"
+        self.message = ""
+        self.percent = None
+        self.eta = None
+        self.error = ""
+        self.output = ""
+        self.started = None
+        self.finished = None
+        self.token = CancelToken()
+
+    def to_dict(self) -> dict:
+        """Return a JSON-serialisable snapshot of the job."""
+        return {
+            "id": self.id,
+            "status": self.status,
+            "message": self.message,
+            "percent": self.percent,
+            "eta": self.eta,
+            "error": self.error,
+            "output": self.output,
+            "params": {key: _jsonable(value) for key, value in self.params.items()},
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+        }
+
+
+class JobManager:
+    """Run render jobs on a fixed-size thread pool.
+
+    ``runner`` is called as ``runner(progress=callback, cancel=token,
+    **job.params)`` and defaults to :func:`core.shorts.generate_short`.
+    ``timeouts`` (per-stage seconds, see :func:`~core.shorts.generate_short`)
+    is passed to jobs that do not set their own. ``on_update`` is invoked
+    with the job whenever its status or progress message changes.
+    """
+
+    def __init__(
+        self,
+        workers: int = 1,
+        *,
+        runner: Callable[..., object] | None = None,
+        on_update: Callable[[Job], None] | None = None,
+        timeouts: Dict[str, float] | None = None,
+    ) -> None:
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        if runner is None:
+            from .shorts import generate_short as runner
+        self._runner = runner
+        self._on_update = on_update
+        self._timeouts = timeouts
+        self._pool = ThreadPoolExecutor(workers, thread_name_prefix="render")
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, params: dict) -> Job:
+        """Queue a job for ``params`` and return it."""
+        job = Job(params)
+        with self._lock:
+            self._jobs[job.id] = job
+        job.future = self._pool.submit(self._run, job)
+        self._notify(job)
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        """Return the job with ``job_id`` or ``None``."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self) -> List[Job]:
+        """Return all known jobs, oldest first."""
+        with self._lock:
+            return sorted(self._jobs.values(), key=lambda j: j.created)
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job.
+
+        Queued jobs are dropped immediately. Running jobs have their token
+        cancelled, which kills ffmpeg or stops Whisper at the next segment;
+        they turn ``"cancelled"`` once the runner has unwound. Returns
+        ``False`` if the job already finished.
+        """
+        job = self.get(job_id)
+        if job is None or job.future is None:
+            return False
+        if job.future.cancel():
+            job.status = "cancelled"
+            job.finished = time.time()
+            self._notify(job)
+            return True
+        if job.status in ("queued", "running"):
+            job.token.cancel()
+            return True
+        return False
+
+    def retry(self, job_id: str) -> bool:
+        """Queue a failed or cancelled job again with the same parameters.
+
+        The job keeps its id; its progress, error and output are reset.
+        Returns ``False`` if the job is unknown, queued, running or done.
+        """
+        job = self.get(job_id)
+        if job is None or job.status not in ("failed", "cancelled"):
+            return False
+        job.reset()
+        job.future = self._pool.submit(self._run, job)
+        self._notify(job)
+        return True
+
+    def prune(self) -> int:
+        """Forget every finished job and return how many were removed."""
+        with self._lock:
+            finished = [job_id for job_id, job in self._jobs.items() if job.done]
+            for job_id in finished:
+                del self._jobs[job_id]
+        return len(finished)
+
+    def shutdown(self, wait: bool = True, *, cancel_running: bool = False) -> None:
+        """Cancel queued jobs, stop accepting new ones and optionally wait
+        for running ones to finish (or stop them with ``cancel_running``)."""
+        for job in self.list():
+            if job.status == "queued" or (cancel_running and job.status == "running"):
+                self.cancel(job.id)
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+    def _run(self, job: Job) -> None:
+        if job.token.cancelled:
+            job.status = "cancelled"
+            job.finished = time.time()
+            self._notify(job)
+            return
+        job.status = "running"
+        job.started = time.time()
+        self._notify(job)
+
+        def progress(msg: str) -> None:
+            job.message = str(msg)
+            # ProgressEvents carry percent/ETA; plain messages reset them
+            job.percent = getattr(msg, "percent", None)
+            job.eta = getattr(msg, "eta", None)
+            self._notify(job)
+
+        params = dict(job.params)
+        if self._timeouts and "timeouts" not in params:
+            params["timeouts"] = self._timeouts
+        try:
+            output = self._runner(progress=progress, cancel=job.token, **params)
+            job.output = [str(path) for path in output] if isinstance(output, list) else str(output)
+            job.status = "done"
+        except Cancelled:
+            logging.info("Job %s cancelled", job.id)
+            job.status = "cancelled"
+        except Exception as exc:
+            logging.error("Job %s failed: %s", job.id, exc)
+            job.status = "failed"
+            job.error = str(exc)
+        job.finished = time.time()
+        self._notify(job)
+
+    def _notify(self, job: Job) -> None:
+        if self._on_update:
+            try:
+                self._on_update(job)
+            except Exception:  # pragma: no cover - never let a listener kill a job
+                logging.exception("Job update listener failed")
@@ -0,0 +1,99 @@
+"""Loudness measurement for two-pass ``loudnorm``.
+
+Single-pass ``loudnorm`` adjusts gain dynamically frame by frame, which is
+slower and pumps audibly. Measuring the top clip first lets the encode apply
+one linear gain instead. Measurements are cached next to the transcripts.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import subprocess
+from pathlib import Path
+
+from .cache import TranscriptCache
+from .profiling import span
+
+
+# ffmpeg's loudnorm defaults, which single-pass renders have always used
+TARGET_I = -24.0
+TARGET_LRA = 7.0
+TARGET_TP = -2.0
+
+MEASURED_KEYS = ("input_i", "input_tp", "input_lra", "input_thresh", "target_offset")
+
+
+def _targets() -> str:
+    return f"I={TARGET_I}:LRA={TARGET_LRA}:TP={TARGET_TP}"
+
+
+def measure_loudness(path: Path) -> dict:
+    """Run loudnorm's analysis pass on the audio of ``path``.
+
+    Returns the measured integrated loudness, true peak, loudness range,
+    threshold and offset as floats keyed like ``loudnorm``'s JSON output.
+    """
+    cmd = [
+        "ffmpeg", "-hide_banner", "-nostats", "-i", str(path),
+        "-map", "0:a:0", "-af", f"loudnorm={_targets()}:print_format=json",
+        "-f", "null", "-",
+    ]
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    if result.returncode != 0:
+        logging.error("Loudness analysis failed: %s", result.stderr)
+        raise RuntimeError(f"Loudness analysis failed for {path}")
+    # The JSON summary is the last {...} block ffmpeg prints
+    start = result.stderr.rfind("{")
+    end = result.stderr.rfind("}")
+    if start == -1 or end < start:
+        raise RuntimeError(f"No loudnorm summary in ffmpeg output for {path}")
+    data = json.loads(result.stderr[start:end + 1])
+    return {key: float(data[key]) for key in MEASURED_KEYS}
+
+
+def analyze_loudness(
+    path: Path,
+    *,
+    audio_hash: str | None = None,
+    cache: TranscriptCache | None = None,
+) -> dict | None:
+    """Return loudness measurements for ``path``, using the cache if possible.
+
+    ``audio_hash`` enables caching (see :func:`core.cache.audio_fingerprint`).
+    Returns ``None`` if the analysis fails, in which case the encode falls
+    back to single-pass normalisation.
+    """
+    key = None
+    if audio_hash is not None:
+        cache = cache or TranscriptCache()
+        key = cache.make_key(
+            audio_hash, kind="loudness", I=TARGET_I, LRA=TARGET_LRA, TP=TARGET_TP
+        )
+        data = cache.load(key)
+        if data is not None:
+            return data
+    try:
+        with span("loudness", file=path.name):
+            data = measure_loudness(path)
+    except (RuntimeError, ValueError, KeyError) as exc:
+        logging.warning("Falling back to single-pass loudnorm: %s", exc)
+        return None
+    if key is not None:
+        cache.store(key, data)
+    return data
+
+
+def loudnorm_filter(measured: dict | None) -> str:
+    """Return the ``-af`` loudnorm filter, linear if ``measured`` is given."""
+    if not measured:
+        return f"loudnorm={_targets()}"
+    return (
+        f"loudnorm={_targets()}"
+        f":measured_I={measured['input_i']}"
+        f":measured_TP={measured['input_tp']}"
+        f":measured_LRA={measured['input_lra']}"
+        f":measured_thresh={measured['input_thresh']}"
+        f":offset={measured['target_offset']}"
+        ":linear=true"
+    )
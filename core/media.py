@@ -0,0 +1,131 @@
+"""Media metadata from a single cached ffprobe call.
+
+:func:`probe_media` reads the container and every stream in one ffprobe
+invocation and caches the result by path, size and modification time, so
+repeated validation and rendering of the same clip never re-probe it.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import subprocess
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from .profiling import span
+
+
+# Number of probe results kept in memory
+CACHE_SIZE = 256
+
+_cache: "OrderedDict[tuple, MediaInfo]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _parse_rate(rate: str | None) -> float:
+    """Return frames per second from an ffprobe ``"num/den"`` string."""
+    if not rate:
+        return 0.0
+    num, _, den = rate.partition("/")
+    try:
+        return float(num) / float(den or 1)
+    except (ValueError, ZeroDivisionError):
+        return 0.0
+
+
+def _rotation(stream: dict) -> int:
+    """Return the clockwise display rotation of a video ``stream``."""
+    for side_data in stream.get("side_data_list", ()):
+        if "rotation" in side_data:
+            return int(-float(side_data["rotation"])) % 360
+    rotate = stream.get("tags", {}).get("rotate")
+    return int(rotate) % 360 if rotate else 0
+
+
+class MediaInfo:
+    """Container and stream details of a media file."""
+
+    def __init__(self, path: Path, data: dict) -> None:
+        self.path = path
+        self.streams = data.get("streams", [])
+        fmt = data.get("format", {})
+        self.format_name = fmt.get("format_name", "")
+        self.duration = float(fmt.get("duration") or 0.0)
+
+        video = next((s for s in self.streams if s.get("codec_type") == "video"), None)
+        audio = next((s for s in self.streams if s.get("codec_type") == "audio"), None)
+        self.has_video = video is not None
+        self.has_audio = audio is not None
+        self.video_codec = video.get("codec_name", "") if video else ""
+        self.audio_codec = audio.get("codec_name", "") if audio else ""
+        self.width = int(video.get("width", 0)) if video else 0
+        self.height = int(video.get("height", 0)) if video else 0
+        self.fps = (
+            _parse_rate(video.get("avg_frame_rate")) or _parse_rate(video.get("r_frame_rate"))
+            if video
+            else 0.0
+        )
+        self.rotation = _rotation(video) if video else 0
+        if not self.duration and video and video.get("duration"):
+            self.duration = float(video["duration"])
+
+    @property
+    def display_size(self) -> tuple[int, int]:
+        """Return ``(width, height)`` as shown, after applying rotation."""
+        if self.rotation in (90, 270):
+            return self.height, self.width
+        return self.width, self.height
+
+    def __repr__(self) -> str:
+        return (
+            f"MediaInfo({self.path.name!r}, {self.duration:.2f}s, "
+            f"video={self.video_codec or None} {self.width}x{self.height}@{self.fps:.2f}, "
+            f"audio={self.audio_codec or None})"
+        )
+
+
+def probe_media(path: Path | str) -> MediaInfo:
+    """Return :class:`MediaInfo` for ``path`` using one ffprobe call.
+
+    Results are cached by ``(path, size, mtime)``. Raises ``RuntimeError`` if
+    ffprobe is missing or cannot read the file.
+    """
+    path = Path(path)
+    st = path.stat()
+    key = (str(path.resolve()), st.st_size, st.st_mtime_ns)
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    try:
+        with span("probe", file=path.name):
+            result = subprocess.run(
+                [
+                    "ffprobe",
+                    "-v",
+                    "error",
+                    "-show_format",
+                    "-show_streams",
+                    "-of",
+                    "json",
+                    str(path),
+                ],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+            )
+    except OSError as exc:
+        raise RuntimeError(f"ffprobe could not be run: {exc}") from exc
+    if result.returncode != 0:
+        logging.error("ffprobe failed: %s", result.stderr)
+        raise RuntimeError(f"ffprobe failed: {result.stderr}")
+    info = MediaInfo(path, json.loads(result.stdout))
+
+    with _cache_lock:
+        _cache[key] = info
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return info
@@ -0,0 +1,198 @@
+"""Pool of loaded Whisper models with a memory budget.
+
+A long-lived process (the ``serve`` daemon, batch runs) may be asked for
+several model sizes over its lifetime. The pool keeps the models that were
+used recently resident and unloads the least recently used ones once their
+estimated memory exceeds the budget. Models are checked out for the length
+of a transcription, so a model in use by another thread is never unloaded.
+"""
+
+from __future__ import annotations
+
+import gc
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Iterator, Tuple
+
+Key = Tuple[str, str, str]
+
+# Approximate parameter counts in millions, used to estimate memory use
+MODEL_PARAMS = {
+    "tiny": 39,
+    "base": 74,
+    "small": 244,
+    "medium": 769,
+    "large": 1550,
+    "turbo": 809,
+    "distil-small": 166,
+    "distil-medium": 394,
+    "distil-large": 756,
+}
+
+# Bytes per weight for CTranslate2 compute types
+BYTES_PER_WEIGHT = {
+    "int8": 1,
+    "int8_float16": 1,
+    "int8_bfloat16": 1,
+    "int8_float32": 1,
+    "int16": 2,
+    "float16": 2,
+    "bfloat16": 2,
+    "float32": 4,
+}
+
+# Runtime buffers on top of the weights
+OVERHEAD_MB = 150
+
+
+def estimate_mb(model_size: str, device: str, compute_type: str) -> float:
+    """Return a rough resident size in MB of a loaded model.
+
+    ``default`` keeps the float16 weights faster-whisper ships on GPUs and
+    converts them to float32 on CPU. Unknown model names are assumed to be
+    as large as ``large``.
+    """
+    name = model_size.rsplit("/", 1)[-1].lower()
+    for prefix in ("faster-whisper-", "whisper-"):
+        name = name.removeprefix(prefix)
+    if "turbo" in name:
+        params = MODEL_PARAMS["turbo"]
+    else:
+        params = next(
+            (count for prefix, count in MODEL_PARAMS.items() if name.startswith(prefix)),
+            MODEL_PARAMS["large"],
+        )
+    if compute_type in BYTES_PER_WEIGHT:
+        width = BYTES_PER_WEIGHT[compute_type]
+    else:
+        width = 4 if device == "cpu" else 2
+    return params * width + OVERHEAD_MB
+
+
+class _Entry:
+    def __init__(self, model, size_mb: float) -> None:
+        self.model = model
+        self.size_mb = size_mb
+        self.refs = 0
+
+
+class ModelPool:
+    """Thread-safe LRU cache of models keyed by ``(size, device, compute_type)``.
+
+    ``loader(model_size, device, compute_type)`` creates a model and returns
+    ``(model, device)``, the device it actually ended up on. ``budget_mb``
+    caps the summed estimates (see :func:`estimate_mb`) of the models kept
+    loaded; ``None`` keeps every model. A single model larger than the budget
+    is still loaded, and models that are checked out are never evicted, so
+    the budget can be exceeded while they are in use.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[str, str, str], tuple],
+        budget_mb: float | None = None,
+    ) -> None:
+        self.loader = loader
+        self.budget_mb = budget_mb
+        self._entries: "OrderedDict[Key, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading: dict[Key, threading.Lock] = {}
+
+    @contextmanager
+    def checkout(
+        self, model_size: str, device: str = "auto", compute_type: str = "default"
+    ) -> Iterator[object]:
+        """Yield the model for the key, loading it if needed.
+
+        The model stays pinned until the ``with`` block exits.
+        """
+        key = (model_size, device, compute_type)
+        entry = self._acquire(key)
+        try:
+            yield entry.model
+        finally:
+            with self._lock:
+                entry.refs -= 1
+                self._evict()
+
+    def preload(
+        self, model_size: str, device: str = "auto", compute_type: str = "default"
+    ) -> None:
+        """Load a model now so the first transcription does not wait for it."""
+        with self.checkout(model_size, device, compute_type):
+            pass
+
+    def _acquire(self, key: Key) -> _Entry:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.refs += 1
+                self._entries.move_to_end(key)
+                return entry
+            loading = self._loading.setdefault(key, threading.Lock())
+        # Load outside the pool lock so other models stay available; the
+        # per-key lock makes concurrent requests for one model load it once
+        with loading:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.refs += 1
+                    self._entries.move_to_end(key)
+                    return entry
+            model_size, device, compute_type = key
+            with self._lock:
+                # Make room first so old and new models are not resident at once
+                self._evict(reserve=estimate_mb(model_size, device, compute_type))
+            model, actual_device = self.loader(model_size, device, compute_type)
+            entry = _Entry(model, estimate_mb(model_size, actual_device, compute_type))
+            with self._lock:
+                entry.refs += 1
+                self._entries[key] = entry
+                self._loading.pop(key, None)
+                self._evict()
+        return entry
+
+    def _evict(self, reserve: float = 0.0) -> None:
+        """Unload idle models, oldest first, until ``reserve`` MB more fit."""
+        if self.budget_mb is None:
+            return
+        evicted = False
+        for key in list(self._entries):
+            if self.resident_mb() + reserve <= self.budget_mb:
+                break
+            entry = self._entries[key]
+            if entry.refs:
+                continue
+            logging.info("Unloading Whisper model %s (%s, %s)", *key)
+            del self._entries[key]
+            evicted = True
+        if evicted:
+            # CTranslate2 frees its buffers when the last reference goes away
+            gc.collect()
+
+    def resident_mb(self) -> float:
+        """Estimated memory of the loaded models in MB."""
+        return sum(entry.size_mb for entry in self._entries.values())
+
+    def stats(self) -> list[dict]:
+        """Return the loaded models, least recently used first."""
+        with self._lock:
+            return [
+                {
+                    "model": key[0],
+                    "device": key[1],
+                    "compute_type": key[2],
+                    "size_mb": round(entry.size_mb),
+                    "in_use": entry.refs,
+                }
+                for key, entry in self._entries.items()
+            ]
+
+    def clear(self) -> None:
+        """Drop every model that is not in use."""
+        with self._lock:
+            for key in [key for key, entry in self._entries.items() if not entry.refs]:
+                del self._entries[key]
+        gc.collect()
@@ -0,0 +1,169 @@
+"""Chunked, multi-process transcription for CPU-only hosts.
+
+A single ``WhisperModel`` on CPU leaves most cores idle on long clips. This
+module splits the audio at silences found by faster-whisper's VAD,
+transcribes the chunks in a process pool where each worker owns a small
+model instance, and stitches the word timestamps back onto one timeline.
+"""
+
+from __future__ import annotations
+
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Tuple
+
+from .audio import SAMPLE_RATE
+from .cancel import CancelToken
+from .progress import ProgressEvent
+
+# Target chunk length; chunks only end at silences so they may run longer
+CHUNK_SECONDS = 60.0
+
+# Threads per worker model; workers = cores // threads
+CPU_THREADS = 2
+
+Word = Tuple[float, float, str]
+
+_worker_model = None
+
+
+def plan_chunks(
+    speech: List[dict], total: int, max_len: int
+) -> List[Tuple[int, int]]:
+    """Return ``(start, end)`` sample ranges covering ``[0, total)``.
+
+    ``speech`` holds VAD regions (``{"start": s, "end": e}`` in samples).
+    Cuts are placed in the middle of the silence between two regions, at the
+    last such gap before a chunk would exceed ``max_len`` samples.
+    """
+    bounds = []
+    chunk_start = 0
+    last_cut = None
+    for prev, nxt in zip(speech, speech[1:]):
+        cut = (prev["end"] + nxt["start"]) // 2
+        if cut - chunk_start > max_len and last_cut is not None:
+            bounds.append((chunk_start, last_cut))
+            chunk_start = last_cut
+        last_cut = cut
+    if last_cut is not None and total - chunk_start > max_len and last_cut > chunk_start:
+        bounds.append((chunk_start, last_cut))
+        chunk_start = last_cut
+    bounds.append((chunk_start, total))
+    return bounds
+
+
+def stitch_words(chunks: Iterable[List[Word]], tolerance: float = 0.05) -> Iterator[Word]:
+    """Merge per-chunk words, dropping duplicates at chunk edges.
+
+    A word is a duplicate if it ends before the previous word does, or if it
+    repeats the previous word's text while starting inside it.
+    """
+    last_end = float("-inf")
+    last_text = None
+    for words in chunks:
+        for start, end, text in words:
+            norm = text.strip().lower()
+            if end <= last_end:
+                continue
+            if norm == last_text and start < last_end - tolerance:
+                continue
+            last_end = end
+            last_text = norm
+            yield start, end, text
+
+
+def _init_worker(model_size: str, cpu_threads: int, compute_type: str) -> None:
+    global _worker_model
+    from faster_whisper import WhisperModel
+
+    _worker_model = WhisperModel(
+        model_size,
+        device="cpu",
+        compute_type=compute_type,
+        cpu_threads=cpu_threads,
+        num_workers=1,
+    )
+
+
+def _transcribe_chunk(audio, offset: float, beam_size: int) -> List[Word]:
+    segments, _ = _worker_model.transcribe(
+        audio, beam_size=beam_size, word_timestamps=True, vad_filter=True
+    )
+    words = []
+    for segment in segments:
+        for word in segment.words or ():
+            words.append((word.start + offset, word.end + offset, word.word))
+    return words
+
+
+def iter_words_parallel(
+    path: Path,
+    model_size: str = "base",
+    *,
+    beam_size: int = 5,
+    workers: int | None = None,
+    cpu_threads: int = CPU_THREADS,
+    compute_type: str = "int8",
+    chunk_seconds: float = CHUNK_SECONDS,
+    progress: Callable[[str], None] | None = None,
+    audio=None,
+    cancel: CancelToken | None = None,
+) -> Iterator[Word]:
+    """Yield ``(start, end, word)`` for ``path`` using a process pool.
+
+    ``workers`` defaults to the cores this process may use divided by
+    ``cpu_threads``. Words are yielded in timeline order as soon as every
+    earlier chunk is done, so downstream consumers can keep streaming. Pass
+    already decoded 16 kHz mono ``audio`` to skip decoding ``path`` again.
+    Cancelling ``cancel`` drops the chunks that have not started yet.
+    ``compute_type`` is the CTranslate2 weight type of the worker models.
+    """
+    from faster_whisper.audio import decode_audio
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+    from .whisper_wrapper import _cpu_count
+
+    if workers is None:
+        # Same host-aware count the single-model path sizes its threads with
+        workers = max(1, _cpu_count() // cpu_threads)
+
+    if audio is None:
+        audio = decode_audio(str(path), sampling_rate=SAMPLE_RATE)
+    speech = get_speech_timestamps(audio, VadOptions(min_silence_duration_ms=300))
+    bounds = plan_chunks(speech, len(audio), int(chunk_seconds * SAMPLE_RATE))
+    logging.info(
+        "Transcribing %s in %d chunks with %d workers", path, len(bounds), workers
+    )
+
+    total = len(audio) / SAMPLE_RATE
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(bounds)),
+        initializer=_init_worker,
+        initargs=(model_size, cpu_threads, compute_type),
+    ) as pool:
+        results = pool.map(
+            _transcribe_chunk,
+            [audio[start:end] for start, end in bounds],
+            [start / SAMPLE_RATE for start, _ in bounds],
+            [beam_size] * len(bounds),
+        )
+
+        detach = cancel.add_callback(
+            lambda: pool.shutdown(wait=False, cancel_futures=True)
+        ) if cancel is not None else None
+
+        def tracked():
+            for (_, end), words in zip(bounds, results):
+                if cancel is not None:
+                    cancel.raise_if_cancelled()
+                if progress and total > 0:
+                    pct = int(end / SAMPLE_RATE / total * 100)
+                    progress(ProgressEvent(f"Transcribing... {pct}%", stage="transcribing", percent=pct))
+                yield words
+
+        try:
+            yield from stitch_words(tracked())
+        finally:
+            if detach is not None:
+                detach()
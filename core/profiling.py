@@ -0,0 +1,204 @@
+"""Per-stage timing and resource spans for profiling renders.
+
+Pipeline stages wrap their work in :func:`span`. Nothing is recorded unless a
+:class:`Profiler` is active (see :func:`profile`), so the spans cost one
+global lookup in normal runs. Each recorded span holds its wall time, CPU
+time of this process and of finished subprocesses (ffmpeg), the peak RSS
+reached so far and, for spans covering media, the realtime factor. A
+profile can be written as JSON lines or as a Chrome trace that opens in
+``chrome://tracing`` or Perfetto.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+
+_active: "Profiler | None" = None
+
+
+def _usage() -> tuple[float, float, float | None, float | None]:
+    """Return ``(cpu, child_cpu, peak_rss_mb, child_peak_rss_mb)`` so far."""
+    if resource is None:  # pragma: no cover - Windows
+        return time.process_time(), 0.0, None, None
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    unit = 1 << 20 if sys.platform == "darwin" else 1 << 10
+    return (
+        own.ru_utime + own.ru_stime,
+        children.ru_utime + children.ru_stime,
+        own.ru_maxrss / unit,
+        children.ru_maxrss / unit,
+    )
+
+
+class Span:
+    """One timed stage; ``media`` and ``args`` may be set while it runs."""
+
+    def __init__(self, name: str, media: float | None, args: dict) -> None:
+        self.name = name
+        self.media = media
+        self.args = args
+        self.thread = threading.current_thread().name
+        self.tid = threading.get_ident()
+        self.start = 0.0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.child_cpu = 0.0
+        self.peak_rss_mb: float | None = None
+        self.child_peak_rss_mb: float | None = None
+
+    @property
+    def realtime_factor(self) -> float | None:
+        """Seconds of media processed per second of wall time."""
+        if not self.media or self.wall <= 0:
+            return None
+        return self.media / self.wall
+
+    def to_dict(self) -> dict:
+        """Return the span as a JSON-serialisable dict."""
+        return {
+            "name": self.name,
+            "thread": self.thread,
+            "start": round(self.start, 6),
+            "wall": round(self.wall, 6),
+            "cpu": round(self.cpu, 6),
+            "child_cpu": round(self.child_cpu, 6),
+            "peak_rss_mb": self.peak_rss_mb,
+            "child_peak_rss_mb": self.child_peak_rss_mb,
+            "media": self.media,
+            "realtime_factor": self.realtime_factor,
+            **self.args,
+        }
+
+
+class Profiler:
+    """Collects finished spans from every thread.
+
+    CPU times are process-wide, so spans running concurrently (transcription
+    next to the loudness pass, parallel encodes) each include the other's
+    CPU. Peak RSS values are high-water marks of the process and of its
+    largest finished subprocess at the end of the span.
+    """
+
+    def __init__(self) -> None:
+        self.spans: List[Span] = []
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, media: float | None = None, **args) -> Iterator[Span]:
+        """Time the ``with`` block as a span called ``name``."""
+        record = Span(name, media, args)
+        cpu, child_cpu, _, _ = _usage()
+        started = time.perf_counter()
+        try:
+            yield record
+        except BaseException as exc:
+            record.args["error"] = type(exc).__name__
+            raise
+        finally:
+            record.wall = time.perf_counter() - started
+            record.start = started - self._origin
+            end_cpu, end_child_cpu, rss, child_rss = _usage()
+            record.cpu = end_cpu - cpu
+            record.child_cpu = end_child_cpu - child_cpu
+            record.peak_rss_mb = rss
+            record.child_peak_rss_mb = child_rss
+            with self._lock:
+                self.spans.append(record)
+
+    def summary(self) -> dict:
+        """Return total wall/CPU seconds and span count per stage name."""
+        totals: dict = {}
+        for record in self.spans:
+            entry = totals.setdefault(record.name, {"count": 0, "wall": 0.0, "cpu": 0.0})
+            entry["count"] += 1
+            entry["wall"] += record.wall
+            entry["cpu"] += record.cpu + record.child_cpu
+        return totals
+
+    def chrome_trace(self) -> dict:
+        """Return the spans in Chrome's trace event format."""
+        pid = os.getpid()
+        events = [
+            {
+                "name": record.name,
+                "ph": "X",
+                "ts": round(record.start * 1e6),
+                "dur": round(record.wall * 1e6),
+                "pid": pid,
+                "tid": record.tid,
+                "args": record.to_dict(),
+            }
+            for record in self.spans
+        ]
+        threads = {record.tid: record.thread for record in self.spans}
+        events.extend(
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+            for tid, name in threads.items()
+        )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, path: Path | str) -> Path:
+        """Write the spans to ``path``.
+
+        A ``.json`` path gets a Chrome trace; anything else gets one JSON
+        object per span per line.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            spans = sorted(self.spans, key=lambda record: record.start)
+        with path.open("w", encoding="utf-8") as f:
+            if path.suffix.lower() == ".json":
+                json.dump(self.chrome_trace(), f)
+            else:
+                for record in spans:
+                    f.write(json.dumps(record.to_dict()) + "\n")
+        return path
+
+    def log_summary(self) -> None:
+        """Log one line per stage with its total wall and CPU time."""
+        for name, entry in sorted(self.summary().items(), key=lambda item: -item[1]["wall"]):
+            logging.info(
+                "%-15s %3d x  wall %8.2fs  cpu %8.2fs",
+                name, entry["count"], entry["wall"], entry["cpu"],
+            )
+
+
+@contextmanager
+def span(name: str, media: float | None = None, **args) -> Iterator[Span | None]:
+    """Record a span on the active profiler; yields ``None`` when profiling is off."""
+    profiler = _active
+    if profiler is None:
+        yield None
+        return
+    with profiler.span(name, media, **args) as record:
+        yield record
+
+
+@contextmanager
+def profile(profiler: Profiler | None = None) -> Iterator[Profiler]:
+    """Make ``profiler`` (a new one by default) active for the ``with`` block."""
+    global _active
+    profiler = profiler or Profiler()
+    previous, _active = _active, profiler
+    try:
+        yield profiler
+    finally:
+        _active = previous
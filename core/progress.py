@@ -0,0 +1,182 @@
+"""Structured progress reporting.
+
+Progress callbacks across the pipeline take a single string. Long stages
+report a :class:`ProgressEvent` instead: a ``str`` subclass carrying the
+stage, percent complete and ETA, so existing callbacks that print or display
+the message keep working while front ends can read the fields.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable
+
+
+class ProgressEvent(str):
+    """A progress message with structured fields attached."""
+
+    def __new__(
+        cls,
+        message: str,
+        *,
+        stage: str,
+        percent: float | None = None,
+        eta: float | None = None,
+        fps: float | None = None,
+        speed: float | None = None,
+    ) -> "ProgressEvent":
+        event = super().__new__(cls, message)
+        event.stage = stage
+        event.percent = percent
+        event.eta = eta
+        event.fps = fps
+        event.speed = speed
+        return event
+
+    def to_dict(self) -> dict:
+        """Return the event as a JSON-serialisable dict."""
+        return {
+            "message": str(self),
+            "stage": self.stage,
+            "percent": self.percent,
+            "eta": self.eta,
+            "fps": self.fps,
+            "speed": self.speed,
+        }
+
+
+def format_eta(seconds: float) -> str:
+    """Format ``seconds`` as ``M:SS`` or ``H:MM:SS``."""
+    seconds = max(0, int(round(seconds)))
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{minutes}:{secs:02d}"
+
+
+def _number(value: str | None) -> float | None:
+    if not value:
+        return None
+    value = value.strip().rstrip("x")
+    try:
+        return float(value)
+    except ValueError:  # "N/A" before the first frame
+        return None
+
+
+def parse_progress(fields: dict) -> tuple[float | None, float | None, float | None]:
+    """Return ``(out_time, fps, speed)`` from one ``-progress`` block.
+
+    ``out_time`` is in seconds; values ffmpeg reports as ``N/A`` are ``None``.
+    """
+    out_time = None
+    # out_time_ms is in microseconds too, despite its name
+    for key in ("out_time_us", "out_time_ms"):
+        micros = _number(fields.get(key))
+        if micros is not None:
+            out_time = max(0.0, micros / 1_000_000)
+            break
+    return out_time, _number(fields.get("fps")), _number(fields.get("speed"))
+
+
+class ProgressTracker:
+    """Turn ffmpeg ``-progress`` blocks into :class:`ProgressEvent` calls.
+
+    ``total`` is the output duration in seconds. With ``parts`` > 1, blocks
+    from that many concurrent ffmpeg processes (each covering a share of
+    ``total``) are summed into one overall percentage.
+    """
+
+    def __init__(
+        self,
+        total: float,
+        progress: Callable[[str], None],
+        *,
+        stage: str = "Encoding",
+        parts: int = 1,
+    ) -> None:
+        self.total = total
+        self.progress = progress
+        self.stage = stage
+        self._done = [0.0] * parts
+        self._started = time.monotonic()
+        self._lock = threading.Lock()
+
+    def update(self, fields: dict, part: int = 0) -> None:
+        """Record one ``-progress`` block from process ``part`` and report."""
+        out_time, fps, speed = parse_progress(fields)
+        with self._lock:
+            if out_time is not None:
+                self._done[part] = out_time
+            done = min(sum(self._done), self.total)
+            single = len(self._done) == 1
+        if self.total <= 0:
+            return
+        percent = done / self.total * 100
+        remaining = self.total - done
+        if fields.get("progress") == "end" and single:
+            percent, remaining = 100.0, 0.0
+        eta = None
+        if single and speed:
+            eta = remaining / speed
+        elif done > 0:
+            eta = (time.monotonic() - self._started) * remaining / done
+        message = f"{self.stage}... {int(percent)}%"
+        if eta is not None:
+            message += f" (ETA {format_eta(eta)})"
+        self.progress(
+            ProgressEvent(
+                message,
+                stage=self.stage.lower(),
+                percent=percent,
+                eta=eta,
+                fps=fps,
+                speed=speed if single else None,
+            )
+        )
+
+
+class ProgressThrottle:
+    """Coalesce progress messages from any thread into at most ``rate`` per second.
+
+    Producers call :meth:`push` with a message and an optional ``key`` (e.g.
+    a job id); only the latest message per key is kept. :meth:`push` returns
+    ``True`` when nothing was pending before, i.e. when the consumer has to
+    schedule a flush: wait :meth:`delay` seconds, then :meth:`take` the
+    pending messages. A burst of messages thus costs one wake-up.
+    """
+
+    def __init__(self, rate: float = 20.0, *, clock: Callable[[], float] = time.monotonic) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.interval = 1.0 / rate
+        self._clock = clock
+        self._pending: dict = {}
+        self._last = float("-inf")
+        self._lock = threading.Lock()
+
+    def push(self, message, key=None) -> bool:
+        """Record ``message`` for ``key``; return whether a flush is needed."""
+        with self._lock:
+            wake = not self._pending
+            self._pending[key] = message
+        return wake
+
+    def delay(self) -> float:
+        """Seconds to wait before the next :meth:`take` keeps to the rate."""
+        return max(0.0, self._last + self.interval - self._clock())
+
+    def take(self) -> dict:
+        """Return and clear the latest message per key."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if pending:
+            self._last = self._clock()
+        return pending
+
+    def clear(self) -> None:
+        """Drop pending messages, e.g. once the work they describe ended."""
+        with self._lock:
+            self._pending = {}
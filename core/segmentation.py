@@ -0,0 +1,191 @@
+"""Group Whisper's word timestamps into subtitle cues.
+
+A :class:`Segmenter` walks the word stream once and closes the current cue
+before a word that would break one of its rules: too many characters for
+one line of the frame, too long on screen, too many words, or a pause in
+the speech. It also closes cues after punctuation. Each word is looked at
+once with constant work, so cues stream out while Whisper is still
+transcribing.
+
+The rules can be set through style options (see :meth:`Segmenter.from_style`),
+so they travel with the rest of the subtitle style through the CLI, batch
+manifests, the daemon and the GUI.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from .splitter import SENTENCE_END
+from .subtitle_utils import DEFAULT_STYLE
+
+Word = Tuple[float, float, str]
+Cue = Tuple[float, float, str]
+KaraokeCue = Tuple[float, float, Tuple[Word, ...]]
+
+# Punctuation that ends a clause; a cue may end here once it holds two words
+CLAUSE_END = (",", ";", ":", "—")
+
+# Defaults for rules that are not set when segmentation is configured
+MAX_CUE_SECONDS = 3.0
+MIN_PAUSE_SECONDS = 0.6
+
+# Style options read by Segmenter.from_style and their constructor arguments
+STYLE_KEYS = {
+    "CueMaxChars": "max_chars",
+    "CueMaxDuration": "max_duration",
+    "CueMinPause": "min_pause",
+    "CueMaxWords": "max_words",
+    "CuePunctuation": "punctuation",
+}
+
+# libass renders scripts without PlayResY as if they were 288 units high
+PLAY_RES_Y = 288
+# Horizontal margin on each side, in script units (MarginL/MarginR in save_ass)
+MARGIN = 10
+# Average glyph width as a share of the font size, for typical sans fonts
+CHAR_WIDTH = 0.55
+
+
+def max_chars_for(font_size: float, frame: tuple[int, int]) -> int:
+    """Estimate how many characters of ``font_size`` fit across ``frame``.
+
+    ``frame`` is the ``(width, height)`` the subtitles are burned into.
+    Font sizes are in script units, which libass scales with the frame
+    height; the estimate assumes an average glyph width and the default
+    margins, so it errs on the short side for narrow fonts.
+    """
+    width, height = frame
+    scale = height / PLAY_RES_Y
+    usable = width - 2 * MARGIN * scale
+    return max(1, int(usable / (font_size * CHAR_WIDTH * scale)))
+
+
+def _text(word: Word) -> str:
+    return word[2].strip()
+
+
+class Segmenter:
+    """Rules for cutting a stream of words into cues.
+
+    ``max_chars`` caps the characters of a cue, counting single spaces
+    between words. ``max_duration`` caps the seconds from the first word's
+    start to the last word's end. ``max_words`` caps the words per cue.
+    A gap of more than ``min_pause`` seconds before a word starts a new
+    cue. With ``punctuation``, a cue ends after a sentence end, and after a
+    clause end once it holds two words. Rules set to ``None`` are not
+    applied. A single word that breaks a limit on its own still becomes a
+    cue.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_chars: int | None = None,
+        max_duration: float | None = None,
+        min_pause: float | None = None,
+        max_words: int | None = None,
+        punctuation: bool = False,
+    ) -> None:
+        for name, value in (
+            ("max_chars", max_chars),
+            ("max_duration", max_duration),
+            ("max_words", max_words),
+        ):
+            if value is not None and value <= 0:
+                raise ValueError(f"{name} must be positive")
+        if min_pause is not None and min_pause < 0:
+            raise ValueError("min_pause cannot be negative")
+        self.max_chars = max_chars
+        self.max_duration = max_duration
+        self.min_pause = min_pause
+        self.max_words = max_words
+        self.punctuation = punctuation
+
+    @classmethod
+    def from_style(
+        cls, style: Dict[str, str | int] | None, frame: tuple[int, int]
+    ) -> "Segmenter | None":
+        """Return the segmenter configured by ``style``, or ``None``.
+
+        ``None`` means no ``Cue*`` option is set and the caller keeps its
+        default grouping. Once one is set, the others default to
+        ``CueMaxChars="auto"``, a 3 s ``CueMaxDuration``, a 0.6 s
+        ``CueMinPause`` and ``CuePunctuation=True``. ``"auto"`` characters
+        are estimated with :func:`max_chars_for` from the style's
+        ``FontSize`` and ``frame``; ``0`` or ``None`` turns a rule off.
+        """
+        style = style or {}
+        if not any(key in style for key in STYLE_KEYS):
+            return None
+        options = {
+            "max_chars": "auto",
+            "max_duration": MAX_CUE_SECONDS,
+            "min_pause": MIN_PAUSE_SECONDS,
+            "max_words": None,
+            "punctuation": True,
+        }
+        for key, name in STYLE_KEYS.items():
+            if key in style:
+                options[name] = style[key]
+        if options["max_chars"] == "auto":
+            font_size = float(style.get("FontSize", DEFAULT_STYLE["FontSize"]))
+            options["max_chars"] = max_chars_for(font_size, frame)
+        try:
+            for name, convert in (
+                ("max_chars", int),
+                ("max_duration", float),
+                ("min_pause", float),
+                ("max_words", int),
+            ):
+                # 0 (or an empty value) switches a limit off
+                options[name] = convert(options[name]) if options[name] else None
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid cue segmentation option in {style!r}") from None
+        punctuation = options["punctuation"]
+        if isinstance(punctuation, str):
+            punctuation = punctuation.strip().lower() not in ("0", "false", "no", "off")
+        options["punctuation"] = bool(punctuation)
+        return cls(**options)
+
+    def split(self, words: Iterable[Word]) -> Iterator[List[Word]]:
+        """Yield the words of each cue, in order."""
+        current: List[Word] = []
+        chars = 0
+        for word in words:
+            length = len(_text(word))
+            if current and self._breaks_before(current, chars, word, length):
+                yield current
+                current, chars = [], 0
+            chars += length + (1 if current else 0)
+            current.append(word)
+        if current:
+            yield current
+
+    def _breaks_before(self, current: List[Word], chars: int, word: Word, length: int) -> bool:
+        if self.max_words is not None and len(current) >= self.max_words:
+            return True
+        if self.max_chars is not None and chars + 1 + length > self.max_chars:
+            return True
+        if self.max_duration is not None and word[1] - current[0][0] > self.max_duration:
+            return True
+        if self.min_pause is not None and word[0] - current[-1][1] > self.min_pause:
+            return True
+        if self.punctuation:
+            last = _text(current[-1])
+            if last.endswith(SENTENCE_END):
+                return True
+            if last.endswith(CLAUSE_END) and len(current) >= 2:
+                return True
+        return False
+
+    def cues(self, words: Iterable[Word]) -> Iterator[Cue]:
+        """Yield ``(start, end, text)`` cues."""
+        for group in self.split(words):
+            text = " ".join(w[2] for w in group).strip()
+            yield group[0][0], group[-1][1], text
+
+    def phrases(self, words: Iterable[Word]) -> Iterator[KaraokeCue]:
+        """Yield karaoke cues that keep the timing of every word."""
+        for group in self.split(words):
+            yield group[0][0], group[-1][1], tuple(tuple(w) for w in group)
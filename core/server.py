@@ -0,0 +1,196 @@
+"""Local render daemon with a small JSON-over-HTTP job API.
+
+``shortssplit serve`` keeps Whisper models warm in one process and accepts
+jobs from orchestrators on localhost:
+
+``POST /jobs``            submit a job, returns it (201)
+``GET /jobs``             list all jobs
+``GET /jobs/<id>``        job status
+``DELETE /jobs/<id>``     cancel a queued or running job
+``GET /models``           Whisper models currently loaded
+
+Job bodies use the CLI's vocabulary: ``top``, ``bottom`` (required),
+``output``, ``model``, ``device``, ``compute_type``, ``style``, ``karaoke``,
+``resolution``, ``encoder``, ``preset``, ``crf``, ``segments``, ``no_cache``
+and ``cache_bottom``, plus ``timeouts`` (``{"transcribe": seconds,
+"encode": seconds}``) and ``variants`` (a list of ``--variant`` specs).
+A job with variants reports a list of paths as its ``output``.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterable
+
+from .jobs import JobManager
+from .subtitle_utils import KARAOKE_TAGS
+from .utils import parse_resolution
+from .variants import parse_variant
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+
+def job_params(body: dict) -> dict:
+    """Translate a job request ``body`` into ``generate_short`` arguments."""
+    if not isinstance(body, dict):
+        raise ValueError("job body must be a JSON object")
+    if not body.get("top") or not body.get("bottom"):
+        raise ValueError("'top' and 'bottom' are required")
+    params = {"top": body["top"], "bottom": body["bottom"]}
+    if body.get("output"):
+        params["output_path"] = body["output"]
+    if body.get("model"):
+        params["model_size"] = body["model"]
+    for key in (
+        "device", "compute_type", "style", "karaoke", "encoder", "preset", "crf", "segments"
+    ):
+        if body.get(key) is not None:
+            params[key] = body[key]
+    if params.get("karaoke") not in (None, *KARAOKE_TAGS):
+        raise ValueError(f"'karaoke' must be one of {', '.join(KARAOKE_TAGS)}")
+    resolution = body.get("resolution")
+    if resolution:
+        if isinstance(resolution, str):
+            resolution = parse_resolution(resolution)
+        params["resolution"] = tuple(resolution)
+    if body.get("no_cache"):
+        params["use_cache"] = False
+    if body.get("cache_bottom"):
+        params["cache_bottom"] = True
+    variants = body.get("variants")
+    if variants:
+        if not isinstance(variants, list):
+            raise ValueError("'variants' must be a list of variant specs")
+        params["variants"] = [parse_variant(str(spec)) for spec in variants]
+    timeouts = body.get("timeouts")
+    if timeouts:
+        if not isinstance(timeouts, dict):
+            raise ValueError("'timeouts' must map stage names to seconds")
+        params["timeouts"] = {stage: float(seconds) for stage, seconds in timeouts.items()}
+    return params
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "RenderServer"
+
+    def _send(self, status: HTTPStatus, payload) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _job_id(self) -> str | None:
+        parts = self.path.strip("/").split("/")
+        if len(parts) == 2 and parts[0] == "jobs":
+            return parts[1]
+        return None
+
+    def do_GET(self) -> None:
+        manager = self.server.manager
+        if self.path.rstrip("/") == "/models":
+            from .whisper_wrapper import model_pool
+
+            pool = model_pool()
+            self._send(
+                HTTPStatus.OK,
+                {"budget_mb": pool.budget_mb, "resident_mb": round(pool.resident_mb()),
+                 "models": pool.stats()},
+            )
+            return
+        if self.path.rstrip("/") == "/jobs":
+            self._send(HTTPStatus.OK, [job.to_dict() for job in manager.list()])
+            return
+        job_id = self._job_id()
+        job = manager.get(job_id) if job_id else None
+        if job is None:
+            self._send(HTTPStatus.NOT_FOUND, {"error": "no such job"})
+            return
+        self._send(HTTPStatus.OK, job.to_dict())
+
+    def do_POST(self) -> None:
+        if self.path.rstrip("/") != "/jobs":
+            self._send(HTTPStatus.NOT_FOUND, {"error": "unknown endpoint"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+            params = job_params(body)
+        except (ValueError, TypeError) as exc:
+            self._send(HTTPStatus.BAD_REQUEST, {"error": str(exc)})
+            return
+        job = self.server.manager.submit(params)
+        self._send(HTTPStatus.CREATED, job.to_dict())
+
+    def do_DELETE(self) -> None:
+        manager = self.server.manager
+        job_id = self._job_id()
+        job = manager.get(job_id) if job_id else None
+        if job is None:
+            self._send(HTTPStatus.NOT_FOUND, {"error": "no such job"})
+            return
+        if not manager.cancel(job_id):
+            self._send(HTTPStatus.CONFLICT, {"error": f"job is {job.status}"})
+            return
+        self._send(HTTPStatus.OK, job.to_dict())
+
+    def log_message(self, format: str, *args) -> None:
+        logging.debug("%s - %s", self.address_string(), format % args)
+
+
+class RenderServer(ThreadingHTTPServer):
+    """HTTP server owning a :class:`JobManager`."""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], manager: JobManager) -> None:
+        super().__init__(address, _Handler)
+        self.manager = manager
+
+
+def serve(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    *,
+    workers: int = 1,
+    preload: Iterable[str] = (),
+    device: str = "auto",
+    timeouts: dict | None = None,
+    model_budget: float | None = None,
+) -> None:
+    """Run the render daemon until interrupted.
+
+    ``preload`` optionally names Whisper model sizes to load before
+    accepting jobs so the first request does not pay the model-load cost.
+    ``timeouts`` are the default per-stage limits for jobs that do not set
+    their own. ``model_budget`` caps the estimated MB of Whisper models kept
+    loaded; the least recently used idle models are unloaded beyond it.
+    """
+    if host not in ("127.0.0.1", "localhost", "::1"):
+        logging.warning("Serving on %s: the job API has no authentication", host)
+
+    if preload or model_budget is not None:
+        from .whisper_wrapper import model_pool, preload_model
+
+        if model_budget is not None:
+            model_pool().budget_mb = model_budget
+        for model_size in preload:
+            logging.info("Preloading Whisper model %s", model_size)
+            preload_model(model_size, device)
+
+    manager = JobManager(workers, timeouts=timeouts)
+    httpd = RenderServer((host, port), manager)
+    logging.info("ShortsSplit render daemon listening on http://%s:%d", host, httpd.server_port)
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+        manager.shutdown(wait=False, cancel_running=True)
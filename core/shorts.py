@@ -2,14 +2,260 @@ from __future__ import annotations
 
 import logging
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-from typing import Callable, Dict
+from typing import Callable, Dict, List, Sequence, Tuple
 
-from .ffmpeg_handler import build_stack
+from .assets import prepare_bottom_asset
+from .audio import SAMPLE_RATE, extract_audio
+from .cancel import CancelToken, ChildToken, stage_token
+from .ffmpeg_handler import build_stack, build_variants, detect_encoder
+from .loudness import analyze_loudness
+from .profiling import span
+from .segmentation import Segmenter
+from .splitter import MAX_SECONDS, plan_splits, rebase_words
 from .subtitle_utils import save_ass
 from .utils import validate_media
-from .whisper_wrapper import transcribe
+from .variants import OutputProfile, variant_outputs
+from .whisper_wrapper import group_phrases, group_words, iter_cues, transcribe_words
+
+
+# Preview renders: window length, resolution divisor and encoder settings
+PREVIEW_SECONDS = 10.0
+PREVIEW_SCALE = 3
+PREVIEW_ENCODER = {"encoder": "libx264", "preset": "ultrafast", "tune": "zerolatency", "crf": 30}
+
+
+def _segmenter(style: Dict[str, str | int] | None, resolution: tuple[int, int]) -> Segmenter | None:
+    """Return the cue segmentation set in ``style`` for an output of ``resolution``."""
+    # Subtitles are burned into the top half of the frame
+    width, height = resolution
+    return Segmenter.from_style(style, (width, height // 2))
+
+
+def prepare_subtitles(
+    top: Path,
+    model_size: str = "base",
+    *,
+    device: str = "auto",
+    style: Dict[str, str | int] | None = None,
+    progress: Callable[[str], None] | None = None,
+    use_cache: bool = True,
+    parallel: bool = False,
+    workers: int | None = None,
+    compute_type: str = "auto",
+    audio_hash: str | None = None,
+    audio=None,
+    cancel: CancelToken | None = None,
+    karaoke: str | None = None,
+    resolution: tuple[int, int] = (1080, 1920),
+) -> Path:
+    """Transcribe ``top`` and write the cues to a temporary ASS file.
+
+    Cues are streamed from Whisper straight into the ASS writer, so dialogue
+    lines hit the disk while the rest of the clip is still being transcribed.
+    The caller owns the returned file and is responsible for deleting it.
+    When ``audio`` is given, ``progress`` also receives the share of the
+    clip the written cues cover, so cache hits report progress too.
+    ``cancel`` is checked between Whisper segments. Because of the streaming,
+    the ``transcribe`` profiling span includes writing the ASS file.
+    ``karaoke`` (``"k"`` or ``"kf"``) writes one phrase per Dialogue with
+    per-word timing tags instead of static three-word cues. ``Cue*`` options
+    in ``style`` (see :meth:`core.segmentation.Segmenter.from_style`) set how
+    words are grouped; ``resolution`` is the output size their line length
+    is estimated for.
+    """
+    segmenter = _segmenter(style, resolution)
+    if progress:
+        progress("Transcribing...")
+    logging.info("Transcribing top clip: %s", top)
+    cues = iter_cues(
+        top,
+        model_size=model_size,
+        device=device,
+        use_cache=use_cache,
+        progress=progress,
+        parallel=parallel,
+        workers=workers,
+        compute_type=compute_type,
+        audio_hash=audio_hash,
+        audio=audio,
+        cancel=cancel,
+        karaoke=bool(karaoke),
+        segmenter=segmenter,
+    )
+
+    with tempfile.NamedTemporaryFile(suffix=".ass", delete=False) as tmp:
+        subtitle_path = Path(tmp.name)
+    media = len(audio) / SAMPLE_RATE if audio is not None else None
+    try:
+        with span("transcribe", media=media, model=model_size, streamed=True):
+            count = save_ass(
+                cues,
+                subtitle_path,
+                style=style,
+                duration=media,
+                progress=progress,
+                karaoke=karaoke,
+            )
+    except BaseException:
+        subtitle_path.unlink(missing_ok=True)
+        raise
+    if not count:
+        logging.warning("No speech detected in top clip")
+    return subtitle_path
+
+
+def analyze_top(
+    top: Path,
+    model_size: str = "base",
+    *,
+    device: str = "auto",
+    style: Dict[str, str | int] | None = None,
+    progress: Callable[[str], None] | None = None,
+    use_cache: bool = True,
+    parallel: bool = False,
+    workers: int | None = None,
+    compute_type: str = "auto",
+    cancel: CancelToken | None = None,
+    timeouts: Dict[str, float] | None = None,
+    karaoke: str | None = None,
+    resolution: tuple[int, int] = (1080, 1920),
+) -> Tuple[Path, dict | None]:
+    """Run every audio analysis the encode needs for ``top``.
+
+    The audio is decoded once into a shared memory-mapped buffer (see
+    :mod:`core.audio`) that feeds the cache hash and Whisper. Transcription
+    (see :func:`prepare_subtitles`) and the loudness measurement for two-pass
+    ``loudnorm`` run concurrently. Returns the temporary subtitle path and
+    the loudness measurements (``None`` if they could not be taken).
+    Transcription stops when ``cancel`` fires or ``timeouts["transcribe"]``
+    seconds pass.
+    """
+    with stage_token(cancel, timeouts, "transcribe") as token, extract_audio(top) as audio:
+        audio_hash = audio.digest() if use_cache else None
+        with ThreadPoolExecutor(1, thread_name_prefix="loudness") as pool:
+            loudness = pool.submit(analyze_loudness, top, audio_hash=audio_hash)
+            subtitle_path = prepare_subtitles(
+                top,
+                model_size,
+                device=device,
+                style=style,
+                progress=progress,
+                use_cache=use_cache,
+                parallel=parallel,
+                workers=workers,
+                compute_type=compute_type,
+                audio_hash=audio_hash,
+                audio=audio.samples,
+                cancel=token,
+                karaoke=karaoke,
+                resolution=resolution,
+            )
+            return subtitle_path, loudness.result()
+
+
+def encode_short(
+    top: Path,
+    bottom: Path,
+    subtitle_path: Path,
+    output_path: Path,
+    *,
+    progress: Callable[[str], None] | None = None,
+    resolution: tuple[int, int] = (1080, 1920),
+    encoder: str | None = None,
+    preset: str | None = None,
+    crf: int | None = None,
+    cache_bottom: bool = False,
+    loudness: dict | None = None,
+    segments: int = 1,
+    start: float = 0.0,
+    duration: float | None = None,
+    cancel: CancelToken | None = None,
+    timeouts: Dict[str, float] | None = None,
+) -> Path:
+    """Stack ``top`` over ``bottom`` with ``subtitle_path`` burned in.
+
+    ``progress`` receives live encode progress with percent and ETA (see
+    :class:`core.progress.ProgressEvent`).
+
+    With ``cache_bottom`` the bottom clip is first turned into a reusable
+    pre-cropped asset for this resolution (a no-op if it already exists).
+    ``loudness`` holds measurements from :func:`analyze_top` for linear
+    two-pass normalisation. ``segments`` > 1 encodes that many pieces of
+    the timeline in parallel (see :func:`core.ffmpeg_handler.build_stack`).
+    ``start`` and ``duration`` render only that window of ``top``.
+    ffmpeg is killed when ``cancel`` fires or ``timeouts["encode"]`` seconds
+    pass.
+    """
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    if cache_bottom:
+        width, height = resolution
+        prepare_bottom_asset(bottom, (width, height // 2))
+    if progress:
+        progress("Encoding...")
+    logging.info("Building stacked video -> %s", output_path)
+    with stage_token(cancel, timeouts, "encode") as token:
+        build_stack(
+            top,
+            bottom,
+            subtitle_path,
+            output_path,
+            resolution=resolution,
+            encoder=encoder,
+            preset=preset,
+            crf=crf,
+            loudness=loudness,
+            segments=segments,
+            start=start,
+            duration=duration,
+            progress=progress,
+            cancel=token,
+        )
+    return output_path
+
+
+def encode_variants(
+    top: Path,
+    bottom: Path,
+    subtitle_path: Path,
+    outputs: List[Tuple[OutputProfile, Path]],
+    *,
+    progress: Callable[[str], None] | None = None,
+    encoder: str | None = None,
+    preset: str | None = None,
+    crf: int | None = None,
+    loudness: dict | None = None,
+    start: float = 0.0,
+    duration: float | None = None,
+    cancel: CancelToken | None = None,
+    timeouts: Dict[str, float] | None = None,
+) -> List[Path]:
+    """Render every ``(profile, path)`` in ``outputs`` in one ffmpeg pass.
+
+    See :func:`core.ffmpeg_handler.build_variants`; the other arguments
+    match :func:`encode_short`. Returns the output paths.
+    """
+    if progress:
+        progress("Encoding...")
+    logging.info("Building %d variants -> %s", len(outputs), outputs[0][1].parent)
+    with stage_token(cancel, timeouts, "encode") as token:
+        build_variants(
+            top,
+            bottom,
+            subtitle_path,
+            outputs,
+            encoder=encoder,
+            preset=preset,
+            crf=crf,
+            loudness=loudness,
+            start=start,
+            duration=duration,
+            progress=progress,
+            cancel=token,
+        )
+    return [path for _, path in outputs]
 
 
 def generate_short(
@@ -22,7 +268,20 @@ def generate_short(
     output_path: Path | str | None = None,
     progress: Callable[[str], None] | None = None,
     resolution: tuple[int, int] = (1080, 1920),
-) -> Path:
+    use_cache: bool = True,
+    encoder: str | None = None,
+    preset: str | None = None,
+    crf: int | None = None,
+    parallel: bool = False,
+    workers: int | None = None,
+    compute_type: str = "auto",
+    cache_bottom: bool = False,
+    segments: int = 1,
+    variants: Sequence[OutputProfile] | None = None,
+    karaoke: str | None = None,
+    cancel: CancelToken | None = None,
+    timeouts: Dict[str, float] | None = None,
+) -> Path | List[Path]:
     """
     Create a short stacked video using the two provided clips.
 
@@ -36,38 +295,262 @@ def generate_short(
         Whisper model size. Defaults to "base".
     device: str, optional
         Device for Whisper ("cpu", "cuda", or "auto"). Defaults to "auto".
+    style: dict, optional
+        ASS style overrides (see :data:`core.subtitle_utils.DEFAULT_STYLE`).
+        ``CueMaxChars`` (a number or "auto"), ``CueMaxDuration``,
+        ``CueMinPause``, ``CueMaxWords`` and ``CuePunctuation`` replace the
+        fixed three-word cues with :class:`core.segmentation.Segmenter`.
     resolution: tuple[int, int], optional
         Final video resolution as (width, height). Defaults to (1080, 1920).
+    use_cache: bool, optional
+        Reuse a cached transcript of the top clip's audio when available.
+        Defaults to True.
+    encoder: str, optional
+        ffmpeg video encoder (e.g. "libx264", "h264_nvenc"). Defaults to the
+        encoder detected for this host.
+    preset: str, optional
+        Encoder speed preset (e.g. "veryfast" for libx264).
+    crf: int, optional
+        Constant quality value; lower is better quality and bigger files.
+    parallel: bool, optional
+        Transcribe silence-separated chunks of the top clip in a CPU process
+        pool. Worth it for long clips on many-core hosts. Defaults to False.
+    workers: int, optional
+        Worker processes for ``parallel`` transcription.
+    compute_type: str, optional
+        CTranslate2 weight type for Whisper, e.g. "int8". Defaults to "auto",
+        the fastest type this host's device supports.
+    cache_bottom: bool, optional
+        Pre-render the bottom clip once per resolution into a cropped,
+        fast-decoding asset that later renders reuse. Defaults to False.
+    segments: int, optional
+        Split the encode into this many GOP-aligned segments rendered by
+        parallel ffmpeg processes and joined without re-encoding. Speeds up
+        long clips on many-core hosts. Defaults to 1 (a single encode).
+    variants: Sequence[OutputProfile], optional
+        Render these output profiles (see :mod:`core.variants`) instead of
+        one ``resolution``, from one transcription and one ffmpeg process.
+        Outputs are named ``<output stem>_<variant name>.<container>``.
+        Cannot be combined with ``segments``.
+    karaoke: str, optional
+        Highlight words as they are spoken: ``"kf"`` sweeps the colour
+        across each word, ``"k"`` switches it at once. Each phrase becomes
+        one subtitle event. Defaults to static three-word cues.
+    cancel: CancelToken, optional
+        Token from :mod:`core.cancel`; cancelling it stops transcription at
+        the next segment and kills a running ffmpeg, raising ``Cancelled``.
+    timeouts: dict, optional
+        Seconds allowed per stage, keyed ``"transcribe"`` and ``"encode"``.
+        A stage that runs over is stopped and raises ``StageTimeout``.
 
     Returns
     -------
-    Path
-        The path to the generated "output.mp4" file.
+    Path | List[Path]
+        The path to the generated "output.mp4" file, or the variant paths
+        in ``variants`` order.
     """
     top_path = Path(top)
     bottom_path = Path(bottom)
-    validate_media(top_path)
+    validate_media(top_path, require_audio=True)
     validate_media(bottom_path)
     if output_path is None:
         output_path = top_path.parent / "output.mp4"
     else:
         output_path = Path(output_path)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+    subtitle_resolution = resolution
+    if variants:
+        if segments > 1:
+            raise ValueError("segments cannot be combined with variants")
+        outputs = list(zip(variants, variant_outputs(output_path, list(variants))))
+        # One subtitle file serves every variant; fit lines to the narrowest
+        subtitle_resolution = min((v.resolution for v in variants), key=lambda r: r[0] / r[1])
+
+    subtitle_path, loudness = analyze_top(
+        top_path,
+        model_size,
+        device=device,
+        style=style,
+        progress=progress,
+        use_cache=use_cache,
+        parallel=parallel,
+        workers=workers,
+        compute_type=compute_type,
+        cancel=cancel,
+        timeouts=timeouts,
+        karaoke=karaoke,
+        resolution=subtitle_resolution,
+    )
+    try:
+        if variants:
+            result = encode_variants(
+                top_path,
+                bottom_path,
+                subtitle_path,
+                outputs,
+                progress=progress,
+                encoder=encoder,
+                preset=preset,
+                crf=crf,
+                loudness=loudness,
+                cancel=cancel,
+                timeouts=timeouts,
+            )
+        else:
+            result = encode_short(
+                top_path,
+                bottom_path,
+                subtitle_path,
+                output_path,
+                progress=progress,
+                resolution=resolution,
+                encoder=encoder,
+                preset=preset,
+                crf=crf,
+                cache_bottom=cache_bottom,
+                loudness=loudness,
+                segments=segments,
+                cancel=cancel,
+                timeouts=timeouts,
+            )
+    finally:
+        subtitle_path.unlink(missing_ok=True)
 
     if progress:
-        progress("Transcribing...")
-    logging.info("Transcribing top clip: %s", top_path)
-    cues = transcribe(top_path, model_size=model_size, device=device)
+        progress("Done")
+
+    return result
+
+
+def preview_resolution(resolution: tuple[int, int], scale: int = PREVIEW_SCALE) -> tuple[int, int]:
+    """Return ``resolution`` divided by ``scale``, rounded to even numbers."""
+    width, height = resolution
+    return max(2, round(width / scale / 2) * 2), max(2, round(height / scale / 2) * 2)
 
+
+def generate_preview(
+    top: Path | str,
+    bottom: Path | str,
+    model_size: str = "base",
+    *,
+    start: float = 0.0,
+    duration: float = PREVIEW_SECONDS,
+    device: str = "auto",
+    style: Dict[str, str | int] | None = None,
+    output_path: Path | str | None = None,
+    progress: Callable[[str], None] | None = None,
+    resolution: tuple[int, int] = (1080, 1920),
+    use_cache: bool = True,
+    parallel: bool = False,
+    workers: int | None = None,
+    compute_type: str = "auto",
+    karaoke: str | None = None,
+    cancel: CancelToken | None = None,
+    timeouts: Dict[str, float] | None = None,
+) -> Path:
+    """
+    Render a quick low-resolution draft of a short window of the output.
+
+    Meant for iterating on subtitle style: the cues come from the transcript
+    cache (the first preview of a clip still has to transcribe it), only
+    ``duration`` seconds from ``start`` are rendered, at a third of
+    ``resolution`` with libx264 ``ultrafast``/``zerolatency``. Subtitle sizes
+    scale with the frame, so the draft looks like the final render.
+
+    Parameters
+    ----------
+    start: float, optional
+        Start of the preview window in the top clip, in seconds.
+    duration: float, optional
+        Length of the preview window. Defaults to 10 seconds.
+    output_path: Path | str, optional
+        Where to write the draft. Defaults to ``shortssplit-preview.mp4``
+        in the temporary directory, overwritten by every preview.
+
+    The remaining parameters match :func:`generate_short`.
+
+    Returns
+    -------
+    Path
+        The path to the rendered preview.
+    """
+    top_path = Path(top)
+    bottom_path = Path(bottom)
+    info = validate_media(top_path, require_audio=True)
+    validate_media(bottom_path)
+    start = max(0.0, start)
+    duration = min(duration, info.duration - start)
+    if duration <= 0:
+        raise ValueError(f"Preview start {start:.1f}s is past the end of the top clip")
+    if output_path is None:
+        output_path = Path(tempfile.gettempdir()) / "shortssplit-preview.mp4"
+    output_path = Path(output_path)
+
+    if progress:
+        progress("Transcribing...")
+    segmenter = _segmenter(style, resolution)
+    with stage_token(cancel, timeouts, "transcribe") as token, span(
+        "transcribe", media=info.duration, model=model_size
+    ):
+        if karaoke:
+            # Phrases are regrouped from the words inside the window
+            words = transcribe_words(
+                top_path,
+                model_size,
+                device,
+                use_cache=use_cache,
+                progress=progress,
+                parallel=parallel,
+                workers=workers,
+                compute_type=compute_type,
+                cancel=token,
+            )
+            grouper = segmenter.phrases if segmenter else group_phrases
+            cues = list(grouper(rebase_words(words, start, start + duration)))
+        else:
+            cues = rebase_words(
+                iter_cues(
+                    top_path,
+                    model_size=model_size,
+                    device=device,
+                    use_cache=use_cache,
+                    progress=progress,
+                    parallel=parallel,
+                    workers=workers,
+                    compute_type=compute_type,
+                    cancel=token,
+                    segmenter=segmenter,
+                ),
+                start,
+                start + duration,
+            )
     with tempfile.NamedTemporaryFile(suffix=".ass", delete=False) as tmp:
         subtitle_path = Path(tmp.name)
-        save_ass(cues, subtitle_path, style=style)
-
     try:
+        with span("subtitle_write"):
+            save_ass(
+                cues,
+                subtitle_path,
+                style=style,
+                duration=duration,
+                progress=progress,
+                karaoke=karaoke,
+            )
         if progress:
-            progress("Encoding...")
-        logging.info("Building stacked video -> %s", output_path)
-        build_stack(top_path, bottom_path, subtitle_path, output_path, resolution=resolution)
+            progress("Rendering preview...")
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with stage_token(cancel, timeouts, "encode") as token:
+            build_stack(
+                top_path,
+                bottom_path,
+                subtitle_path,
+                output_path,
+                resolution=preview_resolution(resolution),
+                start=start,
+                duration=duration,
+                progress=progress,
+                cancel=token,
+                **PREVIEW_ENCODER,
+            )
     finally:
         subtitle_path.unlink(missing_ok=True)
 
@@ -75,3 +558,165 @@ def generate_short(
         progress("Done")
 
     return output_path
+
+
+def generate_shorts(
+    top: Path | str,
+    bottom: Path | str,
+    model_size: str = "base",
+    *,
+    max_duration: float = MAX_SECONDS,
+    device: str = "auto",
+    style: Dict[str, str | int] | None = None,
+    output_dir: Path | str | None = None,
+    progress: Callable[[str], None] | None = None,
+    resolution: tuple[int, int] = (1080, 1920),
+    use_cache: bool = True,
+    encoder: str | None = None,
+    preset: str | None = None,
+    crf: int | None = None,
+    parallel: bool = False,
+    workers: int | None = None,
+    compute_type: str = "auto",
+    cache_bottom: bool = False,
+    encode_workers: int = 2,
+    karaoke: str | None = None,
+    cancel: CancelToken | None = None,
+    timeouts: Dict[str, float] | None = None,
+) -> List[Path]:
+    """
+    Cut a long top clip into several shorts, transcribing it only once.
+
+    Cut points fall on sentence ends or pauses (see :mod:`core.splitter`).
+    Every short gets its own subtitles starting at zero and the shorts are
+    encoded concurrently.
+
+    Parameters
+    ----------
+    top: Path | str
+        Path to the long top clip which will be transcribed.
+    bottom: Path | str
+        Path to the bottom clip, looped under every short.
+    max_duration: float, optional
+        Longest allowed short in seconds. Defaults to 59.
+    output_dir: Path | str, optional
+        Directory for the shorts, named ``<top>_001.mp4`` and so on.
+        Defaults to ``<top>_shorts`` next to the top clip.
+    encode_workers: int, optional
+        Number of shorts encoded at the same time. Defaults to 2.
+    timeouts: dict, optional
+        As for :func:`generate_short`; ``"encode"`` applies to each short.
+
+    The remaining parameters match :func:`generate_short`.
+
+    Returns
+    -------
+    List[Path]
+        The generated shorts in timeline order.
+    """
+    top_path = Path(top)
+    bottom_path = Path(bottom)
+    validate_media(top_path, require_audio=True)
+    validate_media(bottom_path)
+    if output_dir is None:
+        output_dir = top_path.parent / f"{top_path.stem}_shorts"
+    output_dir = Path(output_dir)
+    # Built up front so bad Cue* options fail before transcribing
+    segmenter = _segmenter(style, resolution)
+    if segmenter is not None:
+        grouper = segmenter.phrases if karaoke else segmenter.cues
+    else:
+        grouper = group_phrases if karaoke else group_words
+
+    if progress:
+        progress("Transcribing...")
+    with stage_token(cancel, timeouts, "transcribe") as token, extract_audio(top_path) as audio:
+        audio_hash = audio.digest() if use_cache else None
+        with ThreadPoolExecutor(1, thread_name_prefix="loudness") as pool:
+            # One measurement of the whole clip keeps the shorts at the same level
+            loudness = pool.submit(analyze_loudness, top_path, audio_hash=audio_hash)
+            with span("transcribe", media=audio.duration, model=model_size):
+                words = transcribe_words(
+                    top_path,
+                    model_size,
+                    device,
+                    use_cache=use_cache,
+                    progress=progress,
+                    parallel=parallel,
+                    workers=workers,
+                    compute_type=compute_type,
+                    audio_hash=audio_hash,
+                    audio=audio.samples,
+                    cancel=token,
+                )
+            loudness = loudness.result()
+
+    splits = plan_splits(words, max_duration)
+    if not splits:
+        logging.warning("No speech detected in top clip")
+        return []
+    logging.info("Cutting %s into %d shorts", top_path, len(splits))
+
+    if encoder is None:
+        encoder = detect_encoder()
+    if cache_bottom:
+        width, height = resolution
+        prepare_bottom_asset(bottom_path, (width, height // 2))
+
+    subtitle_paths = []
+    outputs = []
+    try:
+        with span("subtitle_write", files=len(splits)):
+            for number, (start, end) in enumerate(splits, 1):
+                with tempfile.NamedTemporaryFile(suffix=".ass", delete=False) as tmp:
+                    subtitle_path = Path(tmp.name)
+                subtitle_paths.append(subtitle_path)
+                save_ass(
+                    grouper(rebase_words(words, start, end)),
+                    subtitle_path,
+                    style=style,
+                    karaoke=karaoke,
+                )
+                outputs.append(output_dir / f"{top_path.stem}_{number:03d}.mp4")
+
+        if progress:
+            progress(f"Encoding 0/{len(splits)}")
+        # A failed or cancelled short stops the others
+        with ChildToken(cancel, None, "encode") as group, ThreadPoolExecutor(
+            encode_workers, thread_name_prefix="encode"
+        ) as pool:
+            futures = [
+                pool.submit(
+                    encode_short,
+                    top_path,
+                    bottom_path,
+                    subtitle_path,
+                    output_path,
+                    resolution=resolution,
+                    encoder=encoder,
+                    preset=preset,
+                    crf=crf,
+                    loudness=loudness,
+                    start=start,
+                    duration=end - start,
+                    cancel=group,
+                    timeouts=timeouts,
+                )
+                for subtitle_path, output_path, (start, end) in zip(subtitle_paths, outputs, splits)
+            ]
+            try:
+                for done, future in enumerate(futures, 1):
+                    future.result()
+                    if progress:
+                        progress(f"Encoding {done}/{len(splits)}")
+            except BaseException:
+                group.cancel()
+                raise
+    finally:
+        for subtitle_path in subtitle_paths:
+            subtitle_path.unlink(missing_ok=True)
+
+    if progress:
+        progress("Done")
+
+    return outputs
@@ -0,0 +1,113 @@
+"""Cut one long transcribed clip into several shorts.
+
+Cut points are chosen from the word timestamps Whisper already produced:
+after a sentence ends if possible, otherwise at the longest pause, and only
+as a last resort between two words spoken back to back. Each short stays
+under a maximum duration.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, List, Sequence, Tuple
+
+Word = Tuple[float, float, str]
+
+# Default maximum length of one short; platforms cap shorts at 60 s
+MAX_SECONDS = 59.0
+
+# A gap between words at least this long counts as a pause
+PAUSE_SECONDS = 0.6
+
+# Silence kept before the first and after the last word of a short
+PAD_SECONDS = 0.2
+
+SENTENCE_END = (".", "?", "!", "…")
+
+
+def _cut_rank(words: Sequence[Word], index: int, pause: float) -> float:
+    """Return how good a cut after ``words[index]`` is; higher is better."""
+    text = words[index][2].strip()
+    gap = words[index + 1][0] - words[index][1] if index + 1 < len(words) else pause
+    if text.endswith(SENTENCE_END):
+        return 2.0 + min(gap, pause) / pause
+    if gap >= pause:
+        return 1.0 + min(gap / pause, 2.0) / 3.0
+    return gap / pause / 2.0
+
+
+def plan_splits(
+    words: Sequence[Word],
+    max_duration: float = MAX_SECONDS,
+    *,
+    min_duration: float | None = None,
+    pause: float = PAUSE_SECONDS,
+    pad: float = PAD_SECONDS,
+) -> List[Tuple[float, float]]:
+    """Return ``(start, end)`` times of the shorts to cut from ``words``.
+
+    Every short starts at a word and ends after a later one, so no word is
+    cut in half. Among the cut points that keep a short under
+    ``max_duration`` the best ranked one wins: sentence ends, then pauses,
+    then the widest gap between words. Cuts that would leave a short below
+    ``min_duration`` (half of ``max_duration`` by default) rank lower.
+    Shorts are padded by ``pad`` seconds where the neighbouring words leave
+    room. A single word longer than ``max_duration`` becomes a short of its
+    own.
+    """
+    if max_duration <= 2 * pad:
+        raise ValueError("max_duration must be longer than the padding")
+    if min_duration is None:
+        min_duration = max_duration / 2
+    limit = max_duration - 2 * pad
+
+    ranges = []
+    first = 0
+    count = len(words)
+    while first < count:
+        start = words[first][0]
+        last = first
+        best = None
+        best_rank = float("-inf")
+        index = first
+        while index < count and words[index][1] - start <= limit:
+            last = index
+            rank = _cut_rank(words, index, pause)
+            if words[index][1] - start < min_duration:
+                # Demote early cuts by less than a class, so an early sentence
+                # end still beats a later cut in mid-sentence
+                rank -= 1.5
+            if rank >= best_rank:
+                best, best_rank = index, rank
+            index += 1
+        if index == count:
+            best = last
+        elif best is None:
+            best = first
+        ranges.append((first, best))
+        first = best + 1
+
+    splits = []
+    for n, (first, last) in enumerate(ranges):
+        start = words[first][0] - pad
+        end = words[last][1] + pad
+        if n == 0:
+            start = max(start, 0.0)
+        else:
+            start = max(start, (words[first - 1][1] + words[first][0]) / 2)
+        if last + 1 < count:
+            end = min(end, (words[last][1] + words[last + 1][0]) / 2)
+        splits.append((start, end))
+    return splits
+
+
+def rebase_words(words: Iterable[Word], start: float, end: float) -> List[Word]:
+    """Return the words inside ``[start, end]`` with times relative to ``start``.
+
+    Works on subtitle cues as well, which share the ``(start, end, text)``
+    shape; items overlapping the window are kept and clipped to it.
+    """
+    return [
+        (max(0.0, w_start - start), min(w_end, end) - start, text)
+        for w_start, w_end, text in words
+        if w_end > start and w_start < end
+    ]
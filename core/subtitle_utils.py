@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, Iterable, Sequence, Tuple
 
 DEFAULT_STYLE: Dict[str, str | int] = {
     "FontName": "Arial",
@@ -10,19 +10,45 @@ DEFAULT_STYLE: Dict[str, str | int] = {
     "Outline": 2,
     "Shadow": 0,
     "Alignment": 2,
+    # Colour a word turns when it is sung in karaoke mode
+    "KaraokeColour": "&H0000FFFF",
 }
 
+# ASS karaoke tags: "k" highlights a word at once, "kf" sweeps across it
+KARAOKE_TAGS = ("k", "kf")
+
 
 def save_ass(
-    cues: List[Tuple[float, float, str]],
+    cues: Iterable[Tuple[float, float, str | Sequence[Tuple[float, float, str]]]],
     out_path: Path,
     style: Dict[str, str | int] | None = None,
-) -> None:
-    """Write subtitle ``cues`` to ``out_path`` in ASS format."""
-    if style is None:
-        style = DEFAULT_STYLE
+    *,
+    duration: float | None = None,
+    progress: Callable[[str], None] | None = None,
+    karaoke: str | None = None,
+) -> int:
+    """Write subtitle ``cues`` to ``out_path`` in ASS format.
+
+    ``cues`` may be any iterable, including a generator that is still
+    transcribing; each Dialogue line is written as soon as its cue arrives.
+    When ``duration`` is known, ``progress`` receives the share of it covered
+    by the cues written so far. Returns the number of cues written.
 
-    lines = [
+    A cue whose text is a sequence of ``(start, end, word)`` tuples (see
+    :func:`core.whisper_wrapper.group_phrases`) becomes one karaoke Dialogue
+    timed with ``\\k`` or ``\\kf`` tags, as chosen by ``karaoke``. With
+    ``karaoke`` set, words are drawn in ``PrimaryColour`` and turn
+    ``KaraokeColour`` as they are spoken.
+    """
+    if karaoke is not None and karaoke not in KARAOKE_TAGS:
+        raise ValueError(f"Unknown karaoke tag {karaoke!r}; use one of {KARAOKE_TAGS}")
+    style = {**DEFAULT_STYLE, **(style or {})}
+    # Karaoke fills from SecondaryColour to PrimaryColour
+    primary, secondary = style["PrimaryColour"], "&H00000000"
+    if karaoke:
+        primary, secondary = style["KaraokeColour"], style["PrimaryColour"]
+
+    header = [
         "[Script Info]",
         "ScriptType: v4.00+",
         "",
@@ -35,7 +61,7 @@ def save_ass(
         ),
         (
             f"Style: Default,{style['FontName']},{style['FontSize']},"
-            f"{style['PrimaryColour']},&H00000000,{style['OutlineColour']},"
+            f"{primary},{secondary},{style['OutlineColour']},"
             "&H00000000,0,0,0,0,100,100,0,0,"
             f"{style['BorderStyle']},{style['Outline']},{style['Shadow']},"
             f"{style['Alignment']},10,10,10,1"
@@ -45,17 +71,58 @@ def save_ass(
         "Format: Layer,Start,End,Style,Name,MarginL,MarginR,MarginV,Effect,Text",
     ]
 
-    for start, end, text in cues:
-        lines.append(
-            f"Dialogue: 0,{_format_time(start)},{_format_time(end)},Default,,0,0,0,,{text}"
-        )
+    count = 0
+    last_pct = -1
+    with out_path.open("w", encoding="utf-8") as f:
+        f.write("\n".join(header))
+        for start, end, text in cues:
+            if not isinstance(text, str):
+                text = karaoke_text(start, text, karaoke or "kf")
+            f.write(
+                f"\nDialogue: 0,{_format_time(start)},{_format_time(end)},Default,,0,0,0,,{text}"
+            )
+            # Flush per cue so the file tracks transcription progress
+            f.flush()
+            count += 1
+            if progress and duration:
+                pct = min(100, int(end / duration * 100))
+                if pct != last_pct:
+                    progress(f"Writing subtitles... {pct}%")
+                    last_pct = pct
+    return count
+
+
+def karaoke_text(
+    start: float, words: Sequence[Tuple[float, float, str]], tag: str = "kf"
+) -> str:
+    """Return Dialogue text timing each of ``words`` with a karaoke ``tag``.
+
+    ``start`` is the Dialogue's start time. Pauses between words get an empty
+    ``\\k`` syllable so nothing is highlighted while nobody speaks. Times are
+    rounded on the same centisecond grid as the Dialogue timestamps, so
+    rounding never accumulates along a phrase.
+    """
+    parts = []
+    cursor = _centis(start)
+    for index, (w_start, w_end, word) in enumerate(words):
+        begin = _centis(w_start)
+        if begin > cursor:
+            parts.append(f"{{\\k{begin - cursor}}}")
+        begin = max(begin, cursor)
+        end = max(_centis(w_end), begin)
+        text = word.strip()
+        parts.append(f"{{\\{tag}{end - begin}}}{' ' + text if index else text}")
+        cursor = end
+    return "".join(parts)
+
 
-    out_path.write_text("\n".join(lines), encoding="utf-8")
+def _centis(seconds: float) -> int:
+    return int(round(seconds * 100))
 
 
 def _format_time(seconds: float) -> str:
     """Return ASS-formatted timestamp ``H:MM:SS.cc``."""
-    cs_total = int(round(seconds * 100))
+    cs_total = _centis(seconds)
     hrs, cs_total = divmod(cs_total, 3600 * 100)
     mins, cs_total = divmod(cs_total, 60 * 100)
     secs, cs = divmod(cs_total, 100)
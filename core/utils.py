@@ -1,13 +1,14 @@
 import json
 import logging
 import shutil
-import subprocess
 from pathlib import Path
 
+from .media import MediaInfo, probe_media
+
 
 CONFIG_PATH = Path.home() / ".shortssplit.json"
 
-# Supported media file extensions for input validation
+# Media file extensions offered in file pickers and accepted on drag-and-drop
 VALID_EXTS = {".mp4", ".mov", ".mkv", ".webm", ".avi"}
 
 
@@ -22,35 +23,52 @@ def check_ffmpeg() -> None:
 
 def probe_duration(path: Path) -> float:
     """Return duration of media file in seconds using ffprobe."""
-    result = subprocess.run(
-        [
-            "ffprobe",
-            "-v",
-            "error",
-            "-show_entries",
-            "format=duration",
-            "-of",
-            "json",
-            str(path),
-        ],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-    )
-    if result.returncode != 0:
-        logging.error("ffprobe failed: %s", result.stderr)
-        raise RuntimeError(f"ffprobe failed: {result.stderr}")
-    data = json.loads(result.stdout)
-    return float(data["format"]["duration"])
-
-
-def validate_media(path: Path) -> None:
-    """Raise ``FileNotFoundError`` or ``ValueError`` if ``path`` is not a
-    supported media file."""
+    return probe_media(path).duration
+
+
+def parse_resolution(value: str) -> tuple[int, int]:
+    """Return width/height tuple from ``value``.
+
+    Parameters
+    ----------
+    value:
+        String in ``WIDTHxHEIGHT`` format (e.g. ``"1080x1920"``).
+
+    Raises
+    ------
+    ValueError
+        If ``value`` is not in the expected format or contains non-numeric
+        values.
+    """
+    try:
+        w, h = value.lower().split("x")
+        return int(w), int(h)
+    except Exception as exc:  # pragma: no cover - user input validation
+        raise ValueError(
+            f"Invalid resolution '{value}'. Use WIDTHxHEIGHT like 1080x1920"
+        ) from exc
+
+
+def validate_media(
+    path: Path, *, require_video: bool = True, require_audio: bool = False
+) -> MediaInfo:
+    """Return :class:`~core.media.MediaInfo` for ``path`` after checking it.
+
+    Raises ``FileNotFoundError`` if ``path`` does not exist and ``ValueError``
+    if ffprobe cannot read it as a media container or it lacks a required
+    video/audio stream.
+    """
     if not Path(path).exists():
         raise FileNotFoundError(path)
-    if Path(path).suffix.lower() not in VALID_EXTS:
-        raise ValueError(f"Unsupported file type: {path}")
+    try:
+        info = probe_media(path)
+    except RuntimeError as exc:
+        raise ValueError(f"Unsupported or corrupt media file: {path}") from exc
+    if require_video and not info.has_video:
+        raise ValueError(f"No video stream in {path}")
+    if require_audio and not info.has_audio:
+        raise ValueError(f"No audio stream in {path}")
+    return info
 
 
 def load_config() -> dict:
@@ -0,0 +1,120 @@
+"""Output profiles for publishing one short in several formats.
+
+Each platform wants its own size, bitrate and container. An
+:class:`OutputProfile` describes one such variant;
+:func:`~core.ffmpeg_handler.build_variants` renders a list of them from a
+single decode and transcription of the inputs.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import List
+
+from .utils import parse_resolution
+
+# Containers and the audio codec arguments used for them
+CONTAINERS = {
+    "mp4": ["-c:a", "aac"],
+    "mov": ["-c:a", "aac"],
+    "mkv": ["-c:a", "aac"],
+    "webm": ["-c:a", "libopus", "-b:a", "128k"],
+}
+
+# WebM cannot hold H.264; variants in it default to VP9
+WEBM_ENCODER = "libvpx-vp9"
+
+# Keys accepted after the resolution in a variant spec
+SPEC_KEYS = ("name", "encoder", "preset", "crf", "bitrate", "container")
+
+
+class OutputProfile:
+    """Resolution, encoder settings and container of one output variant.
+
+    Unset ``encoder``, ``preset`` and ``crf`` fall back to the render's own
+    settings. ``bitrate`` (an ffmpeg value such as ``"6M"``) caps the video
+    bitrate; combined with ``crf`` it limits peaks of a constant-quality
+    encode.
+    """
+
+    def __init__(
+        self,
+        resolution: tuple[int, int],
+        *,
+        name: str | None = None,
+        encoder: str | None = None,
+        preset: str | None = None,
+        crf: int | None = None,
+        bitrate: str | None = None,
+        container: str = "mp4",
+    ) -> None:
+        if container not in CONTAINERS:
+            raise ValueError(
+                f"Unsupported container {container!r}; use one of {', '.join(CONTAINERS)}"
+            )
+        self.resolution = tuple(resolution)
+        self.name = name or f"{resolution[0]}x{resolution[1]}"
+        self.encoder = encoder
+        self.preset = preset
+        self.crf = crf
+        self.bitrate = bitrate
+        self.container = container
+
+    def output_path(self, base: Path) -> Path:
+        """Return where this variant of ``base`` is written."""
+        return base.with_name(f"{base.stem}_{self.name}.{self.container}")
+
+    def resolve_encoder(self, default: str) -> str:
+        """Return the encoder for this variant given the render's ``default``."""
+        if self.encoder:
+            return self.encoder
+        return WEBM_ENCODER if self.container == "webm" else default
+
+    def audio_args(self) -> list[str]:
+        """Return the audio codec arguments for the container."""
+        return list(CONTAINERS[self.container])
+
+    def to_dict(self) -> dict:
+        """Return the profile as a JSON-serialisable dict."""
+        return {
+            "name": self.name,
+            "resolution": f"{self.resolution[0]}x{self.resolution[1]}",
+            "encoder": self.encoder,
+            "preset": self.preset,
+            "crf": self.crf,
+            "bitrate": self.bitrate,
+            "container": self.container,
+        }
+
+    def __repr__(self) -> str:
+        return f"OutputProfile({self.name!r}, {self.to_dict()['resolution']}, {self.container})"
+
+
+def parse_variant(spec: str) -> OutputProfile:
+    """Parse ``"WIDTHxHEIGHT[:key=value...]"`` into an :class:`OutputProfile`.
+
+    Keys are ``name``, ``encoder``, ``preset``, ``crf``, ``bitrate`` and
+    ``container``, e.g. ``"720x1280:bitrate=2M:container=webm:name=web"``.
+    Raises ``ValueError`` for malformed specs.
+    """
+    resolution, *options = spec.split(":")
+    settings = {}
+    for option in options:
+        key, sep, value = option.partition("=")
+        if not sep or key not in SPEC_KEYS or not value:
+            raise ValueError(f"Invalid variant option {option!r}; use key=value with {SPEC_KEYS}")
+        settings[key] = value
+    if "crf" in settings:
+        try:
+            settings["crf"] = int(settings["crf"])
+        except ValueError:
+            raise ValueError(f"Invalid crf {settings['crf']!r}") from None
+    return OutputProfile(parse_resolution(resolution), **settings)
+
+
+def variant_outputs(base: Path, variants: List[OutputProfile]) -> List[Path]:
+    """Return the output path of every variant, rejecting duplicates."""
+    paths = [variant.output_path(base) for variant in variants]
+    if len(set(paths)) != len(paths):
+        raise ValueError("Variants need distinct names or containers")
+    return paths
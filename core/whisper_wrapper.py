@@ -1,21 +1,468 @@
 import logging
 import os
 from pathlib import Path
-from typing import List, Tuple
+from typing import Callable, Iterable, Iterator, List, Tuple
 
-from faster_whisper import WhisperModel
+from .cache import TranscriptCache, audio_fingerprint
+from .cancel import CancelToken
+from .host_profile import load_host_profile, update_host_profile
+from .model_pool import ModelPool
+from .profiling import span
+from .progress import ProgressEvent
+from .segmentation import Cue, KaraokeCue, Segmenter, Word
 
 
-_model_cache = {}
+# Decoding and grouping settings; all of them are part of the cache key
+BEAM_SIZE = 5
+MAX_WORDS = 3
+
+# Karaoke phrases: words per phrase, and the pause (seconds) that ends one
+PHRASE_WORDS = 6
+PHRASE_GAP = 0.8
+
+# Memory budget in MB for Whisper models kept loaded; unbounded if unset
+MODEL_BUDGET_ENV = "WHISPER_MODEL_BUDGET_MB"
+
+# Overrides the compute type picked for the host, like WHISPER_DEVICE does
+COMPUTE_TYPE_ENV = "WHISPER_COMPUTE_TYPE"
+
+# CTranslate2 weight types per device, fastest first. int8 is several times
+# faster than float32 on CPU at a negligible accuracy cost.
+COMPUTE_PREFERENCE = {
+    "cuda": ("float16", "int8_float16", "int8", "float32"),
+    "cpu": ("int8", "int8_float32", "float32"),
+}
+
+# faster-whisper pulls in ctranslate2 and friends; import it on first model
+# load so cache hits and non-transcribing code paths never pay for it.
+WhisperModel = None
+
+
+def _whisper_model_class():
+    global WhisperModel
+    if WhisperModel is None:
+        from faster_whisper import WhisperModel as model_class
+
+        WhisperModel = model_class
+    return WhisperModel
+
+
+def split_device(value: str) -> Tuple[str, str | None]:
+    """Split a ``"cpu:int8"`` style device into device and compute type."""
+    device, _, compute_type = value.partition(":")
+    return device, compute_type or None
+
+
+def _cpu_count() -> int:
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def inference_settings(device: str = "auto", *, refresh: bool = False) -> dict:
+    """Return the inference settings for ``device`` on this host.
+
+    The result holds the concrete ``device`` (``"auto"`` becomes ``"cuda"``
+    when CTranslate2 sees a GPU), the fastest supported ``compute_type``
+    from :data:`COMPUTE_PREFERENCE`, and ``cpu_threads``/``num_workers``
+    for ``WhisperModel``. It is stored in the host profile together with the
+    CTranslate2 version it was probed against, so the probe only reruns when
+    CTranslate2 changes or ``refresh`` is set. Without CTranslate2 the model
+    defaults are returned.
+    """
+    try:
+        import ctranslate2
+    except ImportError:
+        return {"device": device, "compute_type": "default", "cpu_threads": 0, "num_workers": 1}
+
+    if device == "auto":
+        device = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+    profiles = load_host_profile().get("whisper", {})
+    cached = profiles.get(device)
+    if not refresh and cached and cached.get("ctranslate2") == ctranslate2.__version__:
+        return cached
+
+    try:
+        supported = ctranslate2.get_supported_compute_types(device)
+    except (RuntimeError, ValueError) as exc:
+        logging.warning("Could not query compute types for %s: %s", device, exc)
+        supported = ()
+    compute_type = next(
+        (name for name in COMPUTE_PREFERENCE.get(device, ()) if name in supported), "default"
+    )
+    settings = {
+        "device": device,
+        "compute_type": compute_type,
+        # On GPU the CPU threads only feed the decoder; CTranslate2's default is fine
+        "cpu_threads": _cpu_count() if device == "cpu" else 0,
+        "num_workers": 1,
+        "ctranslate2": ctranslate2.__version__,
+    }
+    logging.info("Whisper on %s: compute_type=%s", device, compute_type)
+    update_host_profile(whisper={**profiles, device: settings})
+    return settings
+
+
+def requested_inference(device: str = "auto", compute_type: str = "auto") -> Tuple[str, str]:
+    """Return ``(device, compute_type)`` after environment overrides.
+
+    ``WHISPER_DEVICE`` overrides ``device`` and ``WHISPER_COMPUTE_TYPE``
+    overrides ``compute_type``. Either device value may carry a compute type
+    as ``"cpu:int8"``. ``"auto"`` values are kept; nothing is probed.
+    """
+    device, forced = split_device(os.getenv("WHISPER_DEVICE") or device)
+    return device, os.getenv(COMPUTE_TYPE_ENV) or forced or compute_type
+
+
+def resolve_inference(device: str = "auto", compute_type: str = "auto") -> Tuple[str, str]:
+    """Return the concrete ``(device, compute_type)`` a model is loaded with.
+
+    Overrides are applied as in :func:`requested_inference`; ``"auto"``
+    then picks the host's best choice (see :func:`inference_settings`).
+    """
+    device, compute_type = requested_inference(device, compute_type)
+    settings = inference_settings(device)
+    if compute_type == "auto":
+        compute_type = settings["compute_type"]
+    return settings["device"], compute_type
+
+
+def _create_model(model_size: str, device: str, compute_type: str):
+    """Load a ``WhisperModel`` and return it with the device it runs on.
+
+    Falls back to CPU, with the CPU's compute type, if the model cannot be
+    created on ``device``.
+    """
+    model_class = _whisper_model_class()
+    settings = inference_settings(device)
+    try:
+        with span("model_load", model=model_size, device=device, compute_type=compute_type):
+            model = model_class(
+                model_size,
+                device=device,
+                compute_type=compute_type,
+                cpu_threads=settings["cpu_threads"],
+                num_workers=settings["num_workers"],
+            )
+            return model, device
+    except Exception as exc:  # GPU may fail due to missing CUDA/CUDNN
+        if device == "cpu":
+            raise
+        logging.warning("Whisper model failed on %s (%s). Falling back to CPU.", device, exc)
+    settings = inference_settings("cpu")
+    compute_type = settings["compute_type"]
+    with span("model_load", model=model_size, device="cpu", compute_type=compute_type):
+        model = model_class(
+            model_size,
+            device="cpu",
+            compute_type=compute_type,
+            cpu_threads=settings["cpu_threads"],
+            num_workers=settings["num_workers"],
+        )
+        return model, "cpu"
+
+
+def _budget_from_env() -> float | None:
+    value = os.getenv(MODEL_BUDGET_ENV)
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        logging.warning("Ignoring invalid %s=%r", MODEL_BUDGET_ENV, value)
+        return None
+
+
+# Batch runs and the daemon transcribe from several threads; the pool loads
+# each model once and unloads idle ones when over budget
+_pool = ModelPool(_create_model, budget_mb=_budget_from_env())
+
+
+def model_pool() -> ModelPool:
+    """Return the process-wide :class:`~core.model_pool.ModelPool`."""
+    return _pool
+
+
+def _checkout_model(model_size: str, device: str, compute_type: str = "auto"):
+    """Check a model out of the pool (see :func:`resolve_inference`)."""
+    device, compute_type = resolve_inference(device, compute_type)
+    return _pool.checkout(model_size, device, compute_type)
+
+
+def preload_model(model_size: str, device: str = "auto", compute_type: str = "auto") -> None:
+    """Load a model into the pool ahead of the first transcription."""
+    with _checkout_model(model_size, device, compute_type):
+        pass
+
+
+def _segment_words(
+    segments: Iterable,
+    duration: float,
+    progress: Callable[[str], None] | None = None,
+    cancel: CancelToken | None = None,
+) -> Iterator[Word]:
+    """Yield ``(start, end, word)`` from faster-whisper ``segments``.
+
+    Progress is reported as the share of ``duration`` covered so far, once
+    per whole percent. faster-whisper decodes one segment per iteration, so
+    ``cancel`` is checked before each one.
+    """
+    last_pct = -1
+    for segment in _checked(segments, cancel):
+        if progress and duration > 0:
+            pct = min(100, int(segment.end / duration * 100))
+            if pct != last_pct:
+                progress(ProgressEvent(f"Transcribing... {pct}%", stage="transcribing", percent=pct))
+                last_pct = pct
+        if segment.words is None:
+            continue
+        for word in segment.words:
+            yield word.start, word.end, word.word
+
+
+def _checked(items: Iterable, cancel: CancelToken | None) -> Iterator:
+    """Yield ``items``, raising if ``cancel`` fires before the next one."""
+    iterator = iter(items)
+    while True:
+        if cancel is not None:
+            cancel.raise_if_cancelled()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        yield item
+
+
+def group_words(words: Iterable[Word], max_words: int = MAX_WORDS) -> Iterator[Cue]:
+    """Yield cues of up to ``max_words`` consecutive ``words``."""
+    return Segmenter(max_words=max_words).cues(words)
+
+
+def group_phrases(
+    words: Iterable[Word], max_words: int = PHRASE_WORDS, max_gap: float = PHRASE_GAP
+) -> Iterator[KaraokeCue]:
+    """Yield karaoke cues of up to ``max_words`` words that keep their timing.
+
+    A pause longer than ``max_gap`` seconds starts a new phrase, so a phrase
+    is not left on screen through silence.
+    """
+    return Segmenter(max_words=max_words, min_pause=max_gap).phrases(words)
+
+
+def _cache_key(
+    cache: TranscriptCache,
+    path: Path,
+    model_size: str,
+    parallel: bool,
+    audio_hash: str | None,
+    device: str = "auto",
+    compute_type: str = "auto",
+) -> str:
+    # Chunked runs can differ slightly at chunk edges, so keep them apart
+    mode = {"chunked": True} if parallel else {}
+    # Quantised weights can change the transcript slightly too. Key on the
+    # requested settings: resolving "auto" would import ctranslate2 and
+    # probe the host on every cache hit
+    device, compute_type = requested_inference("cpu" if parallel else device, compute_type)
+    if compute_type != "auto":
+        mode["compute_type"] = compute_type
+    elif device != "auto":
+        # "auto" picks a different type per device
+        mode["device"] = device
+    return cache.make_key(
+        audio_hash or audio_fingerprint(path),
+        model_size=model_size,
+        beam_size=BEAM_SIZE,
+        max_words=MAX_WORDS,
+        **mode,
+    )
+
+
+def _iter_words(
+    path: Path,
+    model_size: str,
+    device: str,
+    *,
+    progress: Callable[[str], None] | None,
+    parallel: bool,
+    workers: int | None,
+    audio,
+    cancel: CancelToken | None = None,
+    compute_type: str = "auto",
+) -> Iterator[Word]:
+    """Run Whisper on ``path`` and yield word timestamps in time order."""
+    logging.info("Transcribing %s", path)
+    if parallel:
+        from .parallel_transcribe import iter_words_parallel
+
+        return iter_words_parallel(
+            path,
+            model_size,
+            beam_size=BEAM_SIZE,
+            workers=workers,
+            compute_type=resolve_inference("cpu", compute_type)[1],
+            progress=progress,
+            audio=audio,
+            cancel=cancel,
+        )
+    return _model_words(path, model_size, device, compute_type, progress, audio, cancel)
+
+
+def _model_words(
+    path: Path,
+    model_size: str,
+    device: str,
+    compute_type: str,
+    progress: Callable[[str], None] | None,
+    audio,
+    cancel: CancelToken | None,
+) -> Iterator[Word]:
+    """Transcribe with a pooled model, keeping it checked out until done."""
+    with _checkout_model(model_size, device, compute_type) as model:
+        segments, info = model.transcribe(
+            str(path) if audio is None else audio,
+            beam_size=BEAM_SIZE,
+            word_timestamps=True,
+        )
+        yield from _segment_words(segments, info.duration, progress, cancel)
+
+
+def iter_cues(
+    path: Path,
+    model_size: str = "base",
+    device: str = "auto",
+    *,
+    use_cache: bool = True,
+    cache: TranscriptCache | None = None,
+    progress: Callable[[str], None] | None = None,
+    parallel: bool = False,
+    workers: int | None = None,
+    audio_hash: str | None = None,
+    audio=None,
+    cancel: CancelToken | None = None,
+    compute_type: str = "auto",
+    karaoke: bool = False,
+    segmenter: Segmenter | None = None,
+) -> Iterator[Cue | KaraokeCue]:
+    """Yield subtitle cues for ``path`` as Whisper produces segments.
+
+    faster-whisper decodes lazily, so cues become available while the rest
+    of the audio is still being transcribed. Arguments match
+    :func:`transcribe`; ``progress`` receives ``"Transcribing... N%"``
+    messages based on the audio position reached. Pass ``audio_hash`` when
+    the caller already fingerprinted the audio, and ``audio`` (16 kHz mono
+    float32 samples, see :mod:`core.audio`) when it is already decoded, to
+    avoid decoding the clip again. ``cancel`` (see :mod:`core.cancel`) is
+    checked between Whisper segments. The model is checked out of the
+    :func:`model_pool` until the last segment has been decoded. With
+    ``karaoke`` the words are grouped by :func:`group_phrases` instead,
+    keeping each word's timing. A ``segmenter`` (see
+    :mod:`core.segmentation`) replaces either grouping.
+    """
+    if segmenter is not None:
+        group = segmenter.phrases if karaoke else segmenter.cues
+    else:
+        group = group_phrases if karaoke else group_words
+    key = None
+    if use_cache:
+        cache = cache or TranscriptCache()
+        key = _cache_key(
+            cache, path, model_size, parallel, audio_hash, device, compute_type
+        )
+        if karaoke or segmenter is not None:
+            # The cache holds default cues; regroup the words it keeps
+            cached = cache.get_words(key)
+            cues = None if cached is None else list(group(cached))
+        else:
+            cues = cache.get(key)
+        if cues is not None:
+            logging.info("Using cached transcript for %s", path)
+            yield from cues
+            return
+
+    words = _iter_words(
+        path, model_size, device,
+        progress=progress, parallel=parallel, workers=workers, audio=audio,
+        cancel=cancel, compute_type=compute_type,
+    )
+
+    # Segments arrive in time order, so cues are already sorted
+    seen = []
+
+    def recorded():
+        for word in words:
+            seen.append(word)
+            yield word
+
+    yield from group(recorded() if key is not None else words)
+
+    if key is not None:
+        cache.put(key, list(group_words(seen)), words=seen)
+
+
+def transcribe_words(
+    path: Path,
+    model_size: str = "base",
+    device: str = "auto",
+    *,
+    use_cache: bool = True,
+    cache: TranscriptCache | None = None,
+    progress: Callable[[str], None] | None = None,
+    parallel: bool = False,
+    workers: int | None = None,
+    audio_hash: str | None = None,
+    audio=None,
+    cancel: CancelToken | None = None,
+    compute_type: str = "auto",
+) -> List[Word]:
+    """Return the ``(start, end, word)`` timestamps for ``path``.
+
+    Arguments match :func:`iter_cues`. Words share the transcript cache entry
+    with the cues, so a clip that was already rendered whole is not
+    transcribed again; entries written before words were stored are
+    refreshed once.
+    """
+    key = None
+    if use_cache:
+        cache = cache or TranscriptCache()
+        key = _cache_key(
+            cache, path, model_size, parallel, audio_hash, device, compute_type
+        )
+        words = cache.get_words(key)
+        if words is not None:
+            logging.info("Using cached transcript for %s", path)
+            return words
+
+    words = list(
+        _iter_words(
+            path, model_size, device,
+            progress=progress, parallel=parallel, workers=workers, audio=audio,
+            cancel=cancel, compute_type=compute_type,
+        )
+    )
+    if key is not None:
+        cache.put(key, list(group_words(words)), words=words)
+    return words
 
 
 def transcribe(
-    path: Path, model_size: str = "base", device: str = "auto"
-) -> List[Tuple[float, float, str]]:
+    path: Path,
+    model_size: str = "base",
+    device: str = "auto",
+    *,
+    use_cache: bool = True,
+    cache: TranscriptCache | None = None,
+    progress: Callable[[str], None] | None = None,
+    parallel: bool = False,
+    workers: int | None = None,
+    cancel: CancelToken | None = None,
+    compute_type: str = "auto",
+) -> List[Cue]:
     """Transcribe audio and return subtitle cues.
 
     Each subtitle cue contains up to three words for readability and is timed
-    using word-level timestamps.
+    using word-level timestamps. Use :func:`iter_cues` to consume cues as
+    they are produced instead of waiting for the whole list.
 
     Parameters
     ----------
@@ -27,53 +474,45 @@ def transcribe(
         Device for inference (``"cpu"`` or ``"cuda"``/``"auto"``). Defaults to
         ``"auto"``. Set the environment variable ``WHISPER_DEVICE`` to override
         this value. If initialization fails (e.g., missing GPU libraries), the
-        function falls back to CPU.
+        function falls back to CPU. A compute type may be appended as in
+        ``"cpu:int8"``.
+    use_cache: bool, optional
+        Look up and store results in the on-disk transcript cache, keyed by
+        the decoded audio content. Defaults to ``True``.
+    cache: TranscriptCache, optional
+        Cache instance to use instead of the default location.
+    progress: Callable[[str], None], optional
+        Receives percentage-of-audio progress messages.
+    parallel: bool, optional
+        Split the audio at silences and transcribe the chunks in a CPU
+        process pool (see :mod:`core.parallel_transcribe`). ``device`` is
+        ignored in this mode. Defaults to ``False``.
+    workers: int, optional
+        Number of worker processes for ``parallel`` mode. Defaults to the
+        core count divided by the threads given to each worker.
+    cancel: CancelToken, optional
+        Checked between segments; cancelling it (or a stage timeout firing)
+        raises from the transcription loop.
+    compute_type: str, optional
+        CTranslate2 weight type such as ``"int8"`` or ``"int8_float16"``,
+        or ``"default"`` for the model's own type. Defaults to ``"auto"``,
+        the fastest type the device supports (see
+        :func:`inference_settings`). ``WHISPER_COMPUTE_TYPE`` overrides it.
     """
-    env_device = os.getenv("WHISPER_DEVICE")
-    if env_device:
-        device = env_device
-    logging.info("Transcribing %s", path)
-    cache_key = (model_size, device)
-    if cache_key not in _model_cache:
-        try:
-            _model_cache[cache_key] = WhisperModel(model_size, device=device)
-        except Exception as exc:  # GPU may fail due to missing CUDA/CUDNN
-            logging.warning(
-                "Whisper model failed on %s (%s). Falling back to CPU.", device, exc
-            )
-            cache_key = (model_size, "cpu")
-            if cache_key not in _model_cache:
-                _model_cache[cache_key] = WhisperModel(model_size, device="cpu")
-    model = _model_cache[cache_key]
-    segments, _ = model.transcribe(
-        str(path), beam_size=5, word_timestamps=True
+    cues = list(
+        iter_cues(
+            path,
+            model_size,
+            device,
+            use_cache=use_cache,
+            cache=cache,
+            progress=progress,
+            parallel=parallel,
+            workers=workers,
+            cancel=cancel,
+            compute_type=compute_type,
+        )
     )
-
-    max_words = 3
-    cues = []
-    word_group = []
-    for segment in segments:
-        if segment.words is None:
-            continue
-        for word in segment.words:
-            word_group.append(word)
-            if len(word_group) == max_words:
-                start = word_group[0].start
-                end = word_group[-1].end
-                text = " ".join(w.word for w in word_group).strip()
-                cues.append((start, end, text))
-                word_group = []
-
-    if word_group:
-        start = word_group[0].start
-        end = word_group[-1].end
-        text = " ".join(w.word for w in word_group).strip()
-        cues.append((start, end, text))
-
-    # Sort cues by start time in case segments are not sequential
-    cues.sort(key=lambda c: c[0])
-
     if not cues:
         logging.warning("No speech detected in top clip")
-
     return cues
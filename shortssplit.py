@@ -1,71 +1,368 @@
-"""Entry point for ShortsSplit."""
+"""Entry point for ShortsSplit.
+
+Keep module-level imports light: ``--help``/``--version`` and headless renders
+must not pay for PySide6 or faster-whisper, which are imported on demand.
+"""
 
 import argparse
 import logging
+import multiprocessing
+import sys
 
-from core import generate_short, load_config, save_config, __version__
-from core.utils import check_ffmpeg
-from ui.mainwindow import run_app
+from core import (
+    generate_preview,
+    generate_short,
+    generate_shorts,
+    load_config,
+    save_config,
+    __version__,
+)
+from core.segmentation import Segmenter
+from core.subtitle_utils import KARAOKE_TAGS
+from core.utils import check_ffmpeg, parse_resolution
+from core.variants import parse_variant
 
 
-def parse_resolution(value: str) -> tuple[int, int]:
-    """Return width/height tuple from ``value``.
+def run_gui():
+    """Launch the GUI; PySide6 is only imported on this path."""
+    from ui.mainwindow import run_app
 
-    Parameters
-    ----------
-    value:
-        String in ``WIDTHxHEIGHT`` format (e.g. ``"1080x1920"``).
+    return run_app()
 
-    Raises
-    ------
-    ValueError
-        If ``value`` is not in the expected format or contains non-numeric
-        values.
-    """
+
+def add_timeout_args(parser: argparse.ArgumentParser) -> None:
+    """Add the per-stage timeout flags shared by renders and the daemon."""
+    parser.add_argument(
+        "--transcribe-timeout",
+        type=float,
+        metavar="SECONDS",
+        help="Give up on a transcription that runs longer than this",
+    )
+    parser.add_argument(
+        "--encode-timeout",
+        type=float,
+        metavar="SECONDS",
+        help="Kill an ffmpeg encode that runs longer than this",
+    )
+
+
+def stage_timeouts(args: argparse.Namespace) -> dict | None:
+    """Return the ``timeouts`` dict for the parsed timeout flags."""
+    timeouts = {
+        stage: seconds
+        for stage, seconds in (
+            ("transcribe", args.transcribe_timeout),
+            ("encode", args.encode_timeout),
+        )
+        if seconds
+    }
+    return timeouts or None
+
+
+def serve_main(argv: list[str]) -> int:
+    """Run the ``serve`` subcommand: a long-lived local render daemon."""
+    from core.server import DEFAULT_HOST, DEFAULT_PORT, serve
+
+    parser = argparse.ArgumentParser(
+        prog="shortssplit serve",
+        description="Keep Whisper warm and accept render jobs over HTTP on localhost",
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Address to bind")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to bind")
+    parser.add_argument("--workers", type=int, default=1, help="Concurrent render jobs")
+    parser.add_argument(
+        "--preload",
+        action="append",
+        default=[],
+        metavar="MODEL",
+        help="Whisper model size to load at startup (repeatable)",
+    )
+    parser.add_argument("-d", "--device", default="auto", help="Whisper device for preloading")
+    parser.add_argument(
+        "--model-budget",
+        type=float,
+        metavar="MB",
+        help="Unload least recently used Whisper models beyond this estimated memory "
+        "(default: $WHISPER_MODEL_BUDGET_MB or unlimited)",
+    )
+    add_timeout_args(parser)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s:%(message)s")
     try:
-        w, h = value.lower().split("x")
-        return int(w), int(h)
-    except Exception as exc:  # pragma: no cover - user input validation
-        raise ValueError(
-            f"Invalid resolution '{value}'. Use WIDTHxHEIGHT like 1080x1920"
-        ) from exc
+        check_ffmpeg()
+    except EnvironmentError as exc:
+        logging.error(exc)
+        return 1
+
+    serve(
+        args.host,
+        args.port,
+        workers=args.workers,
+        preload=args.preload,
+        device=args.device,
+        timeouts=stage_timeouts(args),
+        model_budget=args.model_budget,
+    )
+    return 0
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     """Run ShortsSplit either via the GUI or the command line."""
-    parser = argparse.ArgumentParser(description="Create vertical shorts")
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv[:1] == ["serve"]:
+        return serve_main(argv[1:])
+
+    parser = argparse.ArgumentParser(
+        description="Create vertical shorts",
+        epilog="Run 'shortssplit serve --help' for the render daemon.",
+    )
     parser.add_argument("top", nargs="?", help="Top clip with audio")
     parser.add_argument("bottom", nargs="?", help="Bottom clip video")
-    parser.add_argument("-o", "--output", help="Output file path")
+    parser.add_argument(
+        "-o", "--output", help="Output file path (output directory with --split-max)"
+    )
     parser.add_argument("-m", "--model", default="base", help="Whisper model size")
-    parser.add_argument("-d", "--device", default="auto", help="Whisper device")
+    parser.add_argument(
+        "-d",
+        "--device",
+        default="auto",
+        help="Whisper device: auto, cpu or cuda, optionally with a compute type (cpu:int8)",
+    )
+    parser.add_argument(
+        "--compute-type",
+        default="auto",
+        help="Whisper weight type, e.g. int8, int8_float16, float16 "
+        "(default: fastest supported on this host; $WHISPER_COMPUTE_TYPE overrides)",
+    )
     parser.add_argument("--font", help="Subtitle font name")
     parser.add_argument("--font-size", type=int, help="Subtitle font size")
     parser.add_argument("--outline", type=int, help="Subtitle outline thickness")
+    parser.add_argument(
+        "--cue-chars",
+        metavar="N|auto",
+        help="Split subtitles into cues of at most N characters; "
+        "auto fits one line to the font size and frame width",
+    )
+    parser.add_argument(
+        "--cue-duration", type=float, metavar="S", help="Longest time one cue stays on screen"
+    )
+    parser.add_argument(
+        "--cue-pause", type=float, metavar="S", help="Start a new cue after a pause longer than S"
+    )
+    parser.add_argument("--cue-words", type=int, metavar="N", help="Most words per cue")
+    parser.add_argument(
+        "--cue-ignore-punctuation",
+        action="store_true",
+        help="Do not end cues at sentence and clause punctuation",
+    )
+    parser.add_argument(
+        "--karaoke",
+        nargs="?",
+        const="kf",
+        choices=KARAOKE_TAGS,
+        help="Highlight each word as it is spoken, one subtitle per phrase "
+        "(kf: sweep, the default; k: instant)",
+    )
     parser.add_argument(
         "-r",
         "--resolution",
         default=None,
         help="Output resolution WIDTHxHEIGHT (e.g. 1080x1920)",
     )
+    parser.add_argument(
+        "--encoder",
+        help="ffmpeg video encoder (default: detected once per host, e.g. h264_nvenc or libx264)",
+    )
+    parser.add_argument("--preset", help="Encoder preset (e.g. veryfast, medium)")
+    parser.add_argument("--crf", type=int, help="Constant quality value (lower = better)")
+    parser.add_argument(
+        "--segments",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Encode N GOP-aligned segments in parallel and join them without re-encoding",
+    )
+    parser.add_argument(
+        "--variant",
+        action="append",
+        default=[],
+        metavar="SPEC",
+        help="Render WIDTHxHEIGHT[:name=..:encoder=..:preset=..:crf=..:bitrate=..:container=..] "
+        "instead of -o, all in one ffmpeg pass (repeatable); outputs are named "
+        "<output>_<name>.<container>",
+    )
+    parser.add_argument(
+        "--parallel-transcribe",
+        nargs="?",
+        type=int,
+        const=0,
+        default=None,
+        metavar="WORKERS",
+        help="Transcribe silence-split chunks in a CPU process pool (default: cores/2 workers)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always re-run Whisper instead of using the transcript cache",
+    )
+    parser.add_argument(
+        "--purge-cache",
+        action="store_true",
+        help="Delete all cached transcripts and bottom-clip assets and exit",
+    )
+    parser.add_argument(
+        "--cache-bottom",
+        action="store_true",
+        help="Pre-render the bottom clip once per resolution and reuse it in later renders",
+    )
+    parser.add_argument(
+        "--split-max",
+        type=float,
+        metavar="SECONDS",
+        help="Cut a long top clip into shorts of at most SECONDS at sentence/pause boundaries",
+    )
+    parser.add_argument(
+        "--preview",
+        nargs="?",
+        type=float,
+        const=0.0,
+        default=None,
+        metavar="START",
+        help="Render a quick low-resolution draft starting at START seconds (default: 0)",
+    )
+    parser.add_argument(
+        "--preview-duration",
+        type=float,
+        default=10.0,
+        metavar="SECONDS",
+        help="Length of the --preview window",
+    )
+    parser.add_argument(
+        "--batch",
+        metavar="MANIFEST",
+        help="Render every entry of a CSV/JSONL manifest (top,bottom,output,style,resolution)",
+    )
+    parser.add_argument(
+        "--report",
+        help="Batch status/timing report path (default: <manifest>.report.jsonl)",
+    )
+    parser.add_argument(
+        "--transcribe-workers", type=int, default=1, help="Concurrent transcriptions in batch mode"
+    )
+    parser.add_argument(
+        "--encode-workers",
+        type=int,
+        default=None,
+        help="Concurrent ffmpeg encodes in batch and split mode (default: 1 batch, 2 split)",
+    )
+    add_timeout_args(parser)
+    parser.add_argument(
+        "--profile",
+        metavar="PATH",
+        help="Record per-stage timings to PATH (.json: Chrome trace, otherwise JSON lines)",
+    )
     parser.add_argument("--version", action="version", version=f"ShortsSplit {__version__}")
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    if not args.profile:
+        return run_cli(args)
+
+    from core.profiling import profile
+
+    with profile() as profiler:
+        try:
+            return run_cli(args)
+        finally:
+            profiler.write(args.profile)
+            profiler.log_summary()
+            logging.info("Profile written to %s", args.profile)
+
+
+def cli_style(args: argparse.Namespace) -> dict | None:
+    """Return the subtitle style overrides set on the command line.
+
+    Raises ``ValueError`` for invalid ``--cue-*`` values.
+    """
+    style = {}
+    if args.font:
+        style["FontName"] = args.font
+    if args.font_size:
+        style["FontSize"] = args.font_size
+    if args.outline is not None:
+        style["Outline"] = args.outline
+    # Any --cue-* option switches from fixed three-word cues to segmentation
+    for key, value in (
+        ("CueMaxChars", args.cue_chars),
+        ("CueMaxDuration", args.cue_duration),
+        ("CueMinPause", args.cue_pause),
+        ("CueMaxWords", args.cue_words),
+        ("CuePunctuation", False if args.cue_ignore_punctuation else None),
+    ):
+        if value is not None:
+            style[key] = value
+    # The frame only sizes "auto" lines; any one validates the values
+    Segmenter.from_style(style, (1080, 960))
+    return style or None
+
+
+def run_cli(args: argparse.Namespace) -> int:
+    """Carry out the command line parsed by :func:`main`."""
+    timeouts = stage_timeouts(args)
 
     logging.basicConfig(level=logging.INFO, format="%(levelname)s:%(message)s")
 
+    if args.purge_cache:
+        from core.assets import purge_bottom_assets
+        from core.cache import TranscriptCache
+
+        print(f"Removed {TranscriptCache().purge()} cached transcripts")
+        print(f"Removed {purge_bottom_assets()} bottom-clip assets")
+        return 0
+
     try:
         check_ffmpeg()
     except EnvironmentError as exc:
         logging.error(exc)
         return 1
 
+    try:
+        style = cli_style(args)
+    except ValueError as exc:
+        print(exc)
+        return 1
+
+    if args.batch:
+        from core.batch import run_batch
+
+        jobs = run_batch(
+            args.batch,
+            report_path=args.report,
+            style=style,
+            model_size=args.model,
+            device=args.device,
+            compute_type=args.compute_type,
+            use_cache=not args.no_cache,
+            encoder=args.encoder,
+            preset=args.preset,
+            crf=args.crf,
+            cache_bottom=args.cache_bottom,
+            segments=args.segments,
+            karaoke=args.karaoke,
+            timeouts=timeouts,
+            transcribe_workers=args.transcribe_workers,
+            encode_workers=args.encode_workers or 1,
+            progress=print,
+        )
+        return 0 if all(job.status == "done" for job in jobs) else 1
+
     cfg = load_config()
     if args.top and args.bottom:
         top = args.top
         bottom = args.bottom
     else:
         # No CLI args, launch GUI
-        return run_app()
+        return run_gui()
 
     res_str = args.resolution or cfg.get("resolution", "1080x1920")
     try:
@@ -74,15 +371,64 @@ def main() -> int:
         print(exc)
         return 1
 
-    style = {}
-    if args.font:
-        style["FontName"] = args.font
-    if args.font_size:
-        style["FontSize"] = args.font_size
-    if args.outline is not None:
-        style["Outline"] = args.outline
-    if not style:
-        style = None
+    try:
+        variants = [parse_variant(spec) for spec in args.variant]
+    except ValueError as exc:
+        print(exc)
+        return 1
+    if variants and args.segments > 1:
+        print("--segments cannot be combined with --variant")
+        return 1
+
+    if top and bottom and args.preview is not None:
+        out = generate_preview(
+            top,
+            bottom,
+            model_size=args.model,
+            start=args.preview,
+            duration=args.preview_duration,
+            device=args.device,
+            compute_type=args.compute_type,
+            style=style,
+            output_path=args.output,
+            progress=print,
+            resolution=resolution,
+            use_cache=not args.no_cache,
+            parallel=args.parallel_transcribe is not None,
+            workers=args.parallel_transcribe or None,
+            karaoke=args.karaoke,
+            timeouts=timeouts,
+        )
+        print(out)
+        return 0
+
+    if top and bottom and args.split_max:
+        outputs = generate_shorts(
+            top,
+            bottom,
+            model_size=args.model,
+            max_duration=args.split_max,
+            device=args.device,
+            compute_type=args.compute_type,
+            style=style,
+            output_dir=args.output,
+            progress=print,
+            resolution=resolution,
+            use_cache=not args.no_cache,
+            encoder=args.encoder,
+            preset=args.preset,
+            crf=args.crf,
+            parallel=args.parallel_transcribe is not None,
+            workers=args.parallel_transcribe or None,
+            cache_bottom=args.cache_bottom,
+            encode_workers=args.encode_workers or 2,
+            karaoke=args.karaoke,
+            timeouts=timeouts,
+        )
+        save_config({"top_clip": top, "bottom_clip": bottom, "resolution": res_str})
+        for out in outputs:
+            print(out)
+        return 0 if outputs else 1
 
     if top and bottom:
         out = generate_short(
@@ -90,18 +436,33 @@ def main() -> int:
             bottom,
             model_size=args.model,
             device=args.device,
+            compute_type=args.compute_type,
             style=style,
             output_path=args.output,
             progress=print,
             resolution=resolution,
+            use_cache=not args.no_cache,
+            encoder=args.encoder,
+            preset=args.preset,
+            crf=args.crf,
+            parallel=args.parallel_transcribe is not None,
+            workers=args.parallel_transcribe or None,
+            cache_bottom=args.cache_bottom,
+            segments=args.segments,
+            variants=variants or None,
+            karaoke=args.karaoke,
+            timeouts=timeouts,
         )
         save_config({"top_clip": top, "bottom_clip": bottom, "resolution": res_str})
-        print(out)
+        for path in out if isinstance(out, list) else [out]:
+            print(path)
         return 0
 
-    run_app()
+    run_gui()
     return 0
 
 
 if __name__ == "__main__":
+    # Frozen builds need this for the parallel transcription process pool
+    multiprocessing.freeze_support()
     raise SystemExit(main())
@@ -0,0 +1,69 @@
+import io
+import subprocess
+import sys
+import types
+from pathlib import Path
+
+# Provide dummy faster_whisper module for imports elsewhere
+stub = types.ModuleType('faster_whisper')
+stub.WhisperModel = object
+sys.modules.setdefault('faster_whisper', stub)
+
+from core import assets
+import core.ffmpeg_handler as ffmpeg_handler
+
+
+def fake_ffmpeg(calls):
+    def fake_run(cmd, check=True, stderr=None, **kwargs):
+        calls.append(cmd)
+        Path(cmd[-1]).write_text("asset")
+        return subprocess.CompletedProcess(cmd, 0, stderr=b"")
+
+    return fake_run
+
+
+def test_prepare_bottom_asset_once(monkeypatch, tmp_path):
+    monkeypatch.setattr(assets, "ASSET_DIR", tmp_path / "assets")
+    bottom = tmp_path / "loop.mp4"
+    bottom.write_text("video")
+    calls = []
+    monkeypatch.setattr(subprocess, "run", fake_ffmpeg(calls))
+
+    assert assets.find_bottom_asset(bottom, (1080, 960)) is None
+    path = assets.prepare_bottom_asset(bottom, (1080, 960))
+    assert path.exists() and path.name.endswith("1080x960.mp4")
+    assert "scale=1080:-2,crop=1080:960" in calls[0]
+    assert assets.prepare_bottom_asset(bottom, (1080, 960)) == path
+    assert len(calls) == 1, "Existing assets are reused"
+    assert assets.find_bottom_asset(bottom, (1080, 960)) == path
+    assert assets.find_bottom_asset(bottom, (720, 640)) is None
+    assert assets.purge_bottom_assets() == 1
+
+
+def test_build_stack_uses_prepared_asset(monkeypatch, tmp_path):
+    monkeypatch.setattr(assets, "ASSET_DIR", tmp_path / "assets")
+    bottom = tmp_path / "loop.mp4"
+    bottom.write_text("video")
+    calls = []
+    monkeypatch.setattr(subprocess, "run", fake_ffmpeg(calls))
+    asset = assets.prepare_bottom_asset(bottom, (1080, 960))
+
+    monkeypatch.setattr(ffmpeg_handler, "probe_media", lambda p: types.SimpleNamespace(duration=1.0))
+
+    class FakePopen:
+        def __init__(self, cmd, **kwargs):
+            calls.append(cmd)
+            self.stdout = io.StringIO("")
+            self.stderr = io.StringIO("")
+
+        def wait(self):
+            return 0
+
+    monkeypatch.setattr(subprocess, "Popen", FakePopen)
+    ffmpeg_handler.build_stack(
+        tmp_path / "top.mp4", bottom, tmp_path / "sub.ass", tmp_path / "out.mp4", encoder="libx264"
+    )
+    cmd = calls[-1]
+    assert str(asset) in cmd and str(bottom) not in cmd
+    graph = cmd[cmd.index("-filter_complex") + 1]
+    assert graph.count("scale=") == 1, "Only the top clip is scaled"
@@ -0,0 +1,59 @@
+import hashlib
+import io
+import struct
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from core import audio, cache
+
+
+SAMPLES = struct.pack("<4f", 0.0, 0.5, -0.5, 1.0)
+
+
+def test_fingerprint_hashes_same_samples_as_buffer(monkeypatch):
+    captured = {}
+
+    class FakePopen:
+        def __init__(self, cmd, stdout=None, stderr=None):
+            captured["cmd"] = cmd
+            self.stdout = io.BytesIO(SAMPLES)
+            self.stderr = io.BytesIO(b"")
+
+        def wait(self):
+            return 0
+
+    monkeypatch.setattr(subprocess, "Popen", FakePopen)
+    digest = cache.audio_fingerprint(Path("top.mp4"))
+    assert digest == hashlib.sha256(SAMPLES).hexdigest()
+    assert captured["cmd"] == audio.decode_command(Path("top.mp4"), "-")
+
+
+def test_extract_audio_memory_maps_samples(monkeypatch):
+    pytest.importorskip("numpy")
+
+    def fake_run(cmd, check=True, stderr=None):
+        Path(cmd[-1]).write_bytes(SAMPLES)
+        return subprocess.CompletedProcess(cmd, 0)
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+    with audio.extract_audio(Path("top.mp4")) as buf:
+        raw = buf.raw_path
+        assert list(buf.samples) == [0.0, 0.5, -0.5, 1.0]
+        assert buf.duration == 4 / audio.SAMPLE_RATE
+        assert buf.digest() == hashlib.sha256(SAMPLES).hexdigest()
+    assert not raw.exists()
+
+
+def test_extract_audio_failure_cleans_up(monkeypatch, tmp_path):
+    created = []
+
+    def fake_run(cmd, check=True, stderr=None):
+        created.append(Path(cmd[-1]))
+        raise subprocess.CalledProcessError(1, cmd, stderr=b"no audio stream")
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+    with pytest.raises(RuntimeError):
+        audio.extract_audio(Path("silent.mp4"))
+    assert not created[0].exists()
@@ -0,0 +1,121 @@
+import json
+import sys
+import threading
+import types
+
+import pytest
+
+# Provide dummy faster_whisper module so core.shorts can be imported
+stub = types.ModuleType('faster_whisper')
+stub.WhisperModel = object
+sys.modules.setdefault('faster_whisper', stub)
+
+from core import batch
+import core.ffmpeg_handler as ffmpeg_handler
+import core.shorts as shorts
+
+
+def test_load_manifest_csv(tmp_path):
+    manifest = tmp_path / "jobs.csv"
+    manifest.write_text(
+        "top,bottom,output,style,resolution\n"
+        'a.mp4,loop.mp4,out/a.mp4,"{""FontName"": ""Impact""}",720x1280\n'
+        "b.mp4,loop.mp4,,,\n"
+    )
+    jobs = batch.load_manifest(manifest)
+    assert len(jobs) == 2
+    assert jobs[0].top == tmp_path / "a.mp4"
+    assert jobs[0].output == tmp_path / "out" / "a.mp4"
+    assert jobs[0].style == {"FontName": "Impact"}
+    assert jobs[0].resolution == (720, 1280)
+    assert jobs[1].output == tmp_path / "b_short.mp4"
+    assert jobs[1].style is None
+    assert jobs[1].resolution == (1080, 1920)
+
+
+def test_load_manifest_jsonl(tmp_path):
+    manifest = tmp_path / "jobs.jsonl"
+    manifest.write_text(
+        json.dumps({"top": "a.mp4", "bottom": "b.mp4", "style": {"FontSize": 48}})
+        + "\n\n"
+    )
+    jobs = batch.load_manifest(manifest)
+    assert len(jobs) == 1
+    assert jobs[0].style == {"FontSize": 48}
+
+
+def test_load_manifest_requires_clips(tmp_path):
+    manifest = tmp_path / "jobs.jsonl"
+    manifest.write_text(json.dumps({"top": "a.mp4"}) + "\n")
+    with pytest.raises(ValueError):
+        batch.load_manifest(manifest)
+
+
+def test_load_manifest_rejects_unknown_fields(tmp_path):
+    manifest = tmp_path / "jobs.jsonl"
+    manifest.write_text(json.dumps({"top": "a.mp4", "bottom": "b.mp4", "ouput": "x.mp4"}) + "\n")
+    with pytest.raises(ValueError, match="unknown field.*ouput"):
+        batch.load_manifest(manifest)
+
+    manifest = tmp_path / "jobs.csv"
+    manifest.write_text("top,bottom,font\na.mp4,b.mp4,Impact\n")
+    with pytest.raises(ValueError, match="font"):
+        batch.load_manifest(manifest)
+    manifest.write_text("top,bottom\na.mp4,b.mp4,extra\n")
+    with pytest.raises(ValueError, match="extra column"):
+        batch.load_manifest(manifest)
+
+
+def test_run_batch_merges_cli_style(monkeypatch, tmp_path):
+    manifest = tmp_path / "jobs.jsonl"
+    manifest.write_text(
+        json.dumps({"top": "a.mp4", "bottom": "b.mp4", "style": {"FontSize": 48}}) + "\n"
+        + json.dumps({"top": "c.mp4", "bottom": "b.mp4"}) + "\n"
+    )
+    monkeypatch.setattr(batch.BatchScheduler, "run", lambda self, jobs: jobs)
+
+    jobs = batch.run_batch(manifest, style={"FontSize": 30, "CueMaxChars": "auto"})
+
+    assert jobs[0].style == {"FontSize": 48, "CueMaxChars": "auto"}
+    assert jobs[1].style == {"FontSize": 30, "CueMaxChars": "auto"}
+
+
+def test_scheduler_overlaps_stages_and_reports(monkeypatch, tmp_path):
+    jobs = [
+        batch.BatchJob(i, tmp_path / f"{i}.mp4", tmp_path / "loop.mp4", tmp_path / f"out{i}.mp4")
+        for i in range(3)
+    ]
+    encode_started = threading.Event()
+    overlapped = []
+
+    def fake_prepare(top, model_size, **kwargs):
+        if top.name != "0.mp4":
+            # Transcription of a later job runs while job 0 is encoding
+            overlapped.append(encode_started.wait(timeout=5))
+        sub = tmp_path / f"{top.stem}.ass"
+        sub.write_text("")
+        return sub, None
+
+    def fake_encode(top, bottom, sub, out, **kwargs):
+        encode_started.set()
+        if top.name == "2.mp4":
+            raise RuntimeError("ffmpeg encoding failed")
+        return out
+
+    monkeypatch.setattr(batch, "validate_media", lambda p, **kw: None)
+    monkeypatch.setattr(ffmpeg_handler, "detect_encoder", lambda: "libx264")
+    monkeypatch.setattr(shorts, "analyze_top", fake_prepare)
+    monkeypatch.setattr(shorts, "encode_short", fake_encode)
+
+    report = tmp_path / "report.jsonl"
+    scheduler = batch.BatchScheduler(report_path=report)
+    scheduler.run(jobs)
+
+    assert overlapped and all(overlapped)
+    assert [j.status for j in jobs] == ["done", "done", "failed"]
+    assert "ffmpeg encoding failed" in jobs[2].error
+    assert not list(tmp_path.glob("*.ass")), "Temporary subtitles should be removed"
+
+    lines = [json.loads(l) for l in report.read_text().splitlines()]
+    assert sorted(l["index"] for l in lines) == [0, 1, 2]
+    assert all({"transcribe", "encode", "total"} <= set(l["timings"]) for l in lines)
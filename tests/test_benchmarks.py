@@ -0,0 +1,63 @@
+import shutil
+
+import pytest
+
+from benchmarks.suite import Suite, compare, format_rows, measure
+from benchmarks.synthetic import clip_command, speech_like_audio, synthetic_cues
+
+
+def test_compare_flags_regressions_and_improvements():
+    baseline = {"a": {"seconds": 1.0}, "b": {"seconds": 1.0}, "c": {"seconds": 1.0}}
+    results = {
+        "a": {"seconds": 1.3},
+        "b": {"seconds": 0.7},
+        "c": {"seconds": 1.05},
+        "new": {"seconds": 5.0},
+    }
+
+    rows = {row["name"]: row for row in compare(results, baseline, tolerance=0.15)}
+
+    assert set(rows) == {"a", "b", "c"}
+    assert rows["a"]["status"] == "regression"
+    assert rows["a"]["change"] == pytest.approx(0.3)
+    assert rows["b"]["status"] == "improved"
+    assert rows["c"]["status"] == "ok"
+    assert "REGRESSION" in format_rows(list(rows.values())).splitlines()[1]
+
+
+def test_measure_keeps_median_run():
+    calls = iter([{"n": 1}, {"n": 2}, {"n": 3}])
+
+    result = measure(lambda: next(calls), repeat=3)
+
+    assert len(result["runs"]) == 3
+    assert result["seconds"] == sorted(result["runs"])[1]
+    assert result["n"] in (1, 2, 3)
+
+
+def test_clip_commands_use_lavfi_sources(tmp_path):
+    top = clip_command(tmp_path / "top.mp4", 5, (640, 360), kind="top")
+    bottom = clip_command(tmp_path / "bottom.mp4", 5, (640, 360), kind="bottom")
+
+    assert "testsrc2=s=640x360:r=30:d=5" in top
+    assert speech_like_audio(5) in top
+    assert "-an" in bottom and any(arg.startswith("mandelbrot") for arg in bottom)
+    with pytest.raises(ValueError):
+        clip_command(tmp_path / "x.mp4", 5, (640, 360), kind="side")
+
+
+def test_synthetic_cues_are_ordered():
+    cues = synthetic_cues(4)
+    assert len(cues) == 4
+    assert all(a[1] <= b[0] for a, b in zip(cues, cues[1:]))
+
+
+@pytest.mark.skipif(not shutil.which("ffmpeg"), reason="ffmpeg is not installed")
+def test_build_stack_case_runs_end_to_end(tmp_path):
+    suite = Suite(tmp_path, repeat=1, model=None, source_size=(360, 640))
+    top, bottom = suite.clips(1.0)
+
+    result = suite.bench_build_stack(top, bottom, 1.0, (360, 640), "libx264", "ultrafast")
+
+    assert result["seconds"] > 0 and result["realtime_factor"] > 0
+    assert (tmp_path / "build_stack.mp4").stat().st_size > 0
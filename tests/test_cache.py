@@ -0,0 +1,70 @@
+import os
+import sys
+import types
+
+# Provide dummy faster_whisper module so core.whisper_wrapper can be imported
+stub = types.ModuleType('faster_whisper')
+stub.WhisperModel = object
+sys.modules.setdefault('faster_whisper', stub)
+
+from core.cache import TranscriptCache
+import core.whisper_wrapper as whisper_wrapper
+
+
+def test_make_key_depends_on_params():
+    a = TranscriptCache.make_key("abc", model_size="base", beam_size=5)
+    b = TranscriptCache.make_key("abc", beam_size=5, model_size="base")
+    c = TranscriptCache.make_key("abc", model_size="small", beam_size=5)
+    assert a == b
+    assert a != c
+
+
+def test_put_get_roundtrip(tmp_path):
+    cache = TranscriptCache(tmp_path)
+    assert cache.get("k") is None
+    cache.put("k", [(0.0, 1.0, "hello")])
+    assert cache.get("k") == [(0.0, 1.0, "hello")]
+
+
+def test_lru_eviction(tmp_path):
+    cache = TranscriptCache(tmp_path, max_bytes=10**6)
+    cache.put("old", [(0.0, 1.0, "a")])
+    cache.put("new", [(0.0, 1.0, "b")])
+    entry_size = (tmp_path / "old.json").stat().st_size
+    os.utime(tmp_path / "old.json", (1, 1))
+    os.utime(tmp_path / "new.json", (2, 2))
+    # Touch "old" so "new" becomes the least recently used entry
+    assert cache.get("old") is not None
+
+    cache.max_bytes = entry_size * 2
+    cache.put("third", [(0.0, 1.0, "c")])
+    assert cache.get("new") is None
+    assert cache.get("old") is not None
+    assert cache.get("third") is not None
+
+
+def test_purge(tmp_path):
+    cache = TranscriptCache(tmp_path)
+    cache.put("a", [])
+    cache.put("b", [])
+    assert cache.purge() == 2
+    assert cache.get("a") is None
+
+
+def test_transcribe_uses_cache(monkeypatch, tmp_path):
+    cache = TranscriptCache(tmp_path)
+    monkeypatch.setattr(whisper_wrapper, "audio_fingerprint", lambda p: "hash")
+    key = cache.make_key(
+        "hash",
+        model_size="base",
+        beam_size=whisper_wrapper.BEAM_SIZE,
+        max_words=whisper_wrapper.MAX_WORDS,
+    )
+    cache.put(key, [(0.5, 1.0, "cached")])
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Whisper should not run on a cache hit")
+
+    monkeypatch.setattr(whisper_wrapper, "WhisperModel", fail)
+    cues = whisper_wrapper.transcribe(tmp_path / "top.mp4", cache=cache)
+    assert cues == [(0.5, 1.0, "cached")]
@@ -0,0 +1,47 @@
+import time
+
+import pytest
+
+from core.cancel import CancelToken, Cancelled, StageTimeout, stage_token
+
+
+def test_cancel_runs_callbacks_once():
+    token = CancelToken()
+    calls = []
+    token.add_callback(lambda: calls.append(1))
+    remove = token.add_callback(lambda: calls.append(2))
+    remove()
+    token.cancel()
+    token.cancel()
+    assert calls == [1]
+    with pytest.raises(Cancelled):
+        token.raise_if_cancelled()
+    # Late callbacks fire immediately
+    token.add_callback(lambda: calls.append(3))
+    assert calls == [1, 3]
+
+
+def test_child_follows_parent_and_detaches():
+    parent = CancelToken()
+    with parent.child() as child:
+        parent.cancel()
+        assert child.cancelled
+        with pytest.raises(Cancelled):
+            child.raise_if_cancelled()
+
+    parent = CancelToken()
+    with parent.child() as child:
+        pass
+    parent.cancel()
+    assert not child.cancelled
+
+
+def test_stage_timeout_fires():
+    with stage_token(None, {"encode": 0.05}, "encode") as token:
+        assert token.wait(timeout=5)
+        with pytest.raises(StageTimeout, match="encode timed out"):
+            token.raise_if_cancelled()
+
+    with stage_token(None, {"encode": 0.05}, "transcribe") as token:
+        time.sleep(0.1)
+        assert not token.cancelled
@@ -1,3 +1,4 @@
+import io
 import types
 import subprocess
 from pathlib import Path
@@ -16,12 +17,23 @@ sys.modules.setdefault('faster_whisper', stub)
 import core.ffmpeg_handler as ffmpeg_handler
 
 
-class DummyCompleted:
-    def __init__(self):
-        self.stderr = b""
+def fake_popen(calls, stdout="", returncode=0, stderr=""):
+    """Return a ``subprocess.Popen`` stand-in that records ffmpeg commands."""
 
+    class FakePopen:
+        def __init__(self, cmd, stdout=None, stderr=None, **kwargs):
+            calls.append(cmd)
+            self.stdout = io.StringIO(out)
+            self.stderr = io.StringIO(err)
 
-def test_build_stack_fallback(monkeypatch, tmp_path):
+        def wait(self):
+            return returncode
+
+    out, err = stdout, stderr
+    return FakePopen
+
+
+def test_build_stack_single_pass(monkeypatch, tmp_path):
     top = tmp_path / "top.mp4"
     bottom = tmp_path / "bottom.mp4"
     sub = tmp_path / "sub.ass"
@@ -31,33 +43,91 @@ def test_build_stack_fallback(monkeypatch, tmp_path):
 
     calls = []
 
-    def fake_run(cmd, check=True, stderr=None):
+    monkeypatch.setattr(ffmpeg_handler, "probe_media", lambda p: types.SimpleNamespace(duration=1.0))
+    monkeypatch.setattr(ffmpeg_handler, "detect_encoder", lambda: "libx264")
+    monkeypatch.setattr(subprocess, "Popen", fake_popen(calls))
+
+    ffmpeg_handler.build_stack(top, bottom, sub, out, preset="veryfast", crf=20)
+
+    assert len(calls) == 1, "Encoding should run exactly once"
+    cmd = calls[0]
+    assert cmd[cmd.index("-c:v") + 1] == "libx264"
+    assert cmd[cmd.index("-preset") + 1] == "veryfast"
+    assert cmd[cmd.index("-crf") + 1] == "20"
+    assert "h264_nvenc" not in cmd
+
+
+def test_build_stack_encoder_override(monkeypatch, tmp_path):
+    calls = []
+
+    def no_detect():
+        raise AssertionError("Explicit encoder should skip detection")
+
+    monkeypatch.setattr(ffmpeg_handler, "probe_media", lambda p: types.SimpleNamespace(duration=1.0))
+    monkeypatch.setattr(ffmpeg_handler, "detect_encoder", no_detect)
+    monkeypatch.setattr(subprocess, "Popen", fake_popen(calls))
+
+    ffmpeg_handler.build_stack(
+        Path("top.mp4"), Path("bottom.mp4"), Path("sub.ass"), Path("out.mp4"),
+        encoder="h264_nvenc", crf=23,
+    )
+    cmd = calls[0]
+    assert cmd[cmd.index("-c:v") + 1] == "h264_nvenc"
+    assert cmd[cmd.index("-cq") + 1] == "23"
+
+
+def test_build_stack_failure_raises(monkeypatch):
+    monkeypatch.setattr(ffmpeg_handler, "probe_media", lambda p: types.SimpleNamespace(duration=1.0))
+    monkeypatch.setattr(subprocess, "Popen", fake_popen([], returncode=1, stderr="fail\n"))
+
+    with pytest.raises(RuntimeError):
+        ffmpeg_handler.build_stack(
+            Path("top.mp4"), Path("bottom.mp4"), Path("sub.ass"), Path("out.mp4"),
+            encoder="libx264",
+        )
+
+
+ENCODERS_OUTPUT = """Encoders:
+ V..... = Video
+ ------
+ V....D libx264              libx264 H.264 / AVC / MPEG-4 AVC (codec h264)
+ V....D h264_nvenc           NVIDIA NVENC H.264 encoder (codec h264)
+ A....D aac                  AAC (Advanced Audio Coding)
+"""
+
+
+def test_detect_encoder_probes_once(monkeypatch, tmp_path):
+    import core.host_profile as host_profile
+
+    monkeypatch.setattr(host_profile, "PROFILE_PATH", tmp_path / "host.json")
+    calls = []
+
+    def fake_run(cmd, **kwargs):
         calls.append(cmd)
-        if any("h264_nvenc" in arg for arg in cmd):
-            raise subprocess.CalledProcessError(returncode=1, cmd=cmd, stderr=b"fail")
-        return DummyCompleted()
+        if "-encoders" in cmd:
+            return subprocess.CompletedProcess(cmd, 0, stdout=ENCODERS_OUTPUT, stderr="")
+        if "h264_nvenc" in cmd:
+            # GPU-less host: NVENC is compiled in but cannot open a device
+            raise subprocess.CalledProcessError(1, cmd, stderr=b"no device")
+        return subprocess.CompletedProcess(cmd, 0)
 
-    monkeypatch.setattr(ffmpeg_handler, "probe_duration", lambda p: 1.0)
     monkeypatch.setattr(subprocess, "run", fake_run)
 
-    ffmpeg_handler.build_stack(top, bottom, sub, out)
-
-    assert any("h264_nvenc" in c for c in calls[0]), "First attempt should use NVENC"
-    assert any("libx264" in c for c in calls[1]), "Fallback should use libx264"
+    assert ffmpeg_handler.list_encoders() >= {"libx264", "h264_nvenc", "aac"}
+    calls.clear()
+    assert ffmpeg_handler.detect_encoder() == "libx264"
+    probes = len(calls)
+    assert probes > 0
+    assert ffmpeg_handler.detect_encoder() == "libx264"
+    assert len(calls) == probes, "Second call should use the cached host profile"
 
 
 def test_subtitle_path_escaping(monkeypatch):
-    captured = {}
-
-    def fake_run(cmd, check, stderr):
-        captured['cmd'] = cmd
-        class Result:
-            returncode = 0
-            stderr = b''
-        return Result()
+    calls = []
 
-    monkeypatch.setattr(ffmpeg_handler, 'probe_duration', lambda _: 1)
-    monkeypatch.setattr(subprocess, 'run', fake_run)
+    monkeypatch.setattr(ffmpeg_handler, 'probe_media', lambda _: types.SimpleNamespace(duration=1))
+    monkeypatch.setattr(ffmpeg_handler, 'detect_encoder', lambda: 'libx264')
+    monkeypatch.setattr(subprocess, 'Popen', fake_popen(calls))
 
     top = Path('top.mp4')
     bottom = Path('bottom.mp4')
@@ -66,5 +136,158 @@ def test_subtitle_path_escaping(monkeypatch):
 
     ffmpeg_handler.build_stack(top, bottom, subtitle, out)
 
-    cmd_str = ' '.join(captured['cmd'])
+    cmd_str = ' '.join(calls[0])
     assert "te\\'st.ass" in cmd_str, "Subtitle path should be properly escaped for ffmpeg"
+
+
+def test_segment_bounds_are_gop_aligned():
+    bounds = ffmpeg_handler.segment_bounds(10.0, 30.0, 4, 60)
+    # 300 frames / 4 = 75, rounded up to the 60-frame GOP -> 120
+    assert bounds == [(0.0, 4.0), (4.0, 4.0), (8.0, 2.0)]
+    assert ffmpeg_handler.segment_bounds(1.0, 30.0, 1, 60) == [(0.0, 1.0)]
+
+
+def test_build_stack_segments_concat_without_reencode(monkeypatch, tmp_path):
+    calls = []
+    listings = []
+    popen = fake_popen(calls)
+
+    def recording_popen(cmd, **kwargs):
+        if "concat" in cmd:
+            listings.append(Path(cmd[cmd.index("-i") + 1]).read_text())
+        return popen(cmd, **kwargs)
+
+    def fake_probe(path):
+        if path.name == "bottom.mp4":
+            return types.SimpleNamespace(duration=3.0, fps=30.0)
+        return types.SimpleNamespace(duration=10.0, fps=30.0)
+
+    monkeypatch.setattr(ffmpeg_handler, "probe_media", fake_probe)
+    monkeypatch.setattr(ffmpeg_handler, "find_bottom_asset", lambda *a: None)
+    monkeypatch.setattr(subprocess, "Popen", recording_popen)
+
+    ffmpeg_handler.build_stack(
+        Path("top.mp4"), Path("bottom.mp4"), Path("sub.ass"), tmp_path / "out.mp4",
+        encoder="libx264", segments=4,
+    )
+
+    *parts, concat = calls
+    assert len(parts) == 3
+    assert listings[0].count("file ") == 3
+    starts = sorted(float(cmd[cmd.index("-ss") + 1]) for cmd in parts)
+    assert starts == [0.0, 4.0, 8.0]
+    for cmd in parts:
+        assert "-an" in cmd
+        assert cmd[cmd.index("-g") + 1] == "60"
+        graph = cmd[cmd.index("-filter_complex") + 1]
+        start = float(cmd[cmd.index("-ss") + 1])
+        # Subtitles see the original timeline; the bottom loop resumes in place
+        assert f"setpts=PTS-STARTPTS+{start}/TB" in graph
+        bottom_ss = cmd[cmd.index("-ss", cmd.index("-ss") + 1) + 1]
+        assert float(bottom_ss) == start % 3.0
+    assert concat[concat.index("-c:v") + 1] == "copy"
+    assert concat[-1] == str(tmp_path / "out.mp4")
+
+
+PROGRESS_OUTPUT = (
+    "frame=30\nfps=60.0\nout_time_us=1000000\nspeed=2.0x\nprogress=continue\n"
+    "frame=120\nfps=60.0\nout_time_us=4000000\nspeed=2.0x\nprogress=end\n"
+)
+
+
+def test_build_stack_reports_live_progress(monkeypatch):
+    calls = []
+    events = []
+
+    monkeypatch.setattr(ffmpeg_handler, "probe_media", lambda p: types.SimpleNamespace(duration=4.0))
+    monkeypatch.setattr(subprocess, "Popen", fake_popen(calls, stdout=PROGRESS_OUTPUT))
+
+    ffmpeg_handler.build_stack(
+        Path("top.mp4"), Path("bottom.mp4"), Path("sub.ass"), Path("out.mp4"),
+        encoder="libx264", progress=events.append,
+    )
+
+    cmd = calls[0]
+    assert cmd[cmd.index("-progress") + 1] == "pipe:1"
+    assert [e.percent for e in events] == [25.0, 100.0]
+    assert events[0].eta == 1.5 and events[0].speed == 2.0 and events[0].fps == 60.0
+    assert events[0] == "Encoding... 25% (ETA 0:02)"
+
+
+def test_failed_run_keeps_only_stderr_tail(monkeypatch, caplog):
+    stderr = "".join(f"line {i}\n" for i in range(1000))
+    monkeypatch.setattr(subprocess, "Popen", fake_popen([], returncode=1, stderr=stderr))
+
+    with pytest.raises(RuntimeError):
+        ffmpeg_handler._run_ffmpeg(["ffmpeg", "-i", "x.mp4", "out.mp4"])
+    assert "line 999" in caplog.text
+    assert "line 0\n" not in caplog.text
+
+
+def test_cancel_terminates_ffmpeg(monkeypatch):
+    import threading
+    from core.cancel import CancelToken, Cancelled
+
+    killed = threading.Event()
+
+    class HangingPopen:
+        def __init__(self, cmd, **kwargs):
+            assert kwargs.get("start_new_session") or kwargs.get("creationflags")
+            self.stderr = io.StringIO("")
+
+        @property
+        def stdout(self):
+            killed.wait(timeout=5)
+            return io.StringIO("")
+
+        def wait(self):
+            return -15
+
+    monkeypatch.setattr(subprocess, "Popen", HangingPopen)
+    monkeypatch.setattr(ffmpeg_handler, "_terminate", lambda proc: killed.set())
+
+    token = CancelToken()
+    threading.Timer(0.05, token.cancel).start()
+    with pytest.raises(Cancelled):
+        ffmpeg_handler._run_ffmpeg(["ffmpeg", "-i", "x.mp4", "out.mp4"], cancel=token)
+    assert killed.is_set()
+
+
+def test_build_variants_single_process(monkeypatch, tmp_path):
+    from core.variants import parse_variant
+
+    calls = []
+    monkeypatch.setattr(ffmpeg_handler, "probe_media", lambda p: types.SimpleNamespace(duration=5.0))
+    monkeypatch.setattr(ffmpeg_handler, "detect_encoder", lambda: "libx264")
+    monkeypatch.setattr(subprocess, "Popen", fake_popen(calls))
+    variants = [
+        parse_variant("1080x1920:bitrate=8M"),
+        parse_variant("720x1280:container=webm:name=web"),
+    ]
+    outputs = [(v, v.output_path(tmp_path / "out.mp4")) for v in variants]
+
+    ffmpeg_handler.build_variants(
+        Path("top.mp4"), Path("bottom.mp4"), Path("sub.ass"), outputs, preset="veryfast", crf=28
+    )
+
+    assert len(calls) == 1
+    cmd = calls[0]
+    assert cmd.count("-i") == 2, "Inputs are decoded once"
+    graph = cmd[cmd.index("-filter_complex") + 1]
+    assert "[0:v]split=2[t0][t1]" in graph and "asplit=2[a0][a1]" in graph
+    assert "scale=1080:-2,crop=1080:960" in graph and "scale=720:-2,crop=720:640" in graph
+    first = cmd.index(str(tmp_path / "out_1080x1920.mp4"))
+    second = cmd.index(str(tmp_path / "out_web.webm"))
+    mp4_args, webm_args = cmd[:first], cmd[first:second]
+    assert mp4_args[mp4_args.index("-maxrate") + 1] == "8M"
+    assert "+faststart" in mp4_args
+    assert webm_args[webm_args.index("-c:v") + 1] == "libvpx-vp9"
+    assert webm_args[webm_args.index("-c:a") + 1] == "libopus"
+    assert "-movflags" not in webm_args
+    # x264 presets are translated for libvpx, and its CRF needs a zero target bitrate
+    assert mp4_args[mp4_args.index("-preset") + 1] == "veryfast"
+    assert mp4_args[mp4_args.index("-b:v") + 1] == "8M"
+    assert "-preset" not in webm_args
+    assert webm_args[webm_args.index("-cpu-used") + 1] == "5"
+    assert webm_args[webm_args.index("-crf") + 1] == "28"
+    assert webm_args[webm_args.index("-b:v") + 1] == "0"
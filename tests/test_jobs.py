@@ -0,0 +1,120 @@
+import threading
+
+from core.jobs import JobManager
+
+
+def test_jobs_run_and_report():
+    updates = []
+
+    def runner(progress, top, bottom, **kwargs):
+        progress("Encoding...")
+        if top == "bad.mp4":
+            raise RuntimeError("boom")
+        return "out.mp4"
+
+    manager = JobManager(1, runner=runner, on_update=lambda j: updates.append(j.status))
+    ok = manager.submit({"top": "a.mp4", "bottom": "b.mp4"})
+    bad = manager.submit({"top": "bad.mp4", "bottom": "b.mp4"})
+    bad.future.result(timeout=5)
+    manager.shutdown()
+
+    assert ok.status == "done" and ok.output == "out.mp4"
+    assert ok.message == "Encoding..."
+    assert bad.status == "failed" and bad.error == "boom"
+    assert [j.id for j in manager.list()] == [ok.id, bad.id]
+    assert "running" in updates
+
+
+def test_cancel_queued_job():
+    release = threading.Event()
+    started = threading.Event()
+
+    def runner(progress, **kwargs):
+        started.set()
+        release.wait(timeout=5)
+        return "out.mp4"
+
+    manager = JobManager(1, runner=runner)
+    running = manager.submit({"top": "a.mp4", "bottom": "b.mp4"})
+    queued = manager.submit({"top": "c.mp4", "bottom": "b.mp4"})
+    started.wait(timeout=5)
+
+    assert manager.cancel(queued.id)
+    assert queued.status == "cancelled"
+    pending = manager.submit({"top": "d.mp4", "bottom": "b.mp4"})
+    manager.shutdown(wait=False)
+    assert pending.status == "cancelled", "Shutdown drops queued jobs"
+    release.set()
+    running.future.result(timeout=5)
+    assert running.status == "done"
+
+
+def test_job_exposes_structured_progress():
+    from core.progress import ProgressEvent
+
+    def runner(progress, **kwargs):
+        progress(ProgressEvent("Encoding... 40%", stage="encoding", percent=40.0, eta=9.0))
+        return "out.mp4"
+
+    manager = JobManager(1, runner=runner)
+    job = manager.submit({"top": "a.mp4", "bottom": "b.mp4"})
+    job.future.result(timeout=5)
+    manager.shutdown()
+
+    data = job.to_dict()
+    assert data["message"] == "Encoding... 40%"
+    assert data["percent"] == 40.0 and data["eta"] == 9.0
+
+
+def test_cancel_running_job_uses_token():
+    started = threading.Event()
+
+    def runner(progress, cancel, **kwargs):
+        started.set()
+        assert cancel.wait(timeout=5)
+        cancel.raise_if_cancelled()
+
+    manager = JobManager(1, runner=runner)
+    job = manager.submit({"top": "a.mp4", "bottom": "b.mp4"})
+    started.wait(timeout=5)
+    assert manager.cancel(job.id)
+    job.future.result(timeout=5)
+    manager.shutdown()
+    assert job.status == "cancelled"
+    assert not manager.cancel(job.id), "Finished jobs cannot be cancelled"
+
+
+def test_default_timeouts_reach_runner():
+    seen = {}
+
+    def runner(progress, cancel, timeouts=None, **kwargs):
+        seen["timeouts"] = timeouts
+        return "out.mp4"
+
+    manager = JobManager(1, runner=runner, timeouts={"encode": 60.0})
+    manager.submit({"top": "a.mp4", "bottom": "b.mp4"}).future.result(timeout=5)
+    manager.shutdown()
+    assert seen["timeouts"] == {"encode": 60.0}
+
+
+def test_retry_failed_job_and_prune():
+    attempts = []
+
+    def runner(progress, top, **kwargs):
+        attempts.append(top)
+        if len(attempts) == 1:
+            raise RuntimeError("flaky")
+        return "out.mp4"
+
+    manager = JobManager(1, runner=runner)
+    job = manager.submit({"top": "a.mp4", "bottom": "b.mp4"})
+    job.future.result(timeout=5)
+    assert job.status == "failed" and job.done
+    assert manager.retry(job.id)
+    job.future.result(timeout=5)
+    manager.shutdown()
+
+    assert job.status == "done" and job.error == "" and job.output == "out.mp4"
+    assert attempts == ["a.mp4", "a.mp4"]
+    assert not manager.retry(job.id), "Only failed or cancelled jobs are retried"
+    assert manager.prune() == 1 and manager.list() == []
@@ -0,0 +1,70 @@
+import subprocess
+
+from core import loudness
+from core.cache import TranscriptCache
+
+
+FFMPEG_STDERR = """[Parsed_loudnorm_0 @ 0x55d] 
+{
+	"input_i" : "-27.61",
+	"input_tp" : "-4.47",
+	"input_lra" : "18.06",
+	"input_thresh" : "-39.20",
+	"output_i" : "-24.01",
+	"output_tp" : "-2.00",
+	"output_lra" : "7.00",
+	"output_thresh" : "-34.67",
+	"normalization_type" : "dynamic",
+	"target_offset" : "0.01"
+}
+"""
+
+
+def test_measure_loudness_parses_summary(monkeypatch, tmp_path):
+    def fake_run(cmd, **kwargs):
+        assert any(a.startswith("loudnorm=") and "print_format=json" in a for a in cmd)
+        return subprocess.CompletedProcess(cmd, 0, stderr=FFMPEG_STDERR)
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+    measured = loudness.measure_loudness(tmp_path / "top.mp4")
+    assert measured == {
+        "input_i": -27.61,
+        "input_tp": -4.47,
+        "input_lra": 18.06,
+        "input_thresh": -39.2,
+        "target_offset": 0.01,
+    }
+
+
+def test_analyze_loudness_cached(monkeypatch, tmp_path):
+    calls = []
+
+    def fake_measure(path):
+        calls.append(path)
+        return {"input_i": -20.0}
+
+    monkeypatch.setattr(loudness, "measure_loudness", fake_measure)
+    cache = TranscriptCache(tmp_path)
+    first = loudness.analyze_loudness(tmp_path / "a.mp4", audio_hash="h", cache=cache)
+    second = loudness.analyze_loudness(tmp_path / "b.mp4", audio_hash="h", cache=cache)
+    assert first == second == {"input_i": -20.0}
+    assert len(calls) == 1
+
+
+def test_analyze_loudness_failure_falls_back(monkeypatch, tmp_path):
+    def fail(path):
+        raise RuntimeError("no audio")
+
+    monkeypatch.setattr(loudness, "measure_loudness", fail)
+    assert loudness.analyze_loudness(tmp_path / "a.mp4") is None
+    assert loudness.loudnorm_filter(None) == "loudnorm=I=-24.0:LRA=7.0:TP=-2.0"
+
+
+def test_loudnorm_filter_linear():
+    measured = {
+        "input_i": -27.61, "input_tp": -4.47, "input_lra": 18.06,
+        "input_thresh": -39.2, "target_offset": 0.01,
+    }
+    af = loudness.loudnorm_filter(measured)
+    assert "measured_I=-27.61" in af and "offset=0.01" in af
+    assert af.endswith("linear=true")
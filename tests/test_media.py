@@ -0,0 +1,68 @@
+import json
+import os
+import subprocess
+
+import pytest
+
+from core import media
+
+
+def ffprobe_payload(**video):
+    stream = {"codec_type": "video", "codec_name": "h264", "width": 1080, "height": 1920,
+              "avg_frame_rate": "30/1"}
+    stream.update(video)
+    return {"format": {"format_name": "mov,mp4", "duration": "12.0"},
+            "streams": [stream, {"codec_type": "audio", "codec_name": "aac"}]}
+
+
+@pytest.fixture
+def ffprobe(monkeypatch):
+    calls = []
+    payload = {"data": ffprobe_payload()}
+
+    def fake_run(cmd, **kwargs):
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, stdout=json.dumps(payload["data"]), stderr="")
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+    monkeypatch.setattr(media, "_cache", media.OrderedDict())
+    return calls, payload
+
+
+def test_probe_media_fields(ffprobe, tmp_path):
+    f = tmp_path / "clip.mp4"
+    f.write_text("x")
+    info = media.probe_media(f)
+    assert info.duration == 12.0
+    assert (info.width, info.height, info.fps) == (1080, 1920, 30.0)
+    assert info.has_video and info.has_audio
+    assert info.video_codec == "h264" and info.audio_codec == "aac"
+    assert info.rotation == 0
+
+
+def test_probe_media_single_call_cached(ffprobe, tmp_path):
+    calls, payload = ffprobe
+    f = tmp_path / "clip.mp4"
+    f.write_text("x")
+    media.probe_media(f)
+    media.probe_media(f)
+    assert len(calls) == 1
+    assert "-show_streams" in calls[0] and "-show_format" in calls[0]
+
+    # A changed file is probed again
+    f.write_text("longer")
+    os.utime(f, ns=(1, 1))
+    media.probe_media(f)
+    assert len(calls) == 2
+
+
+def test_probe_media_rotation(ffprobe, tmp_path):
+    _, payload = ffprobe
+    payload["data"] = ffprobe_payload(
+        width=1920, height=1080, side_data_list=[{"rotation": -90}]
+    )
+    f = tmp_path / "phone.mp4"
+    f.write_text("x")
+    info = media.probe_media(f)
+    assert info.rotation == 90
+    assert info.display_size == (1080, 1920)
@@ -0,0 +1,75 @@
+import threading
+import time
+
+from core.model_pool import ModelPool, estimate_mb
+
+
+def make_loader(loads, delay=0.0):
+    def loader(model_size, device, compute_type):
+        time.sleep(delay)
+        loads.append((model_size, device, compute_type))
+        return object(), device
+
+    return loader
+
+
+def test_estimate_depends_on_size_and_compute_type():
+    assert estimate_mb("tiny", "cpu", "int8") < estimate_mb("base", "cpu", "int8")
+    assert estimate_mb("large-v3", "cuda", "int8_float16") < estimate_mb("large-v3", "cuda", "float16")
+    assert estimate_mb("small", "cpu", "default") == estimate_mb("small", "cpu", "float32")
+    assert estimate_mb("Systran/faster-whisper-medium.en", "cpu", "int8") == estimate_mb(
+        "medium", "cpu", "int8"
+    )
+
+
+def test_models_are_reused_per_key():
+    loads = []
+    pool = ModelPool(make_loader(loads))
+    with pool.checkout("base", "cpu") as first:
+        pass
+    with pool.checkout("base", "cpu") as second:
+        pass
+    with pool.checkout("base", "cpu", "int8") as third:
+        pass
+    assert first is second and third is not first
+    assert loads == [("base", "cpu", "default"), ("base", "cpu", "int8")]
+
+
+def test_least_recently_used_idle_model_is_evicted():
+    loads = []
+    budget = estimate_mb("small", "cpu", "int8") + estimate_mb("base", "cpu", "int8")
+    pool = ModelPool(make_loader(loads), budget_mb=budget)
+    pool.preload("small", "cpu", "int8")
+    pool.preload("tiny", "cpu", "int8")
+    pool.preload("small", "cpu", "int8")  # now tiny is least recently used
+    pool.preload("base", "cpu", "int8")
+
+    assert [m["model"] for m in pool.stats()] == ["small", "base"]
+    assert pool.resident_mb() <= budget
+
+
+def test_models_in_use_are_not_evicted():
+    pool = ModelPool(make_loader([]), budget_mb=1)
+    with pool.checkout("tiny", "cpu"):
+        with pool.checkout("base", "cpu"):
+            assert {m["model"] for m in pool.stats()} == {"tiny", "base"}
+        assert [m["model"] for m in pool.stats()] == ["tiny"]
+    assert pool.stats() == []
+
+
+def test_concurrent_checkouts_load_once():
+    loads = []
+    pool = ModelPool(make_loader(loads, delay=0.05))
+    models = []
+
+    def use():
+        with pool.checkout("base", "cpu") as model:
+            models.append(model)
+
+    threads = [threading.Thread(target=use) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(loads) == 1
+    assert len({id(m) for m in models}) == 1
@@ -0,0 +1,34 @@
+from core.parallel_transcribe import plan_chunks, stitch_words
+
+
+def speech(*regions):
+    return [{"start": s, "end": e} for s, e in regions]
+
+
+def test_plan_chunks_cuts_in_silences():
+    regions = speech((0, 40), (50, 90), (100, 140), (150, 190))
+    bounds = plan_chunks(regions, 200, max_len=100)
+    assert bounds == [(0, 95), (95, 145), (145, 200)]
+    # Chunks tile the whole timeline without gaps
+    assert bounds[0][0] == 0 and bounds[-1][1] == 200
+    assert all(a[1] == b[0] for a, b in zip(bounds, bounds[1:]))
+
+
+def test_plan_chunks_respects_max_len_when_possible():
+    regions = speech(*[(i * 10, i * 10 + 8) for i in range(30)])
+    bounds = plan_chunks(regions, 300, max_len=50)
+    assert len(bounds) > 1
+    assert all(end - start <= 50 for start, end in bounds)
+
+
+def test_plan_chunks_without_speech_is_single_chunk():
+    assert plan_chunks([], 1000, max_len=100) == [(0, 1000)]
+    assert plan_chunks(speech((0, 900)), 1000, max_len=100) == [(0, 1000)]
+
+
+def test_stitch_words_drops_edge_duplicates():
+    chunk_a = [(0.0, 0.5, " hello"), (0.5, 1.0, " world")]
+    chunk_b = [(0.9, 1.0, " world"), (1.2, 1.6, " again")]
+    chunk_c = [(1.1, 1.5, " late")]  # entirely inside the previous word
+    words = list(stitch_words([chunk_a, chunk_b, chunk_c]))
+    assert [w[2] for w in words] == [" hello", " world", " again"]
@@ -0,0 +1,59 @@
+import json
+import time
+
+import pytest
+
+from core.profiling import Profiler, profile, span
+
+
+def test_span_is_noop_without_profiler():
+    with span("encode", media=10.0) as record:
+        assert record is None
+
+
+def test_span_records_wall_and_realtime_factor():
+    with profile() as profiler:
+        with span("encode", media=1.0, encoder="libx264") as record:
+            time.sleep(0.05)
+            record.args["note"] = "x"
+
+    [record] = profiler.spans
+    data = record.to_dict()
+    assert data["name"] == "encode"
+    assert data["wall"] >= 0.05
+    assert data["realtime_factor"] == pytest.approx(1.0 / record.wall)
+    assert data["encoder"] == "libx264" and data["note"] == "x"
+    assert data["cpu"] >= 0
+
+
+def test_span_marks_errors_and_profile_restores_previous():
+    outer = Profiler()
+    with profile(outer):
+        with profile() as inner:
+            with pytest.raises(ValueError):
+                with span("probe"):
+                    raise ValueError("bad")
+        with span("decode"):
+            pass
+
+    assert [r.name for r in inner.spans] == ["probe"]
+    assert inner.spans[0].args["error"] == "ValueError"
+    assert [r.name for r in outer.spans] == ["decode"]
+    assert outer.summary()["decode"]["count"] == 1
+
+
+def test_write_jsonl_and_chrome_trace(tmp_path):
+    with profile() as profiler:
+        with span("transcribe", media=2.0):
+            pass
+        with span("encode"):
+            pass
+
+    lines = profiler.write(tmp_path / "run.jsonl").read_text().splitlines()
+    assert [json.loads(line)["name"] for line in lines] == ["transcribe", "encode"]
+
+    trace = json.loads(profiler.write(tmp_path / "run.json").read_text())
+    spans = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+    assert {e["name"] for e in spans} == {"transcribe", "encode"}
+    assert all(isinstance(e["ts"], int) and e["dur"] >= 0 for e in spans)
+    assert any(e["ph"] == "M" for e in trace["traceEvents"])
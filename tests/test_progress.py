@@ -0,0 +1,53 @@
+import pytest
+
+from core.progress import (
+    ProgressEvent,
+    ProgressThrottle,
+    ProgressTracker,
+    format_eta,
+    parse_progress,
+)
+
+
+def test_progress_event_is_a_string():
+    event = ProgressEvent("Encoding... 50%", stage="encoding", percent=50.0, eta=12.0)
+    assert event == "Encoding... 50%"
+    assert event.to_dict()["eta"] == 12.0
+
+
+def test_parse_progress_handles_missing_values():
+    assert parse_progress({"out_time_us": "N/A", "fps": "0.00", "speed": "N/A"}) == (None, 0.0, None)
+    assert parse_progress({"out_time_ms": "2500000", "speed": "1.5x"}) == (2.5, None, 1.5)
+
+
+def test_format_eta():
+    assert format_eta(65) == "1:05"
+    assert format_eta(3725) == "1:02:05"
+
+
+def test_tracker_sums_parallel_parts():
+    events = []
+    tracker = ProgressTracker(10.0, events.append, parts=2)
+    tracker.update({"out_time_us": "2000000", "progress": "continue"}, part=0)
+    tracker.update({"out_time_us": "3000000", "progress": "continue"}, part=1)
+    assert events[-1].percent == pytest.approx(50.0)
+    assert events[-1].speed is None
+
+
+def test_progress_throttle_coalesces_and_limits_rate():
+    now = [100.0]
+    throttle = ProgressThrottle(20, clock=lambda: now[0])
+
+    assert throttle.push("Encoding... 1%")
+    assert not throttle.push("Encoding... 2%"), "One wake-up per burst"
+    assert not throttle.push("queued", key="job-b")
+    assert throttle.delay() == 0.0
+    assert throttle.take() == {None: "Encoding... 2%", "job-b": "queued"}
+    assert throttle.take() == {}
+
+    assert throttle.push("Encoding... 3%")
+    assert throttle.delay() == pytest.approx(0.05)
+    now[0] += 0.03
+    assert throttle.delay() == pytest.approx(0.02)
+    throttle.clear()
+    assert throttle.take() == {}
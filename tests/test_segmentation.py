@@ -0,0 +1,73 @@
+import pytest
+
+from core.segmentation import Segmenter, max_chars_for
+
+
+def words_from(text, step=0.3, gaps=None):
+    """Return back-to-back words of ``text``, with extra ``gaps`` before some indices."""
+    gaps = gaps or {}
+    words = []
+    t = 0.0
+    for index, word in enumerate(text.split()):
+        t += gaps.get(index, 0.0)
+        words.append((t, t + step, " " + word))
+        t += step
+    return words
+
+
+def texts(cues):
+    return [" ".join(w.strip() for w in cue[2].split()) for cue in cues]
+
+
+def test_max_chars_splits_before_overflowing_word():
+    words = words_from("aaaa bbbb cccc dddd")
+    cues = Segmenter(max_chars=10).cues(words)
+    assert texts(cues) == ["aaaa bbbb", "cccc dddd"]
+    # A word longer than the limit still gets a cue of its own
+    assert texts(Segmenter(max_chars=3).cues(words[:2])) == ["aaaa", "bbbb"]
+
+
+def test_duration_pause_and_punctuation():
+    words = words_from("one two three four five", step=1.0)
+    assert texts(Segmenter(max_duration=2.0).cues(words)) == ["one two", "three four", "five"]
+
+    words = words_from("one two three four", gaps={2: 0.9})
+    assert texts(Segmenter(min_pause=0.5).cues(words)) == ["one two", "three four"]
+
+    words = words_from("Hi. So, well then, yes")
+    assert texts(Segmenter(punctuation=True).cues(words)) == ["Hi.", "So, well then,", "yes"]
+
+
+def test_max_words_matches_fixed_grouping():
+    words = [(0, 1, " a"), (1, 2, " b"), (2, 3, " c"), (3, 4, " d")]
+    assert list(Segmenter(max_words=3).cues(words)) == [(0, 3, "a  b  c"), (3, 4, "d")]
+
+
+def test_split_streams():
+    def stream():
+        yield from words_from("a b")
+        raise AssertionError("Only read the words the first cue needs")
+
+    cues = Segmenter(max_words=1).cues(stream())
+    assert next(cues)[2] == "a"
+
+
+def test_from_style():
+    assert Segmenter.from_style({"FontSize": 36}, (1080, 960)) is None
+
+    segmenter = Segmenter.from_style({"CueMaxChars": "auto", "FontSize": 72}, (1080, 960))
+    assert segmenter.max_chars == max_chars_for(72, (1080, 960))
+    assert segmenter.punctuation and segmenter.min_pause == 0.6
+
+    segmenter = Segmenter.from_style(
+        {"CueMaxWords": "4", "CuePunctuation": "false", "CueMaxDuration": 0}, (1080, 960)
+    )
+    assert segmenter.max_words == 4 and not segmenter.punctuation
+    assert segmenter.max_duration is None
+    with pytest.raises(ValueError):
+        Segmenter.from_style({"CueMaxChars": "wide"}, (1080, 960))
+
+
+def test_max_chars_for_follows_font_size_and_frame_width():
+    assert max_chars_for(36, (1080, 960)) > max_chars_for(72, (1080, 960))
+    assert max_chars_for(36, (1080, 960)) > max_chars_for(36, (720, 960))
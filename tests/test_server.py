@@ -0,0 +1,85 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from core.jobs import JobManager
+from core.server import RenderServer, job_params
+
+
+def test_job_params_translation():
+    params = job_params(
+        {"top": "a.mp4", "bottom": "b.mp4", "model": "small", "resolution": "720x1280", "no_cache": True}
+    )
+    assert params == {
+        "top": "a.mp4",
+        "bottom": "b.mp4",
+        "model_size": "small",
+        "resolution": (720, 1280),
+        "use_cache": False,
+    }
+    with pytest.raises(ValueError):
+        job_params({"top": "a.mp4"})
+
+
+def test_job_params_variants():
+    params = job_params({"top": "a.mp4", "bottom": "b.mp4", "variants": ["720x1280:name=web"]})
+    assert [v.name for v in params["variants"]] == ["web"]
+    with pytest.raises(ValueError):
+        job_params({"top": "a.mp4", "bottom": "b.mp4", "variants": "720x1280"})
+    with pytest.raises(ValueError):
+        job_params({"top": "a.mp4", "bottom": "b.mp4", "variants": ["720x1280:foo=1"]})
+
+
+def test_job_params_karaoke():
+    assert job_params({"top": "a.mp4", "bottom": "b.mp4", "karaoke": "kf"})["karaoke"] == "kf"
+    with pytest.raises(ValueError):
+        job_params({"top": "a.mp4", "bottom": "b.mp4", "karaoke": "bounce"})
+
+
+@pytest.fixture
+def server():
+    manager = JobManager(1, runner=lambda progress, **kw: kw.get("output_path", "out.mp4"))
+    httpd = RenderServer(("127.0.0.1", 0), manager)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}", manager
+    httpd.shutdown()
+    httpd.server_close()
+    manager.shutdown()
+
+
+def request(method, url, body=None):
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(url, data=data, method=method)
+    try:
+        with urllib.request.urlopen(req, timeout=5) as resp:
+            return resp.status, json.loads(resp.read())
+    except urllib.error.HTTPError as exc:
+        return exc.code, json.loads(exc.read())
+
+
+def test_submit_status_list(server):
+    base, manager = server
+    status, job = request("POST", base + "/jobs", {"top": "a.mp4", "bottom": "b.mp4", "output": "x.mp4"})
+    assert status == 201
+    manager.get(job["id"]).future.result(timeout=5)
+
+    status, info = request("GET", f"{base}/jobs/{job['id']}")
+    assert status == 200
+    assert info["status"] == "done" and info["output"] == "x.mp4"
+
+    status, jobs = request("GET", base + "/jobs")
+    assert [j["id"] for j in jobs] == [job["id"]]
+
+
+def test_errors(server):
+    base, _ = server
+    assert request("POST", base + "/jobs", {"top": "a.mp4"})[0] == 400
+    for body in ([], "x", 1):
+        status, error = request("POST", base + "/jobs", body)
+        assert status == 400 and error == {"error": "job body must be a JSON object"}
+    assert request("GET", base + "/jobs/nope")[0] == 404
+    assert request("DELETE", base + "/jobs/nope")[0] == 404
@@ -0,0 +1,82 @@
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+stub = types.ModuleType('faster_whisper')
+stub.WhisperModel = object
+sys.modules.setdefault('faster_whisper', stub)
+
+import core.shorts as shorts
+
+
+def test_preview_resolution_is_even():
+    assert shorts.preview_resolution((1080, 1920)) == (360, 640)
+    assert shorts.preview_resolution((720, 1280)) == (240, 426)
+
+
+def test_generate_preview_renders_window_from_cues(monkeypatch, tmp_path):
+    captured = {}
+
+    monkeypatch.setattr(
+        shorts, "validate_media", lambda path, **kw: types.SimpleNamespace(duration=30.0)
+    )
+    monkeypatch.setattr(
+        shorts,
+        "iter_cues",
+        lambda *a, **kw: iter([(1.0, 2.0, "early"), (12.0, 13.0, "inside"), (25.0, 26.0, "late")]),
+    )
+
+    def fake_build(top, bottom, subtitle, out, **kwargs):
+        captured["ass"] = Path(subtitle).read_text(encoding="utf-8")
+        captured.update(kwargs)
+
+    monkeypatch.setattr(shorts, "build_stack", fake_build)
+
+    out = shorts.generate_preview(
+        "top.mp4", "bottom.mp4", start=10.0, output_path=tmp_path / "p.mp4"
+    )
+
+    assert out == tmp_path / "p.mp4"
+    assert captured["start"] == 10.0 and captured["duration"] == 10.0
+    assert captured["resolution"] == (360, 640)
+    assert captured["preset"] == "ultrafast" and captured["tune"] == "zerolatency"
+    assert "inside" in captured["ass"] and "early" not in captured["ass"]
+    assert "0:00:02.00" in captured["ass"], "Cues should be re-based to the window"
+
+
+def test_prepare_subtitles_reports_writer_progress(monkeypatch):
+    monkeypatch.setattr(shorts, "iter_cues", lambda *a, **kw: iter([(0.0, 1.0, "a"), (1.0, 2.0, "b")]))
+    messages = []
+    path = shorts.prepare_subtitles(
+        Path("top.mp4"), progress=messages.append, audio=bytearray(2 * shorts.SAMPLE_RATE)
+    )
+    path.unlink()
+    assert messages[-2:] == ["Writing subtitles... 50%", "Writing subtitles... 100%"]
+
+
+def test_generate_preview_applies_stage_timeouts(monkeypatch, tmp_path):
+    from core.cancel import StageTimeout
+
+    monkeypatch.setattr(
+        shorts, "validate_media", lambda path, **kw: types.SimpleNamespace(duration=30.0)
+    )
+
+    def slow_cues(*args, cancel=None, **kwargs):
+        assert cancel.wait(5), "The transcribe timeout should fire"
+        cancel.raise_if_cancelled()
+
+    monkeypatch.setattr(shorts, "iter_cues", slow_cues)
+    with pytest.raises(StageTimeout):
+        shorts.generate_preview(
+            "top.mp4", "bottom.mp4", output_path=tmp_path / "p.mp4", timeouts={"transcribe": 0.05}
+        )
+
+
+def test_generate_preview_rejects_start_past_end(monkeypatch):
+    monkeypatch.setattr(
+        shorts, "validate_media", lambda path, **kw: types.SimpleNamespace(duration=5.0)
+    )
+    with pytest.raises(ValueError):
+        shorts.generate_preview("top.mp4", "bottom.mp4", start=8.0)
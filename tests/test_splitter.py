@@ -0,0 +1,58 @@
+import pytest
+
+from core.splitter import plan_splits, rebase_words
+
+
+def speech(*sentences, gap=0.1, pause=1.0):
+    """Build words of 0.4 s each; sentences are separated by ``pause``."""
+    words = []
+    t = 0.0
+    for sentence in sentences:
+        for text in sentence.split():
+            words.append((t, t + 0.4, text))
+            t += 0.4 + gap
+        t += pause - gap
+    return words
+
+
+def test_short_clip_is_one_split():
+    words = speech("Hello there.", "How are you?")
+    assert plan_splits(words, 59.0) == [(0.0, words[-1][1] + 0.2)]
+
+
+def test_cuts_at_sentence_end_under_max():
+    words = speech("one two three four five six.", "seven eight nine ten.", "eleven twelve.")
+    splits = plan_splits(words, 6.0)
+    assert all(end - start <= 6.0 for start, end in splits)
+    # The first cut lands right after "six." instead of mid-sentence
+    first_end = splits[0][1]
+    six = next(w for w in words if w[2] == "six.")
+    assert six[1] <= first_end < six[1] + 1.0
+    # Every word belongs to exactly one short
+    covered = [w for start, end in splits for w in words if start <= w[0] < end]
+    assert covered == words
+
+
+def test_prefers_pause_without_punctuation():
+    words = speech("a b c d", "e f g h i j k l", gap=0.1, pause=1.0)
+    splits = plan_splits(words, 5.0, min_duration=1.0)
+    d = next(w for w in words if w[2] == "d")
+    assert d[1] <= splits[0][1] < d[1] + 1.0
+
+
+def test_overlong_word_stands_alone():
+    words = [(0.0, 10.0, "loooong"), (10.5, 11.0, "short")]
+    splits = plan_splits(words, 5.0)
+    assert len(splits) == 2
+
+
+def test_rejects_tiny_max():
+    with pytest.raises(ValueError):
+        plan_splits([(0.0, 1.0, "a")], 0.3)
+
+
+def test_rebase_words():
+    words = [(1.0, 1.5, "a"), (10.0, 10.5, "b"), (11.0, 11.4, "c"), (20.0, 20.5, "d")]
+    rebased = rebase_words(words, 9.8, 11.6)
+    assert [w[2] for w in rebased] == ["b", "c"]
+    assert [w[0] for w in rebased] == pytest.approx([0.2, 1.2])
@@ -0,0 +1,48 @@
+"""Guard CLI startup against heavy imports creeping back in."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+
+HEAVY = ("PySide6", "faster_whisper", "ctranslate2", "ui.mainwindow")
+
+# Generous ceiling for our own import work; catches e.g. an eager Qt import
+MAX_IMPORT_SECONDS = 0.5
+
+
+def import_profile(*args):
+    """Return ``{module: cumulative_us}`` from ``python -X importtime``."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=ROOT,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(cumulative)
+    return result, modules
+
+
+@pytest.mark.parametrize("flag", ["--version", "--help"])
+def test_info_flags_skip_heavy_imports(flag):
+    result, modules = import_profile("shortssplit.py", flag)
+    assert result.returncode == 0, result.stderr
+    loaded = [m for m in modules if m.split(".")[0] in HEAVY or m in HEAVY]
+    assert not loaded, f"{flag} imported {loaded}"
+
+
+def test_cli_module_import_skips_qt():
+    result, modules = import_profile("-c", "import shortssplit, core.shorts, core.batch")
+    assert result.returncode == 0, result.stderr
+    assert not [m for m in modules if m.split(".")[0] in HEAVY or m in HEAVY]
+    own = sum(us for name, us in modules.items() if name in ("shortssplit", "core.shorts", "core.batch"))
+    assert own / 1e6 < MAX_IMPORT_SECONDS, f"CLI imports took {own / 1e6:.3f}s"
@@ -3,7 +3,7 @@ from pathlib import Path
 
 import pytest
 
-from core.subtitle_utils import _format_time, save_ass, hex_to_ass
+from core.subtitle_utils import _format_time, save_ass, hex_to_ass, karaoke_text
 
 
 def test_format_time_zero():
@@ -21,3 +21,47 @@ def test_save_ass_creates_file(tmp_path):
 
 def test_hex_to_ass():
     assert hex_to_ass("#112233") == "&H00332211"
+
+
+def test_save_ass_streams_generator(tmp_path):
+    out = tmp_path / "out.ass"
+    seen = []
+
+    def cues():
+        yield (0.0, 1.0, "one")
+        # Earlier lines are already on disk while later cues are pending
+        seen.append(out.read_text(encoding="utf-8"))
+        yield (1.0, 2.0, "two")
+
+    messages = []
+    count = save_ass(cues(), out, duration=2.0, progress=messages.append)
+    assert count == 2
+    assert "[Events]" in seen[0]
+    assert out.read_text().count("Dialogue: 0") == 2
+    assert messages == ["Writing subtitles... 50%", "Writing subtitles... 100%"]
+
+
+def test_save_ass_partial_style(tmp_path):
+    out = tmp_path / "out.ass"
+    save_ass([], out, style={"FontName": "Impact"})
+    assert "Style: Default,Impact,36," in out.read_text()
+
+
+def test_karaoke_text_times_words_and_pauses():
+    words = [(1.0, 1.3, " Hello"), (1.5, 1.9, " big"), (1.9, 2.4, " world")]
+    assert karaoke_text(1.0, words) == r"{\kf30}Hello{\k20}{\kf40} big{\kf50} world"
+    # Durations add up to the Dialogue length on the centisecond grid
+    assert karaoke_text(0.004, [(0.004, 0.333, "a"), (0.333, 0.667, "b")], "k") == r"{\k33}a{\k34} b"
+
+
+def test_save_ass_karaoke_phrase(tmp_path):
+    out = tmp_path / "out.ass"
+    phrase = ((0.0, 0.5, " one"), (0.5, 1.0, " two"))
+    save_ass([(0.0, 1.0, phrase)], out, style={"PrimaryColour": "&H00112233"}, karaoke="k")
+    content = out.read_text()
+    # Words start in the text colour and turn the karaoke colour when sung
+    assert "Style: Default,Arial,36,&H0000FFFF,&H00112233," in content
+    assert content.count("Dialogue: 0") == 1
+    assert content.endswith(r"0:00:00.00,0:00:01.00,Default,,0,0,0,,{\k50}one{\k50} two")
+    with pytest.raises(ValueError):
+        save_ass([], out, karaoke="ko")
@@ -8,19 +8,49 @@ import pytest
 from core import utils
 
 
-def test_validate_media_ok(tmp_path):
+PROBE_OK = {
+    "format": {"format_name": "mov,mp4", "duration": "2.5"},
+    "streams": [
+        {"codec_type": "video", "codec_name": "h264", "width": 1920, "height": 1080,
+         "avg_frame_rate": "30000/1001"},
+        {"codec_type": "audio", "codec_name": "aac"},
+    ],
+}
+
+
+def fake_ffprobe(monkeypatch, payload=None, returncode=0):
+    def fake_run(cmd, **kwargs):
+        out = json.dumps(payload) if payload is not None else ""
+        return subprocess.CompletedProcess(cmd, returncode, stdout=out, stderr="Invalid data")
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+
+
+def test_validate_media_ok(monkeypatch, tmp_path):
     f = tmp_path / "video.mp4"
     f.write_text("dummy")
-    utils.validate_media(f)
+    fake_ffprobe(monkeypatch, PROBE_OK)
+    info = utils.validate_media(f, require_audio=True)
+    assert info.duration == 2.5
 
 
-def test_validate_media_bad_ext(tmp_path):
-    f = tmp_path / "video.txt"
+def test_validate_media_not_media(monkeypatch, tmp_path):
+    f = tmp_path / "video.mp4"
     f.write_text("dummy")
+    fake_ffprobe(monkeypatch, returncode=1)
     with pytest.raises(ValueError):
         utils.validate_media(f)
 
 
+def test_validate_media_requires_audio(monkeypatch, tmp_path):
+    f = tmp_path / "silent.mp4"
+    f.write_text("dummy")
+    fake_ffprobe(monkeypatch, {"format": {"duration": "1"}, "streams": [PROBE_OK["streams"][0]]})
+    utils.validate_media(f)
+    with pytest.raises(ValueError):
+        utils.validate_media(f, require_audio=True)
+
+
 def test_validate_media_missing(tmp_path):
     f = tmp_path / "missing.mp4"
     with pytest.raises(FileNotFoundError):
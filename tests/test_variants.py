@@ -0,0 +1,34 @@
+from pathlib import Path
+
+import pytest
+
+from core.variants import OutputProfile, parse_variant, variant_outputs
+
+
+def test_parse_variant_defaults_and_options():
+    plain = parse_variant("1080x1920")
+    assert plain.resolution == (1080, 1920)
+    assert plain.name == "1080x1920" and plain.container == "mp4"
+
+    web = parse_variant("720x1280:name=web:crf=28:bitrate=2M:container=webm")
+    assert (web.name, web.crf, web.bitrate, web.container) == ("web", 28, "2M", "webm")
+    assert web.resolve_encoder("h264_nvenc") == "libvpx-vp9"
+    assert plain.resolve_encoder("h264_nvenc") == "h264_nvenc"
+
+
+@pytest.mark.parametrize(
+    "spec", ["big", "720x1280:fps=30", "720x1280:crf=high", "720x1280:container=avi", "720x1280:name"]
+)
+def test_parse_variant_rejects_bad_specs(spec):
+    with pytest.raises(ValueError):
+        parse_variant(spec)
+
+
+def test_variant_outputs_are_named_after_base():
+    variants = [OutputProfile((1080, 1920)), OutputProfile((720, 1280), name="tiktok")]
+    assert variant_outputs(Path("/out/clip.mp4"), variants) == [
+        Path("/out/clip_1080x1920.mp4"),
+        Path("/out/clip_tiktok.mp4"),
+    ]
+    with pytest.raises(ValueError):
+        variant_outputs(Path("clip.mp4"), [OutputProfile((720, 1280))] * 2)
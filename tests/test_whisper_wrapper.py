@@ -0,0 +1,205 @@
+import sys
+import types
+
+# Provide dummy faster_whisper module so core.whisper_wrapper can be imported
+stub = types.ModuleType('faster_whisper')
+stub.WhisperModel = object
+sys.modules.setdefault('faster_whisper', stub)
+
+import core.whisper_wrapper as whisper_wrapper
+from core.cache import TranscriptCache
+from core.model_pool import ModelPool
+
+
+W = types.SimpleNamespace
+
+
+def make_model(segments, duration):
+    class FakeModel:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def transcribe(self, path, **kwargs):
+            return iter(segments), W(duration=duration)
+
+    return FakeModel
+
+
+SEGMENTS = [
+    W(end=2.0, words=[W(start=0.0, end=0.5, word=" a"), W(start=0.5, end=1.0, word=" b"),
+                      W(start=1.0, end=1.5, word=" c"), W(start=1.5, end=2.0, word=" d")]),
+    W(end=3.0, words=None),
+    W(end=4.0, words=[W(start=3.5, end=4.0, word=" e")]),
+]
+
+
+def test_group_words():
+    words = [(0, 1, "a"), (1, 2, "b"), (2, 3, "c"), (3, 4, "d")]
+    assert list(whisper_wrapper.group_words(words, 3)) == [(0, 3, "a b c"), (3, 4, "d")]
+
+
+def test_group_phrases_keeps_word_timing():
+    words = [(0.0, 0.4, " a"), (0.4, 0.8, " b"), (0.9, 1.2, " c"), (3.0, 3.5, " d")]
+    phrases = list(whisper_wrapper.group_phrases(words, max_words=6, max_gap=0.8))
+    assert phrases == [(0.0, 1.2, tuple(words[:3])), (3.0, 3.5, (words[3],))]
+    assert len(list(whisper_wrapper.group_phrases(words, max_words=2, max_gap=5))) == 2
+
+
+def test_iter_cues_karaoke_regroups_cached_words(monkeypatch, tmp_path):
+    monkeypatch.setattr(whisper_wrapper, "WhisperModel", make_model(SEGMENTS, 4.0))
+    monkeypatch.setattr(whisper_wrapper, "_pool", ModelPool(whisper_wrapper._create_model))
+    monkeypatch.setattr(whisper_wrapper, "audio_fingerprint", lambda p: "hash")
+    cache = TranscriptCache(tmp_path)
+    live = list(whisper_wrapper.iter_cues(tmp_path / "top.mp4", cache=cache, karaoke=True))
+    # The pause before "e" ends the first phrase
+    assert [len(cue[2]) for cue in live] == [4, 1]
+    assert live[0][:2] == (0.0, 2.0)
+
+    monkeypatch.setattr(whisper_wrapper, "_checkout_model", None)
+    cached = list(whisper_wrapper.iter_cues(tmp_path / "top.mp4", cache=cache, karaoke=True))
+    assert cached == live
+    # Static cues are still stored for the default mode
+    assert len(list(whisper_wrapper.iter_cues(tmp_path / "top.mp4", cache=cache))) == 2
+
+
+def test_iter_cues_streams_with_progress(monkeypatch, tmp_path):
+    monkeypatch.setattr(whisper_wrapper, "WhisperModel", make_model(SEGMENTS, 4.0))
+    monkeypatch.setattr(whisper_wrapper, "_pool", ModelPool(whisper_wrapper._create_model))
+    messages = []
+    gen = whisper_wrapper.iter_cues(
+        tmp_path / "top.mp4", use_cache=False, progress=messages.append
+    )
+    first = next(gen)
+    assert first == (0.0, 1.5, "a  b  c")
+    assert messages == ["Transcribing... 50%"]
+    rest = list(gen)
+    assert [c[2] for c in rest] == ["d  e"]
+    assert messages[-1] == "Transcribing... 100%"
+
+
+def test_iter_cues_fills_cache(monkeypatch, tmp_path):
+    monkeypatch.setattr(whisper_wrapper, "WhisperModel", make_model(SEGMENTS, 4.0))
+    monkeypatch.setattr(whisper_wrapper, "_pool", ModelPool(whisper_wrapper._create_model))
+    monkeypatch.setattr(whisper_wrapper, "audio_fingerprint", lambda p: "hash")
+    cache = TranscriptCache(tmp_path)
+    cues = whisper_wrapper.transcribe(tmp_path / "top.mp4", cache=cache)
+    assert len(cues) == 2
+    key = cache.make_key(
+        "hash",
+        model_size="base",
+        beam_size=whisper_wrapper.BEAM_SIZE,
+        max_words=whisper_wrapper.MAX_WORDS,
+    )
+    assert cache.get(key) == cues
+
+
+def test_transcribe_words_reuses_cached_transcript(monkeypatch, tmp_path):
+    monkeypatch.setattr(whisper_wrapper, "WhisperModel", make_model(SEGMENTS, 4.0))
+    monkeypatch.setattr(whisper_wrapper, "_pool", ModelPool(whisper_wrapper._create_model))
+    monkeypatch.setattr(whisper_wrapper, "audio_fingerprint", lambda p: "hash")
+    cache = TranscriptCache(tmp_path)
+    cues = whisper_wrapper.transcribe(tmp_path / "top.mp4", cache=cache)
+
+    def no_model(*args, **kwargs):
+        raise AssertionError("Words should come from the cache")
+
+    monkeypatch.setattr(whisper_wrapper, "_checkout_model", no_model)
+    words = whisper_wrapper.transcribe_words(tmp_path / "top.mp4", cache=cache)
+    assert [w[2] for w in words] == [" a", " b", " c", " d", " e"]
+    assert list(whisper_wrapper.group_words(words)) == cues
+
+
+def test_iter_cues_stops_between_segments(monkeypatch, tmp_path):
+    import pytest
+    from core.cancel import CancelToken, Cancelled
+
+    monkeypatch.setattr(whisper_wrapper, "WhisperModel", make_model(SEGMENTS, 4.0))
+    monkeypatch.setattr(whisper_wrapper, "_pool", ModelPool(whisper_wrapper._create_model))
+    token = CancelToken()
+    gen = whisper_wrapper.iter_cues(tmp_path / "top.mp4", use_cache=False, cancel=token)
+    next(gen)
+    token.cancel()
+    with pytest.raises(Cancelled):
+        list(gen)
+
+
+def fake_ctranslate2(cuda_devices=0, cpu_types=("int8", "float32")):
+    module = types.ModuleType("ctranslate2")
+    module.__version__ = "4.0.0"
+    module.get_cuda_device_count = lambda: cuda_devices
+    module.get_supported_compute_types = lambda device: (
+        set(cpu_types) if device == "cpu" else {"float16", "int8_float16", "float32"}
+    )
+    return module
+
+
+def test_inference_settings_pick_and_cache_per_host(monkeypatch, tmp_path):
+    from core import host_profile
+
+    monkeypatch.setattr(host_profile, "PROFILE_PATH", tmp_path / "host_profile.json")
+    monkeypatch.setitem(sys.modules, "ctranslate2", fake_ctranslate2())
+
+    settings = whisper_wrapper.inference_settings("auto")
+    assert settings["device"] == "cpu"
+    assert settings["compute_type"] == "int8"
+    assert settings["cpu_threads"] >= 1
+    assert host_profile.load_host_profile()["whisper"]["cpu"] == settings
+
+    # A cached pick is reused until ctranslate2 changes
+    monkeypatch.setitem(sys.modules, "ctranslate2", fake_ctranslate2(cpu_types=("float32",)))
+    assert whisper_wrapper.inference_settings("cpu")["compute_type"] == "int8"
+    assert whisper_wrapper.inference_settings("cpu", refresh=True)["compute_type"] == "float32"
+
+    monkeypatch.setitem(sys.modules, "ctranslate2", fake_ctranslate2(cuda_devices=1))
+    assert whisper_wrapper.resolve_inference("auto") == ("cuda", "float16")
+
+
+def test_resolve_inference_overrides(monkeypatch, tmp_path):
+    from core import host_profile
+
+    monkeypatch.setattr(host_profile, "PROFILE_PATH", tmp_path / "host_profile.json")
+    monkeypatch.setitem(sys.modules, "ctranslate2", fake_ctranslate2())
+    monkeypatch.delenv("WHISPER_DEVICE", raising=False)
+    monkeypatch.delenv("WHISPER_COMPUTE_TYPE", raising=False)
+
+    assert whisper_wrapper.resolve_inference("cpu:int8_float32") == ("cpu", "int8_float32")
+    assert whisper_wrapper.resolve_inference("cpu", "float32") == ("cpu", "float32")
+    monkeypatch.setenv("WHISPER_DEVICE", "cpu")
+    monkeypatch.setenv("WHISPER_COMPUTE_TYPE", "float32")
+    assert whisper_wrapper.resolve_inference("cuda", "int8") == ("cpu", "float32")
+
+
+def test_cache_key_follows_compute_type_overrides(monkeypatch, tmp_path):
+    from core import host_profile
+
+    monkeypatch.setattr(host_profile, "PROFILE_PATH", tmp_path / "host_profile.json")
+    monkeypatch.setitem(sys.modules, "ctranslate2", fake_ctranslate2(cpu_types=("int8", "float32")))
+    monkeypatch.delenv("WHISPER_DEVICE", raising=False)
+    monkeypatch.delenv("WHISPER_COMPUTE_TYPE", raising=False)
+    cache = TranscriptCache(tmp_path)
+
+    def key(device="cpu", compute_type="auto"):
+        return whisper_wrapper._cache_key(
+            cache, tmp_path / "top.mp4", "base", False, "hash", device, compute_type
+        )
+
+    auto = key()
+    assert key("cuda") != auto, "auto picks a different type per device"
+    assert key("cpu:float32") == key(compute_type="float32") != auto
+    monkeypatch.setenv("WHISPER_COMPUTE_TYPE", "float32")
+    assert key() == key("cuda:int8") == key("cpu:float32") != auto
+
+
+def test_cache_hit_does_not_import_ctranslate2(monkeypatch, tmp_path):
+    monkeypatch.setattr(whisper_wrapper, "WhisperModel", make_model(SEGMENTS, 4.0))
+    monkeypatch.setattr(whisper_wrapper, "_pool", ModelPool(whisper_wrapper._create_model))
+    monkeypatch.setattr(whisper_wrapper, "audio_fingerprint", lambda p: "hash")
+    cache = TranscriptCache(tmp_path)
+    cues = whisper_wrapper.transcribe(tmp_path / "top.mp4", "base", "cuda", cache=cache)
+
+    # None in sys.modules makes any import of ctranslate2 fail
+    monkeypatch.setitem(sys.modules, "ctranslate2", None)
+    monkeypatch.setattr(whisper_wrapper, "inference_settings", None)
+    assert whisper_wrapper.transcribe(tmp_path / "top.mp4", "base", "cuda", cache=cache) == cues
+    words = whisper_wrapper.transcribe_words(tmp_path / "top.mp4", "base", "cuda", cache=cache)
+    assert list(whisper_wrapper.group_words(words)) == cues
@@ -12,7 +12,8 @@ from PySide6.QtWidgets import (
     QComboBox,
     QDialog,
     QDialogButtonBox,
-    QGraphicsDropShadowEffect
+    QGraphicsDropShadowEffect,
+    QProgressBar,
 )
 from PySide6.QtCore import (
     Qt,
@@ -22,17 +23,22 @@ from PySide6.QtCore import (
     QTimer,
     QThread,
     QObject,
+    QUrl,
     Signal,
     Slot,
 )
-from PySide6.QtGui import QFont, QColor, QPixmap, QGuiApplication
+from PySide6.QtGui import QFont, QColor, QPixmap, QGuiApplication, QDesktopServices
 import sys
 import random
 from pathlib import Path
 
-from core import generate_short, load_config, save_config
+from core import generate_preview, generate_short, load_config, save_config
+from core.cancel import CancelToken, Cancelled
 from core.utils import VALID_EXTS
+from core.progress import format_eta
 from core.subtitle_utils import DEFAULT_STYLE, hex_to_ass
+from ui.progress_model import ProgressModel
+from ui.render_queue import DEFAULT_WORKERS, RenderQueuePanel
 
 
 def resource_path(name: str) -> Path:
@@ -65,6 +71,13 @@ THEMES = {
 
 SHADOW_COLOR = "#000000"
 
+# Settings labels for the karaoke tag passed to the pipeline
+SUBTITLE_MODES = {
+    "Static": None,
+    "Karaoke (sweep)": "kf",
+    "Karaoke (instant)": "k",
+}
+
 QUOTES = [
     "Stay hydrated!",
     "Keep it simple.",
@@ -99,18 +112,37 @@ class AnimatedButton(QPushButton):
 
 
 class Worker(QObject):
-    """Background worker to run ``generate_short`` in a thread."""
+    """Background worker to run ``generate_short`` in a thread.
 
-    progress = Signal(str)
+    ``progress`` carries the pipeline's messages unchanged, including
+    :class:`core.progress.ProgressEvent` objects with percent and ETA.
+    :meth:`cancel` may be called from the GUI thread; a cancelled run
+    finishes with ``(False, "")``.
+    """
+
+    progress = Signal(object)
     finished = Signal(bool, str)
 
-    def __init__(self, top: str, bottom: str, out: str | None, res: tuple[int, int], style: dict | None):
+    def __init__(
+        self,
+        top: str,
+        bottom: str,
+        out: str | None,
+        res: tuple[int, int],
+        style: dict | None,
+        karaoke: str | None = None,
+    ):
         super().__init__()
         self.top = top
         self.bottom = bottom
         self.out = out
         self.res = res
         self.style = style
+        self.karaoke = karaoke
+        self.token = CancelToken()
+
+    def cancel(self) -> None:
+        self.token.cancel()
 
     @Slot()
     def run(self) -> None:
@@ -122,11 +154,90 @@ class Worker(QObject):
                 progress=self.progress.emit,
                 resolution=self.res,
                 style=self.style,
+                karaoke=self.karaoke,
+                cancel=self.token,
             )
             self.finished.emit(True, "")
+        except Cancelled:
+            self.finished.emit(False, "")
+        except Exception as exc:  # pragma: no cover - runtime feedback
+            self.finished.emit(False, str(exc))
+
+
+class PreviewWorker(Worker):
+    """Background worker rendering a quick draft with ``generate_preview``.
+
+    On success ``finished`` carries the path of the draft instead of an
+    empty message.
+    """
+
+    def __init__(
+        self,
+        top: str,
+        bottom: str,
+        res: tuple[int, int],
+        style: dict | None,
+        start: float,
+        karaoke: str | None = None,
+    ):
+        super().__init__(top, bottom, None, res, style, karaoke)
+        self.start = start
+
+    @Slot()
+    def run(self) -> None:
+        try:
+            out = generate_preview(
+                self.top,
+                self.bottom,
+                start=self.start,
+                progress=self.progress.emit,
+                resolution=self.res,
+                style=self.style,
+                karaoke=self.karaoke,
+                cancel=self.token,
+            )
+            self.finished.emit(True, str(out))
+        except Cancelled:
+            self.finished.emit(False, "")
         except Exception as exc:  # pragma: no cover - runtime feedback
             self.finished.emit(False, str(exc))
 
+
+class PreviewDialog(QDialog):
+    """Loop a rendered draft; falls back to the system player without QtMultimedia."""
+
+    def __init__(self, path: str, parent: QWidget | None = None):
+        super().__init__(parent)
+        self.setWindowTitle("Preview")
+        layout = QVBoxLayout(self)
+        try:
+            from PySide6.QtMultimedia import QAudioOutput, QMediaPlayer
+            from PySide6.QtMultimediaWidgets import QVideoWidget
+        except ImportError:
+            QDesktopServices.openUrl(QUrl.fromLocalFile(path))
+            layout.addWidget(QLabel(f"Opened {path} in your video player"))
+            self.player = None
+        else:
+            video = QVideoWidget(self)
+            video.setMinimumSize(270, 480)
+            layout.addWidget(video)
+            self.audio = QAudioOutput(self)
+            self.player = QMediaPlayer(self)
+            self.player.setAudioOutput(self.audio)
+            self.player.setVideoOutput(video)
+            self.player.setLoops(QMediaPlayer.Infinite)
+            self.player.setSource(QUrl.fromLocalFile(path))
+            self.player.play()
+        buttons = QDialogButtonBox(QDialogButtonBox.Close)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+    def done(self, result: int) -> None:
+        if self.player is not None:
+            self.player.stop()
+        super().done(result)
+
+
 class MainWindow(QWidget):
     def __init__(self):
         super().__init__()
@@ -137,6 +248,9 @@ class MainWindow(QWidget):
         self.resolution = self.config.get("resolution", "1080x1920")
         self.subtitle_font = self.config.get("font", DEFAULT_STYLE["FontName"])
         self.subtitle_color = self.config.get("color", "#FFFFFF")
+        self.preview_start = float(self.config.get("preview_start", 0.0))
+        self.karaoke = self.config.get("karaoke")
+        self.queue_workers = int(self.config.get("queue_workers", DEFAULT_WORKERS))
 
         self.setAcceptDrops(True)
         self.setWindowTitle("ShortsSplit 🐢")
@@ -193,11 +307,16 @@ class MainWindow(QWidget):
         # Animated buttons
         self.buttons = []
         self.create_btn = None
+        self.preview_btn = None
+        self.worker = None
         btn_defs = [
             ("🎥 Load Top Clip", lambda: self.load_file("top")),
             ("📼 Load Bottom Clip", lambda: self.load_file("bottom")),
             ("📁 Set Output File", self.set_output),
+            ("👁 Preview", self.preview_short),
             ("⚙️ Create Shorts Video", self.create_short),
+            ("➕ Add to Queue", self.enqueue_short),
+            ("📋 Render Queue", self.show_queue),
             ("🔧 Settings", self.open_settings),
         ]
         for i, (text, slot) in enumerate(btn_defs):
@@ -208,6 +327,8 @@ class MainWindow(QWidget):
             self.buttons.append(btn)
             if text == "⚙️ Create Shorts Video":
                 self.create_btn = btn
+            elif text == "👁 Preview":
+                self.preview_btn = btn
             self.fade_in(btn, delay=900 + i*150)
 
         self.top_label = QLabel("Top clip: none")
@@ -229,6 +350,28 @@ class MainWindow(QWidget):
         )
         layout.addWidget(self.status_label)
 
+        progress_row = QHBoxLayout()
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setTextVisible(True)
+        progress_row.addWidget(self.progress_bar)
+        self.eta_label = QLabel("")
+        progress_row.addWidget(self.eta_label)
+        layout.addLayout(progress_row)
+        self.progress_bar.hide()
+
+        # Worker threads push here; the GUI sees at most 20 updates a second
+        self.progress_model = ProgressModel(parent=self)
+        self.progress_model.changed.connect(self.update_status)
+
+        self.cancel_btn = QPushButton("✖ Cancel")
+        self.cancel_btn.setCursor(Qt.PointingHandCursor)
+        self.cancel_btn.clicked.connect(self.cancel_render)
+        self.cancel_btn.hide()
+        layout.addWidget(self.cancel_btn)
+
+        self.queue = RenderQueuePanel(self.queue_workers, self)
+
         for clip in ("top", "bottom"):
             if clip_path := self.config.get(f"{clip}_clip"):
                 setattr(self, f"{clip}_clip", clip_path)
@@ -264,40 +407,130 @@ class MainWindow(QWidget):
             self.config["output_path"] = path
             save_config(self.config)
 
-    def update_status(self, msg: str) -> None:
-        self.status_label.setText(msg)
-        QApplication.processEvents()
+    @Slot(object, object)
+    def update_status(self, _key, msg: str) -> None:
+        self.status_label.setText(str(msg))
+        percent = getattr(msg, "percent", None)
+        eta = getattr(msg, "eta", None)
+        if percent is None:
+            # Stages without a measurable length (transcription, loudness)
+            self.progress_bar.setRange(0, 0)
+        else:
+            self.progress_bar.setRange(0, 100)
+            self.progress_bar.setValue(int(percent))
+        self.eta_label.setText(f"ETA {format_eta(eta)}" if eta is not None else "")
 
-    def create_short(self) -> None:
+    def _clips(self) -> tuple[str, str] | None:
         top = getattr(self, "top_clip", None)
         bottom = getattr(self, "bottom_clip", None)
         if not top or not bottom:
             QMessageBox.warning(self, "Missing clips", "Load both clips first")
-            return
-        out = getattr(self, "output_path", None)
-
-        if self.create_btn is not None:
-            self.create_btn.setEnabled(False)
-
+            return None
+        return top, bottom
+
+    def _set_busy(self, busy: bool) -> None:
+        for btn in (self.create_btn, self.preview_btn):
+            if btn is not None:
+                btn.setEnabled(not busy)
+        self.cancel_btn.setEnabled(True)
+        self.cancel_btn.setVisible(busy)
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(busy)
+        self.eta_label.setText("")
+        if not busy:
+            # A late update must not overwrite the final status
+            self.progress_model.clear()
+            self.worker = None
+
+    def cancel_render(self) -> None:
+        if self.worker is not None:
+            self.cancel_btn.setEnabled(False)
+            self.status_label.setText("Cancelling...")
+            self.worker.cancel()
+
+    def _start_worker(self, worker: Worker, on_finished) -> None:
+        self._set_busy(True)
         self.thread = QThread(self)
-        self.worker = Worker(top, bottom, out, self._resolution_tuple(), self.subtitle_style())
+        self.worker = worker
         self.worker.moveToThread(self.thread)
-        self.worker.progress.connect(self.update_status)
-        self.worker.finished.connect(self._on_thread_finished)
+        # Runs in the worker thread; the model hands updates over throttled
+        self.worker.progress.connect(self.progress_model.push, Qt.DirectConnection)
+        self.worker.finished.connect(on_finished)
         self.thread.started.connect(self.worker.run)
         self.worker.finished.connect(self.thread.quit)
         self.worker.finished.connect(self.worker.deleteLater)
         self.thread.finished.connect(self.thread.deleteLater)
         self.thread.start()
 
+    def create_short(self) -> None:
+        clips = self._clips()
+        if clips is None:
+            return
+        out = getattr(self, "output_path", None)
+        self._start_worker(
+            Worker(*clips, out, self._resolution_tuple(), self.subtitle_style(), self.karaoke),
+            self._on_thread_finished,
+        )
+
+    def preview_short(self) -> None:
+        clips = self._clips()
+        if clips is None:
+            return
+        self._start_worker(
+            PreviewWorker(
+                *clips,
+                self._resolution_tuple(),
+                self.subtitle_style(),
+                self.preview_start,
+                self.karaoke,
+            ),
+            self._on_preview_finished,
+        )
+
+    def enqueue_short(self) -> None:
+        clips = self._clips()
+        if clips is None:
+            return
+        # Snapshot the current settings; later changes do not affect the job
+        job = self.queue.enqueue(
+            *clips,
+            getattr(self, "output_path", None),
+            self._resolution_tuple(),
+            self.subtitle_style(),
+            self.karaoke,
+        )
+        self.status_label.setText(f"Queued {Path(job.params['output_path']).name}")
+
+    def show_queue(self) -> None:
+        self.queue.show()
+        self.queue.raise_()
+        self.queue.activateWindow()
+
     def _on_thread_finished(self, success: bool, error: str) -> None:
         if success:
             QMessageBox.information(self, "Done", "Short created successfully")
-        else:
+        elif error:
             QMessageBox.critical(self, "Error", error)
-        self.status_label.setText("")
-        if self.create_btn is not None:
-            self.create_btn.setEnabled(True)
+        self.status_label.setText("" if success or error else "Cancelled")
+        self._set_busy(False)
+
+    def _on_preview_finished(self, success: bool, message: str) -> None:
+        self.status_label.setText("" if success or message else "Cancelled")
+        self._set_busy(False)
+        if success:
+            PreviewDialog(message, self).exec()
+        elif message:
+            QMessageBox.critical(self, "Error", message)
+
+    def closeEvent(self, event):
+        # Do not leave ffmpeg or Whisper running behind a closed window
+        if self.worker is not None:
+            self.worker.cancel()
+            self.thread.quit()
+            self.thread.wait(10000)
+        self.queue.shutdown()
+        super().closeEvent(event)
 
     def open_settings(self) -> None:
         dialog = QDialog(self)
@@ -322,6 +555,23 @@ class MainWindow(QWidget):
         layout.addWidget(QLabel("Subtitle Color (#RRGGBB)"))
         color_edit = QLineEdit(self.subtitle_color)
         layout.addWidget(color_edit)
+
+        layout.addWidget(QLabel("Subtitle mode"))
+        mode_box = QComboBox()
+        for label, mode in SUBTITLE_MODES.items():
+            mode_box.addItem(label, mode)
+        mode_box.setCurrentIndex(max(0, mode_box.findData(self.karaoke)))
+        layout.addWidget(mode_box)
+
+        layout.addWidget(QLabel("Preview start (seconds)"))
+        preview_edit = QLineEdit(f"{self.preview_start:g}")
+        layout.addWidget(preview_edit)
+
+        layout.addWidget(QLabel("Render queue workers"))
+        workers_box = QComboBox()
+        workers_box.addItems([str(n) for n in range(1, 5)])
+        workers_box.setCurrentText(str(self.queue_workers))
+        layout.addWidget(workers_box)
         buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
         layout.addWidget(buttons)
 
@@ -336,6 +586,19 @@ class MainWindow(QWidget):
             self.subtitle_color = color_edit.text() or "#FFFFFF"
             self.config["font"] = self.subtitle_font
             self.config["color"] = self.subtitle_color
+            self.karaoke = mode_box.currentData()
+            self.config["karaoke"] = self.karaoke
+            try:
+                self.preview_start = max(0.0, float(preview_edit.text() or 0))
+            except ValueError:
+                self.preview_start = 0.0
+            self.config["preview_start"] = self.preview_start
+            self.queue_workers = int(workers_box.currentText())
+            self.config["queue_workers"] = self.queue_workers
+            if not self.queue.set_workers(self.queue_workers):
+                QMessageBox.information(
+                    self, "Render queue", "The new worker count applies once the queued renders finish"
+                )
             save_config(self.config)
             dialog.accept()
 
@@ -0,0 +1,52 @@
+"""Throttled delivery of progress messages to the GUI thread.
+
+Renders may report progress per segment or per frame. Re-entering the event
+loop for each message, or queuing one event per message, would swamp the
+GUI, so messages are coalesced with :class:`core.progress.ProgressThrottle`
+and delivered at most ``rate`` times per second through queued signals.
+"""
+
+from __future__ import annotations
+
+from PySide6.QtCore import QObject, Qt, QTimer, Signal, Slot
+
+from core.progress import ProgressThrottle
+
+
+class ProgressModel(QObject):
+    """Coalesces progress from worker threads into rate-limited signals.
+
+    :meth:`push` may be called from any thread. ``changed(key, message)``
+    is emitted in the GUI thread with the latest message of every key that
+    was pushed since the previous emission.
+    """
+
+    changed = Signal(object, object)
+    _wake = Signal()
+
+    def __init__(self, rate: float = 20.0, parent: QObject | None = None):
+        super().__init__(parent)
+        self.throttle = ProgressThrottle(rate)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._flush)
+        self._wake.connect(self._schedule, Qt.QueuedConnection)
+
+    def push(self, message, key=None) -> None:
+        """Record ``message`` for ``key``; safe to call from any thread."""
+        if self.throttle.push(message, key):
+            self._wake.emit()
+
+    def clear(self) -> None:
+        """Drop messages that have not been delivered yet."""
+        self.throttle.clear()
+
+    @Slot()
+    def _schedule(self) -> None:
+        if not self._timer.isActive():
+            self._timer.start(int(self.throttle.delay() * 1000))
+
+    @Slot()
+    def _flush(self) -> None:
+        for key, message in self.throttle.take().items():
+            self.changed.emit(key, message)
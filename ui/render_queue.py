@@ -0,0 +1,219 @@
+"""Render queue window: many top/bottom pairs rendered by a worker pool.
+
+Jobs run on a :class:`core.jobs.JobManager` inside the GUI process, so every
+worker shares the warm Whisper model pool. The manager reports updates
+from its worker threads; a :class:`~ui.progress_model.ProgressModel`
+coalesces them and hands them to the GUI thread, so the table is only ever
+touched there and rendering never blocks the interface.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from PySide6.QtCore import Qt, Slot
+from PySide6.QtWidgets import (
+    QAbstractItemView,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QProgressBar,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+from core.jobs import Job, JobManager
+from core.progress import format_eta
+from ui.progress_model import ProgressModel
+
+COLUMNS = ("Top", "Bottom", "Output", "Status", "Progress", "ETA")
+
+DEFAULT_WORKERS = 2
+
+
+def unique_output(top: str, output: str | None, taken: set[str]) -> str:
+    """Return an output path for ``top`` that no other queued job uses.
+
+    ``output`` is used as is when free. Otherwise the short is named after
+    the top clip, next to ``output`` or the top clip, with a counter added
+    if needed.
+    """
+    if output and output not in taken:
+        return output
+    folder = Path(output).parent if output else Path(top).parent
+    stem = Path(top).stem
+    candidate = folder / f"{stem}_short.mp4"
+    number = 2
+    while str(candidate) in taken:
+        candidate = folder / f"{stem}_short_{number}.mp4"
+        number += 1
+    return str(candidate)
+
+
+class RenderQueuePanel(QWidget):
+    """Table of queued renders with per-job progress, cancel and retry."""
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, parent: QWidget | None = None):
+        super().__init__(parent)
+        self.setWindowFlag(Qt.Window)
+        self.setWindowTitle("Render Queue")
+        self.setMinimumSize(760, 320)
+
+        # Updates come from render threads, many per second per job
+        self.progress = ProgressModel(parent=self)
+        self.progress.changed.connect(lambda job_id, _: self.refresh_job(job_id))
+        self.workers = workers
+        self.manager = self._new_manager(workers)
+        self._rows: dict[str, int] = {}
+        self._pending_workers: int | None = None
+
+        layout = QVBoxLayout(self)
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        layout.addWidget(self.table)
+
+        self.summary = QLabel("")
+        layout.addWidget(self.summary)
+
+        row = QHBoxLayout()
+        for text, slot in (
+            ("✖ Cancel", self.cancel_selected),
+            ("↻ Retry", self.retry_selected),
+            ("🧹 Clear Finished", self.clear_finished),
+        ):
+            btn = QPushButton(text)
+            btn.setCursor(Qt.PointingHandCursor)
+            btn.clicked.connect(slot)
+            row.addWidget(btn)
+        layout.addLayout(row)
+        self._update_summary()
+
+    def _new_manager(self, workers: int) -> JobManager:
+        return JobManager(workers, on_update=lambda job: self.progress.push(job.id, key=job.id))
+
+    @property
+    def busy(self) -> bool:
+        """Whether any job is queued or running."""
+        return any(not job.done for job in self.manager.list())
+
+    def set_workers(self, workers: int) -> bool:
+        """Use ``workers`` concurrent renders.
+
+        Returns ``False`` if jobs are queued or running; the change is then
+        applied as soon as the queue becomes idle.
+        """
+        self._pending_workers = None
+        if workers == self.workers:
+            return True
+        if self.busy:
+            self._pending_workers = workers
+            return False
+        self.manager.shutdown(wait=False)
+        # Finished jobs belong to the old manager and cannot be retried
+        self.manager = self._new_manager(workers)
+        self.workers = workers
+        self.clear_finished()
+        return True
+
+    def enqueue(
+        self,
+        top: str,
+        bottom: str,
+        output: str | None,
+        resolution: tuple[int, int],
+        style: dict | None,
+        karaoke: str | None = None,
+    ) -> Job:
+        """Queue a render of ``top`` over ``bottom`` with its own ``style``."""
+        taken = {str(job.params.get("output_path")) for job in self.manager.list() if not job.done}
+        params = {
+            "top": top,
+            "bottom": bottom,
+            "output_path": unique_output(top, output, taken),
+            "resolution": resolution,
+            "style": dict(style) if style else None,
+            "karaoke": karaoke,
+        }
+        return self.manager.submit(params)
+
+    @Slot(str)
+    def refresh_job(self, job_id: str) -> None:
+        job = self.manager.get(job_id)
+        if job is None:
+            return
+        row = self._rows.get(job_id)
+        if row is None:
+            row = self.table.rowCount()
+            self.table.insertRow(row)
+            self._rows[job_id] = row
+            for column, value in enumerate(
+                (job.params["top"], job.params["bottom"], job.params["output_path"])
+            ):
+                item = QTableWidgetItem(Path(value).name)
+                item.setToolTip(str(value))
+                item.setData(Qt.UserRole, job_id)
+                self.table.setItem(row, column, item)
+            bar = QProgressBar()
+            bar.setRange(0, 100)
+            self.table.setCellWidget(row, 4, bar)
+        self._show(row, job)
+        self._update_summary()
+        if self._pending_workers and not self.busy:
+            self.set_workers(self._pending_workers)
+
+    def _show(self, row: int, job: Job) -> None:
+        status = job.status
+        if job.status == "running" and job.message:
+            status = job.message
+        elif job.status == "failed":
+            status = f"failed: {job.error}"
+        item = QTableWidgetItem(status)
+        item.setToolTip(job.error or job.message)
+        self.table.setItem(row, 3, item)
+        bar = self.table.cellWidget(row, 4)
+        if job.status == "done":
+            bar.setValue(100)
+        elif job.percent is not None:
+            bar.setValue(int(job.percent))
+        elif job.status == "queued":
+            bar.setValue(0)
+        eta = format_eta(job.eta) if job.eta is not None and job.status == "running" else ""
+        self.table.setItem(row, 5, QTableWidgetItem(eta))
+
+    def _update_summary(self) -> None:
+        counts: dict[str, int] = {}
+        for job in self.manager.list():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        parts = [f"{counts[s]} {s}" for s in ("running", "queued", "done", "failed", "cancelled") if counts.get(s)]
+        self.summary.setText(f"{self.workers} workers — " + (", ".join(parts) or "queue empty"))
+
+    def selected_ids(self) -> list[str]:
+        rows = {index.row() for index in self.table.selectionModel().selectedRows()}
+        return [self.table.item(row, 0).data(Qt.UserRole) for row in sorted(rows)]
+
+    def cancel_selected(self) -> None:
+        for job_id in self.selected_ids():
+            self.manager.cancel(job_id)
+
+    def retry_selected(self) -> None:
+        for job_id in self.selected_ids():
+            self.manager.retry(job_id)
+
+    def clear_finished(self) -> None:
+        self.manager.prune()
+        self.table.setRowCount(0)
+        self._rows.clear()
+        for job in self.manager.list():
+            self.refresh_job(job.id)
+        self._update_summary()
+
+    def shutdown(self) -> None:
+        """Stop queued and running renders; called when the app closes."""
+        self.manager.shutdown(wait=False, cancel_running=True)